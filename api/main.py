@@ -1,9 +1,50 @@
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 
-from api.routers import insight, people, planets
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
-app = FastAPI(title='Star Wars API')
+from api.resources import RESOURCES
+from api.routers import health, insight, metrics
+from api.routers.resources import resource_router
+from api.services.resilience import CircuitOpenError, swapi_resilience
+from api.services.swapi_proxy import swapi_client_lifespan
+from api.utils.compression import COMPRESSION, CompressionMiddleware
+from api.utils.metrics import METRICS, MetricsMiddleware
+from api.utils.pagination import dataset_lifespan
 
-app.include_router(people.router, prefix='/people', tags=['People'])
-app.include_router(planets.router, prefix='/planets', tags=['Planets'])
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    async with (
+        swapi_client_lifespan(),
+        dataset_lifespan([(resource.model, resource.name) for resource in RESOURCES.values()]),
+    ):
+        yield
+
+
+app = FastAPI(title='Star Wars API', lifespan=lifespan)
+
+if COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+if METRICS:
+    app.add_middleware(MetricsMiddleware)  # Outermost: request times include compression
+
+for resource in RESOURCES.values():
+    app.include_router(resource_router(resource), prefix=f'/{resource.name}', tags=[resource.title])
 app.include_router(insight.router, tags=['AI Insight'])
+app.include_router(health.router, tags=['Health'])
+app.include_router(metrics.router, tags=['Health'])
+
+
+@app.exception_handler(httpx.HTTPError)
+async def upstream_error(request: Request, exc: httpx.HTTPError) -> JSONResponse:
+    """Report SWAPI failures (with nothing cached to fall back to) as gateway errors."""
+    if isinstance(exc, CircuitOpenError):
+        return JSONResponse(
+            status_code=503,
+            content={'detail': 'SWAPI is unavailable'},
+            headers={'Retry-After': str(int(swapi_resilience.breaker.reset_after))},
+        )
+    return JSONResponse(status_code=502, content={'detail': f'SWAPI request failed: {exc}'})
@@ -1,4 +1,8 @@
+from .film import Film
 from .person import Person
 from .planet import Planet
+from .species import Species
+from .starship import Starship
+from .vehicle import Vehicle
 
-__all__ = ['Person', 'Planet']
+__all__ = ['Film', 'Person', 'Planet', 'Species', 'Starship', 'Vehicle']
@@ -0,0 +1,23 @@
+from datetime import date, datetime
+from typing import ClassVar
+
+from pydantic import BaseModel, HttpUrl
+
+
+class Film(BaseModel):
+    search_field: ClassVar[str] = 'title'  # Films have a title, not a name
+
+    title: str
+    episode_id: int
+    opening_crawl: str | None
+    director: str | None
+    producer: str | None
+    release_date: date | None
+    characters: list[HttpUrl]
+    planets: list[HttpUrl]
+    starships: list[HttpUrl]
+    vehicles: list[HttpUrl]
+    species: list[HttpUrl]
+    created: datetime
+    edited: datetime
+    url: HttpUrl
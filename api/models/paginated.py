@@ -0,0 +1,22 @@
+from pydantic import BaseModel, create_model
+
+
+def paginated_model(name: str, model_class: type[BaseModel]) -> type[BaseModel]:
+    """
+    Build the response model of a paginated list, like `PaginatedPeople`.
+
+    Args:
+        name (str): Model name (e.g., PaginatedFilms).
+        model_class (type[BaseModel]): The Pydantic model of the results (e.g., Film).
+
+    Returns:
+        type[BaseModel]: The response model.
+    """
+    return create_model(
+        name,
+        count=(int, ...),
+        page=(int, ...),
+        results_count=(int, ...),
+        results=(list[model_class], ...),
+        next_cursor=(str | None, None),  # Cursor of the next page, None on the last one
+    )
@@ -27,6 +27,7 @@ class PaginatedPeople(BaseModel):
     page: int
     results_count: int
     results: list[Person]
+    next_cursor: str | None = None  # Cursor of the next page, None on the last one
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -65,6 +66,10 @@ class PaginatedPeople(BaseModel):
                         'url': 'https://swapi.info/api/people/1',
                     }
                 ],
+                'next_cursor': (
+                    'eyJ2ZXJzaW9uIjoxLCJwYWdlIjoyLCJzZWFyY2giOm51bGwsInNvcnRfYnki'
+                    'Om51bGwsIm9yZGVyIjoiYXNjIiwia2V5IjpudWxsLCJwb3NpdGlvbiI6MH0'
+                ),
             }
         }
     )
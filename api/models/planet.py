@@ -26,6 +26,7 @@ class PaginatedPlanets(BaseModel):
     page: int
     results_count: int
     results: list[Planet]
+    next_cursor: str | None = None  # Cursor of the next page, None on the last one
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -51,6 +52,10 @@ class PaginatedPlanets(BaseModel):
                         'url': 'https://swapi.info/api/planets/25',
                     }
                 ],
+                'next_cursor': (
+                    'eyJ2ZXJzaW9uIjoxLCJwYWdlIjoyLCJzZWFyY2giOm51bGwsInNvcnRfYnki'
+                    'Om51bGwsIm9yZGVyIjoiYXNjIiwia2V5IjpudWxsLCJwb3NpdGlvbiI6MH0'
+                ),
             }
         }
     )
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, HttpUrl
+
+
+class Species(BaseModel):
+    name: str
+    classification: str | None
+    designation: str | None
+    average_height: int | None
+    skin_colors: str | None
+    hair_colors: str | None
+    eye_colors: str | None
+    average_lifespan: Any  # Years, or e.g. 'indefinite'
+    homeworld: HttpUrl | None
+    language: str | None
+    people: list[HttpUrl]
+    films: list[HttpUrl]
+    created: datetime
+    edited: datetime
+    url: HttpUrl
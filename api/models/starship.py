@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import Any
+
+from pydantic import BaseModel, HttpUrl
+
+
+class Starship(BaseModel):
+    name: str
+    model: str | None
+    manufacturer: str | None
+    cost_in_credits: int | None
+    length: float | None
+    max_atmosphering_speed: Any  # Mostly km/h, sometimes with a unit (e.g. '1000km')
+    crew: Any  # Mostly a number, sometimes a range (e.g. '30-165')
+    passengers: int | None
+    cargo_capacity: int | None
+    consumables: Any  # Mostly a duration (e.g. '2 months'), sometimes 0
+    hyperdrive_rating: float | None
+    MGLT: int | None
+    starship_class: str | None
+    pilots: list[HttpUrl]
+    films: list[HttpUrl]
+    created: datetime
+    edited: datetime
+    url: HttpUrl
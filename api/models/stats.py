@@ -0,0 +1,53 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Summary(BaseModel):
+    count: int  # Rows with a value
+    min: float | None
+    max: float | None
+    mean: float | None
+
+
+class Bucket(BaseModel):
+    low: float
+    high: float  # Exclusive, except for the last bucket
+    count: int
+
+
+class Group(BaseModel):
+    value: Any  # Strings are folded to lower case
+    count: int  # Rows in the group
+    summary: Summary | None = None
+
+
+class FacetCount(BaseModel):
+    value: Any  # Strings are folded to lower case
+    count: int
+
+
+class Stats(BaseModel):
+    count: int  # Rows matching the search and filter
+    field: str | None = None
+    summary: Summary | None = None
+    histogram: list[Bucket] | None = None
+    groups: list[Group] | None = None
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            'example': {
+                'count': 82,
+                'field': 'height',
+                'summary': {'count': 81, 'min': 66.0, 'max': 264.0, 'mean': 174.6},
+                'histogram': None,
+                'groups': [
+                    {
+                        'value': 'male',
+                        'count': 60,
+                        'summary': {'count': 59, 'min': 66.0, 'max': 264.0, 'mean': 179.1},
+                    }
+                ],
+            }
+        }
+    )
@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+
+from pydantic import BaseModel
+
+from api.models import Film, Person, Planet, Species, Starship, Vehicle
+from api.models.paginated import paginated_model
+from api.models.person import PaginatedPeople
+from api.models.planet import PaginatedPlanets
+from api.utils.filters import is_sortable_field, search_field
+
+
+@dataclass(frozen=True)
+class Resource:
+    """
+    A SWAPI resource served by the API. Its routes (`/<name>/` and `/<name>/export`),
+    cached dataset and indexes are all derived from this declaration.
+    """
+
+    name: str  # SWAPI resource name, also the route prefix (e.g., people)
+    model: type[BaseModel]
+    paginated_model: type[BaseModel]
+
+    @property
+    def title(self) -> str:
+        return self.name.title()
+
+    @property
+    def search_field(self) -> str:
+        return search_field(self.model)
+
+    @property
+    def sortable_fields(self) -> list[str]:
+        return [field for field in self.model.model_fields if is_sortable_field(self.model, field)]
+
+
+RESOURCES: dict[str, Resource] = {
+    resource.name: resource
+    for resource in (
+        Resource('people', Person, PaginatedPeople),
+        Resource('planets', Planet, PaginatedPlanets),
+        Resource('films', Film, paginated_model('PaginatedFilms', Film)),
+        Resource('species', Species, paginated_model('PaginatedSpecies', Species)),
+        Resource('vehicles', Vehicle, paginated_model('PaginatedVehicles', Vehicle)),
+        Resource('starships', Starship, paginated_model('PaginatedStarships', Starship)),
+    )
+}
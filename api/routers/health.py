@@ -0,0 +1,21 @@
+from dataclasses import asdict
+
+from fastapi import APIRouter
+
+from api.services.dataset_cache import dataset_cache
+from api.services.resilience import swapi_resilience
+
+router = APIRouter()
+
+
+@router.get('/health')
+async def health():
+    """
+    Returns the state of the SWAPI upstream (circuit breaker, retries, hedges) and of the
+    dataset cache. The status is `degraded` while the breaker is not closed: datasets are
+    then served from the cache, however old.
+    """
+    upstream = swapi_resilience.snapshot()
+    status = 'ok' if upstream['breaker']['state'] == 'closed' else 'degraded'
+
+    return {'status': status, 'upstream': upstream, 'cache': asdict(dataset_cache.stats)}
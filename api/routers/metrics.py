@@ -0,0 +1,122 @@
+from collections.abc import Iterable
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from api.resources import RESOURCES
+from api.services.dataset_cache import dataset_cache
+from api.services.resilience import swapi_resilience
+from api.utils.metrics import REQUEST_SECONDS, STAGE_SECONDS, family
+
+router = APIRouter()
+
+BREAKER_STATES = ('closed', 'open', 'half_open')
+
+
+def cache_metrics() -> Iterable[str]:
+    stats = dataset_cache.stats
+    lookups = stats.hits + stats.stale_hits + stats.misses
+
+    yield from family(
+        'api_dataset_cache_lookups_total',
+        'Dataset cache lookups, by result.',
+        [
+            ({'result': 'hit'}, stats.hits),
+            ({'result': 'stale_hit'}, stats.stale_hits),
+            ({'result': 'miss'}, stats.misses),
+        ],
+        type='counter',
+    )
+    yield from family(
+        'api_dataset_cache_hit_ratio',
+        'Share of dataset cache lookups served from the cache (fresh or stale).',
+        [({}, (stats.hits + stats.stale_hits) / lookups if lookups else 0)],
+    )
+    yield from family(
+        'api_dataset_refreshes_total',
+        'Dataset loads from SWAPI, by outcome (fallback: an expired dataset was served).',
+        [
+            ({'outcome': 'success'}, stats.refreshes),
+            ({'outcome': 'error'}, stats.refresh_errors),
+            ({'outcome': 'fallback'}, stats.fallbacks),
+        ],
+        type='counter',
+    )
+
+    yield from family(
+        'api_dataset_rows_changed_total',
+        'Rows added or modified by dataset refreshes (all of them on full loads).',
+        [({'resource': name}, count) for name, count in stats.resource_rows_changed.items()],
+        type='counter',
+    )
+    yield from family(
+        'api_dataset_last_refresh_rows_changed',
+        'Rows added or modified by the last refresh of the dataset.',
+        [({'resource': name}, count) for name, count in stats.last_rows_changed.items()],
+    )
+
+    datasets = [(name, dataset_cache.peek(name)) for name in RESOURCES]
+    datasets = [(name, dataset) for name, dataset in datasets if dataset is not None]
+    for metric, help, value in (
+        ('api_dataset_rows', 'Rows of the cached dataset.', len),
+        ('api_dataset_version', 'Version of the cached dataset.', lambda d: d.version),
+        ('api_dataset_age_seconds', 'Seconds since the dataset was fetched.', lambda d: d.age),
+    ):
+        yield from family(
+            metric, help, [({'resource': name}, value(dataset)) for name, dataset in datasets]
+        )
+
+
+def upstream_metrics() -> Iterable[str]:
+    snapshot = swapi_resilience.snapshot()
+
+    yield from family(
+        'api_upstream_events_total',
+        'SWAPI requests through the resilience layer, by event.',
+        [
+            ({'event': event}, snapshot[event])
+            for event in (
+                'attempts',
+                'retries',
+                'failures',
+                'attempt_timeouts',
+                'hedges',
+                'hedge_wins',
+                'short_circuits',
+                'breaker_trips',
+            )
+        ],
+        type='counter',
+    )
+    yield from family(
+        'api_upstream_errors_total',
+        'Failed SWAPI attempts, by status code or error.',
+        [({'error': error}, count) for error, count in sorted(snapshot['errors'].items())],
+        type='counter',
+    )
+    yield from family(
+        'api_upstream_breaker_state',
+        'State of the SWAPI circuit breaker (1 for the current one).',
+        [
+            ({'state': state}, int(snapshot['breaker']['state'] == state))
+            for state in BREAKER_STATES
+        ],
+    )
+
+
+@router.get('/metrics', response_class=PlainTextResponse)
+async def metrics():
+    """
+    Returns the metrics of the API in the Prometheus text format: latency histograms of
+    requests and of each stage of the request path (fetch, normalize, validate, filter,
+    sort, paginate, serialize), dataset cache and SWAPI statistics, and dataset sizes.
+    """
+    lines = [
+        *STAGE_SECONDS.render(),
+        *REQUEST_SECONDS.render(),
+        *cache_metrics(),
+        *upstream_metrics(),
+    ]
+    return PlainTextResponse(
+        '\n'.join(lines) + '\n', media_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,215 @@
+from fastapi import APIRouter, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from api.models.stats import Stats
+from api.resources import RESOURCES, Resource
+from api.utils.conditional import cache_headers, is_not_modified, list_etag
+from api.utils.expand import expand_page, expand_response, link_fields, parse_expand
+from api.utils.export import export_response
+from api.utils.metrics import timed
+from api.utils.pagination import Page, get_dataset, get_page
+from api.utils.serialization import (
+    FAST_SERIALIZATION,
+    MSGPACK,
+    msgpack_response,
+    page_response,
+    wants_msgpack,
+)
+from api.utils.stats import facets_page, facets_response, get_stats
+
+
+async def render_list(
+    page: Page, expand: str | None, facets: str | None, binary: bool = False
+) -> Response | dict:
+    """Build the response of a list page (a dictionary goes through the response model)."""
+    if binary:
+        return msgpack_response(await list_content(page, expand, facets))
+
+    if facets:
+        return await facets_response(page, facets, expand)
+
+    if expand:
+        return await expand_response(page, expand)
+
+    if FAST_SERIALIZATION:
+        return page_response(page)
+
+    return page.to_dict()
+
+
+async def list_content(page: Page, expand: str | None, facets: str | None) -> dict:
+    """Build the response dictionary of a list page, with JSON values."""
+    if facets:
+        return await facets_page(page, facets, expand)
+
+    if expand:
+        return await expand_page(page, parse_expand(page.dataset.model_class, expand))
+
+    return jsonable_encoder(page.to_dict())
+
+
+def resource_router(resource: Resource) -> APIRouter:
+    """
+    Build the routes of a resource: its paginated list (`/`), its export (`/export`) and
+    its aggregates (`/stats`).
+
+    Args:
+        resource (Resource): The resource declaration.
+
+    Returns:
+        APIRouter: The router, to include under `/<name>`.
+    """
+    router = APIRouter()
+    sortable = ', '.join(resource.sortable_fields)
+    links = link_fields(resource.model)
+
+    async def get_list(
+        request: Request,
+        response: Response,
+        page: int = Query(1, ge=1),
+        page_size: int = Query(10, ge=1, le=100),
+        search: str | None = None,
+        sort_by: str | None = None,
+        order: str | None = Query('asc', pattern='^(asc|desc)$'),
+        cursor: str | None = None,
+        expand: str | None = None,
+        filter: str | None = None,
+        facets: str | None = None,
+    ):
+        query = {
+            'page': page,
+            'page_size': page_size,
+            'search': search,
+            'sort_by': sort_by,
+            'order': order,
+            'cursor': cursor,
+            'filter': filter,
+        }
+
+        # Conditional requests are answered from the dataset version, before paginating
+        dataset = await get_dataset(resource.model, resource.name)
+        binary = wants_msgpack(request.headers.get('accept'))
+        etag = list_etag(
+            dataset,
+            {**query, 'expand': expand, 'facets': facets, 'binary': binary},
+            RESOURCES if expand else (),
+        )
+        headers = cache_headers(dataset, etag)
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        result = await get_page(
+            model_class=resource.model, resource=resource.name, **query, current=dataset
+        )
+        with timed('serialize'):
+            content = await render_list(result, expand, facets, binary)
+
+        (content if isinstance(content, Response) else response).headers.update(headers)
+        return content
+
+    async def export(
+        search: str | None = None,
+        sort_by: str | None = None,
+        order: str | None = Query('asc', pattern='^(asc|desc)$'),
+        format: str = Query('ndjson', pattern='^(ndjson|csv)$'),
+        filter: str | None = None,
+    ):
+        return await export_response(
+            model_class=resource.model,
+            resource=resource.name,
+            search=search,
+            sort_by=sort_by,
+            order=order,
+            format=format,
+            filter=filter,
+        )
+
+    async def stats(
+        search: str | None = None,
+        filter: str | None = None,
+        field: str | None = None,
+        group_by: str | None = None,
+        buckets: int | None = Query(None, ge=1, le=100),
+    ):
+        return await get_stats(
+            model_class=resource.model,
+            resource=resource.name,
+            search=search,
+            filter=filter,
+            field=field,
+            group_by=group_by,
+            buckets=buckets,
+        )
+
+    router.add_api_route(
+        '/',
+        get_list,
+        methods=['GET'],
+        response_model=resource.paginated_model,
+        responses={
+            200: {'content': {MSGPACK: {}}},
+            304: {'description': 'Not Modified (the `If-None-Match` ETag is current)'},
+        },
+        name=f'get_{resource.name}',
+        description=f"""
+Retrieve a paginated, optionally filtered and sorted list of {resource.name}.
+
+Args:
+- **page**: Page number (1-based).
+- **page_size**: Number of results per page (default 10).
+- **search**: Optional {resource.search_field} filter.
+- **sort_by**: Optional attribute to sort by ({sortable}).
+- **order**: asc or desc (default asc).
+- **cursor**: Optional `next_cursor` of a previous page, to get the page after it
+  (it carries the search, sort and filter, which are then ignored, like the page number).
+- **filter**: Optional comma-separated conditions on scalar fields, all of which
+  results match: comparisons (`population>1000000`), equality (`climate=arid`), set
+  membership (`gender=male|female`) and inclusive ranges (`height=150..190`). Equality
+  and membership ignore the case of strings; comparisons and ranges order them like
+  `sort_by`. Timestamps (e.g. `created`) without a time zone are taken as UTC.
+- **expand**: Optional comma-separated link fields ({', '.join(links)}) whose
+  items are embedded in the results instead of their URLs.
+- **facets**: Optional comma-separated scalar fields by which the results (of every
+  page) are counted, in a `facets` member: `{{field: [{{value, count}}, ...]}}`.
+
+Responses carry an `ETag` (and `Cache-Control`); requests whose `If-None-Match` matches
+it get a `304 Not Modified` without a body. Send `Accept: application/msgpack` for a
+MessagePack body, and `Accept-Encoding: br` or `gzip` for a compressed one.
+""",
+    )
+    router.add_api_route(
+        '/export',
+        export,
+        methods=['GET'],
+        name=f'export_{resource.name}',
+        description=f"""
+Download every item of {resource.name} matching a search, in the requested order.
+
+Args:
+- **search**: Optional {resource.search_field} filter.
+- **sort_by**: Optional attribute to sort by ({sortable}).
+- **order**: asc or desc (default asc).
+- **filter**: Optional comma-separated conditions on scalar fields (see the list).
+- **format**: ndjson (one JSON object per line, the default) or csv.
+""",
+    )
+    router.add_api_route(
+        '/stats',
+        stats,
+        methods=['GET'],
+        response_model=Stats,
+        name=f'stats_{resource.name}',
+        description=f"""
+Aggregate the {resource.name} matching a search and filter. Results are cached until
+the next refresh of the data, so repeated queries are cheap.
+
+Args:
+- **search**: Optional {resource.search_field} filter.
+- **filter**: Optional comma-separated conditions on scalar fields (see the list).
+- **field**: Optional numeric field to summarize (count, min, max and mean).
+- **group_by**: Optional scalar field to group the results by (largest groups first).
+- **buckets**: Optional number of equal-width histogram buckets of `field` (1-100).
+""",
+    )
+
+    return router
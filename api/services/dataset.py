@@ -0,0 +1,226 @@
+import itertools
+import time
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+
+from api.utils.columnar import ColumnStore
+from api.utils.metrics import timed
+from api.utils.normalization import (
+    normalize_swapi_batch,
+    normalize_swapi_items,
+    to_datetime,
+    to_url,
+)
+from shared.logger import get_logger
+
+logger = get_logger('api')
+
+T = TypeVar('T')
+
+_versions = itertools.count(1)
+
+
+def reserve_versions(last: int) -> None:
+    """Make sure new dataset versions are greater than `last` (e.g. from another process)."""
+    global _versions
+    _versions = itertools.count(max(next(_versions), last + 1))
+
+
+@dataclass
+class Dataset:
+    """
+    A normalized SWAPI collection, as fetched at a given point in time.
+
+    Rows are kept in a ColumnStore and only turned into Pydantic models when they are
+    returned. Datasets are shared between concurrent requests and must be treated as
+    read-only. Structures derived from the rows (e.g. sort indexes) are memoized per
+    dataset, so they are built at most once per version.
+    """
+
+    resource: str
+    model_class: type[BaseModel]
+    store: ColumnStore
+    version: int = field(default_factory=lambda: next(_versions))
+    rows_changed: int = 0  # Rows added or modified since the previous version
+    fetched_at: float = field(default_factory=time.monotonic)
+    _derived: dict[Any, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_records(
+        cls,
+        resource: str,
+        model_class: type[BaseModel],
+        records: Iterable[Mapping[str, Any] | BaseModel],
+        version: int | None = None,
+    ) -> 'Dataset':
+        """Build a dataset from normalized records (dicts) or model instances."""
+        store = ColumnStore.from_records(model_class, records)
+        if version is None:
+            return cls(resource, model_class, store, rows_changed=len(store))
+        return cls(resource, model_class, store, version, rows_changed=len(store))
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def column(self, field: str) -> list[Any]:
+        """Return every value of a field, in row order."""
+        return self.store.values(field)
+
+    def rows(self, positions: Iterable[int]) -> list[BaseModel]:
+        """Build the Pydantic models of the rows at the given positions."""
+        with timed('validate'):
+            return [self.store.row(position) for position in positions]
+
+    @property
+    def age(self) -> float:
+        """Seconds elapsed since the dataset was fetched."""
+        return time.monotonic() - self.fetched_at
+
+    def derive(self, key: Any, build: Callable[['Dataset'], T]) -> T:
+        """
+        Return the structure memoized under `key`, building it on first use.
+
+        Derived structures may implement `apply_changes(dataset, changes)` to be carried
+        over to the next version by `refresh_dataset` instead of being rebuilt.
+
+        Args:
+            key (Any): Hashable identifier of the derived structure.
+            build (Callable): Function computing the structure from this dataset.
+
+        Returns:
+            T: The memoized structure.
+        """
+        if key not in self._derived:
+            self._derived[key] = build(self)
+        return self._derived[key]
+
+
+@dataclass(frozen=True)
+class Changes:
+    """Rows that differ between a dataset and the version it was refreshed from."""
+
+    previous: Dataset
+    updated: list[int]  # Positions of modified rows (same position in both versions)
+    appended: range  # Positions of the rows added at the end
+
+
+@dataclass(frozen=True)
+class RowKeys:
+    """Position and `edited` timestamp of every row, by `url`, to diff upstream payloads."""
+
+    positions: dict[str, int]
+    edited: list[Any]
+
+    @classmethod
+    def build(cls, dataset: Dataset) -> 'RowKeys':
+        return cls(
+            {url: position for position, url in enumerate(dataset.column('url'))},
+            dataset.column('edited'),
+        )
+
+    def apply_changes(self, dataset: Dataset, changes: Changes) -> 'RowKeys':
+        positions, edited = self.positions.copy(), self.edited.copy()
+        urls, timestamps = dataset.store.columns['url'], dataset.store.columns['edited']
+
+        for position in changes.updated:
+            edited[position] = timestamps[position]
+        for position in changes.appended:
+            positions[urls[position]] = position
+            edited.append(timestamps[position])
+
+        return RowKeys(positions, edited)
+
+
+def refresh_dataset(previous: Dataset, items: list[dict]) -> Dataset:
+    """
+    Build the next version of a dataset from a new upstream payload.
+
+    Rows are matched to the current version by `url`; only rows whose `edited` timestamp
+    changed, and rows added at the end, are normalized and validated again, and derived
+    structures implementing `apply_changes` are patched instead of rebuilt. Anything else
+    (rows removed, reordered or inserted in the middle) falls back to a full rebuild.
+
+    Args:
+        previous (Dataset): The current version.
+        items (list[dict]): Raw SWAPI items.
+
+    Returns:
+        Dataset: The new version, or `previous` itself if nothing changed.
+    """
+    diff = _diff(previous, items)
+
+    if diff is None:
+        records = normalize_swapi_batch(previous.model_class, items)
+        return Dataset.from_records(previous.resource, previous.model_class, records)
+
+    updated, appended = diff
+    if not updated and not appended:
+        return previous
+
+    try:
+        store = previous.store.with_changes(updated, appended)
+    except ValueError as e:
+        logger.info(f"Rebuilding '{previous.resource}' dataset: {e}")
+        records = normalize_swapi_batch(previous.model_class, items)
+        return Dataset.from_records(previous.resource, previous.model_class, records)
+
+    dataset = Dataset(
+        previous.resource,
+        previous.model_class,
+        store,
+        rows_changed=len(updated) + len(appended),
+    )
+    changes = Changes(previous, sorted(updated), range(len(previous), len(store)))
+
+    for key, derived in previous._derived.items():
+        apply_changes = getattr(derived, 'apply_changes', None)
+        patched = apply_changes(dataset, changes) if apply_changes else None
+        if patched is not None:
+            dataset._derived[key] = patched
+
+    return dataset
+
+
+def _diff(previous: Dataset, items: list[dict]) -> tuple[dict[int, dict], list[dict]] | None:
+    """
+    Compare a raw payload to a dataset by `url` and `edited`.
+
+    Returns:
+        tuple | None: Normalized records of the modified rows (by position) and of the
+        rows appended at the end, or None if the payload cannot be applied incrementally.
+    """
+    fields = previous.model_class.model_fields
+    if 'url' not in fields or 'edited' not in fields:
+        return None
+
+    keys = previous.derive('row_keys', RowKeys.build)
+    modified: dict[int, dict] = {}
+    appended: list[dict] = []
+    expected = 0
+
+    for item in items:
+        position = keys.positions.get(to_url(item.get('url')))
+
+        if position is None:
+            # New row, or one that is still invalid (e.g. without a name) and stays skipped
+            (record,) = normalize_swapi_items(previous.model_class, [item])
+            if record is not None:
+                appended.append(record)
+        elif appended or position != expected:
+            return None  # Reordered, or inserted before existing rows
+        else:
+            expected += 1
+            if to_datetime(item.get('edited')) != keys.edited[position]:
+                modified[position] = item
+
+    if expected != len(previous):
+        return None  # Rows removed upstream
+
+    records = normalize_swapi_items(previous.model_class, list(modified.values()))
+    if any(record is None for record in records):
+        return None  # A row became invalid: it must be dropped
+
+    return dict(zip(modified, records, strict=True)), appended
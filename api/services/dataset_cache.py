@@ -0,0 +1,198 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+
+from decouple import config as env
+from pydantic import BaseModel
+
+from api.services.dataset import Dataset
+from shared.logger import get_logger
+
+logger = get_logger('api')
+
+# Builds the next version of a resource's dataset, from the current one if any
+Loader = Callable[[type[BaseModel], str, Dataset | None], Awaitable[Dataset]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    refresh_errors: int = 0
+    fallbacks: int = 0  # Expired datasets served because their refresh failed
+    rows_changed: int = 0  # Rows added or modified by refreshes, in total
+    resource_rows_changed: dict[str, int] = field(default_factory=dict)  # Total, by resource
+    last_rows_changed: dict[str, int] = field(default_factory=dict)  # By resource
+
+
+class DatasetCache:
+    """
+    Per-resource in-process cache of SWAPI datasets with stale-while-revalidate.
+
+    - Fresh entries (age <= ttl) are served directly.
+    - Stale entries (ttl < age <= ttl + stale_ttl) are served while a single background
+      task refreshes them.
+    - Missing or expired entries block the caller; concurrent misses for the same
+      resource share a single upstream fetch.
+
+    The last `keep_versions` versions of each resource stay available by version number,
+    so paginated walks started on a version can finish on it.
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float, keep_versions: int = 3):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.keep_versions = keep_versions
+        self.stats = CacheStats()
+        self._entries: dict[str, Dataset] = {}
+        self._versions: dict[str, dict[int, Dataset]] = {}
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def get(self, model_class: type[BaseModel], resource: str, load: Loader) -> Dataset:
+        """
+        Return the cached dataset for a resource, fetching it if needed.
+
+        Args:
+            model_class (type[BaseModel]): The Pydantic model (e.g., Person or Planet)
+            resource (str): The SWAPI resource endpoint name (e.g., people, planets)
+            load (Loader): Coroutine function building the next version of the dataset from
+                upstream, given the current one (None on the first load).
+
+        Returns:
+            Dataset: The cached (possibly stale, or expired if upstream fails) dataset.
+
+        Raises:
+            httpx.HTTPError: If a blocking fetch fails and nothing was cached.
+        """
+        dataset = self._entries.get(resource)
+
+        if dataset is not None:
+            age = dataset.age
+
+            if age <= self.ttl:
+                self.stats.hits += 1
+                return dataset
+
+            if age <= self.ttl + self.stale_ttl:
+                self.stats.stale_hits += 1
+                self._refresh(model_class, resource, load)
+                return dataset
+
+        self.stats.misses += 1
+        # Shield the shared task so a cancelled request does not abort it for the others
+        task = self._refresh(model_class, resource, load)
+        if dataset is None:
+            return await asyncio.shield(task)
+
+        try:
+            return await asyncio.shield(task)
+        except Exception as e:
+            # Upstream is down (or its circuit breaker open): the last good version beats none
+            self.stats.fallbacks += 1
+            logger.warning(
+                f"Serving expired '{resource}' dataset v{dataset.version} "
+                f'({dataset.age:.0f}s old): {e!r}'
+            )
+            return dataset
+
+    def seed(self, dataset: Dataset, load: Loader) -> None:
+        """
+        Serve a dataset obtained elsewhere (e.g. restored from a snapshot) until the next
+        refresh, starting that refresh in the background right away if it is not fresh.
+
+        Args:
+            dataset (Dataset): The dataset, keeping the age it had when fetched.
+            load (Loader): Coroutine function building its next version.
+        """
+        if dataset.resource in self._entries:
+            return
+
+        self._store(dataset)
+        if dataset.age > self.ttl:
+            self._refresh(dataset.model_class, dataset.resource, load)
+
+    def peek(self, resource: str) -> Dataset | None:
+        """Return the cached dataset of a resource, if any, without refreshing it."""
+        return self._entries.get(resource)
+
+    def get_version(self, resource: str, version: int) -> Dataset | None:
+        """Return a recent version of a resource's dataset, if it is still kept."""
+        return self._versions.get(resource, {}).get(version)
+
+    def install(self, dataset: Dataset) -> None:
+        """Replace the cached dataset of a resource (e.g. by one published by another process)."""
+        self._store(dataset)
+
+    async def refresh(self, model_class: type[BaseModel], resource: str, load: Loader) -> Dataset:
+        """Refresh a resource now (or join the running refresh) and return the new dataset."""
+        return await asyncio.shield(self._refresh(model_class, resource, load))
+
+    def clear(self) -> None:
+        """Drop every cached dataset and cancel pending refreshes."""
+        for task in self._inflight.values():
+            task.cancel()
+
+        self._entries.clear()
+        self._versions.clear()
+        self._inflight.clear()
+        self.stats = CacheStats()
+
+    def _refresh(self, model_class: type[BaseModel], resource: str, load: Loader) -> asyncio.Task:
+        """Start a refresh for the resource, or join the one already running."""
+        task = self._inflight.get(resource)
+
+        if task is None:
+            task = asyncio.create_task(self._load(model_class, resource, load))
+            task.add_done_callback(lambda t: self._on_refreshed(resource, t))
+            self._inflight[resource] = task
+
+        return task
+
+    async def _load(self, model_class: type[BaseModel], resource: str, load: Loader) -> Dataset:
+        previous = self._entries.get(resource)
+        dataset = await load(model_class, resource, previous)
+
+        if dataset is previous:
+            # Nothing changed upstream: keep the version (and its derived structures)
+            dataset = replace(previous, fetched_at=time.monotonic(), rows_changed=0)
+
+        self._store(dataset)
+        self.stats.refreshes += 1
+        self.stats.rows_changed += dataset.rows_changed
+        self.stats.resource_rows_changed[resource] = (
+            self.stats.resource_rows_changed.get(resource, 0) + dataset.rows_changed
+        )
+        self.stats.last_rows_changed[resource] = dataset.rows_changed
+
+        logger.info(
+            f"Cached '{resource}' dataset v{dataset.version} "
+            f'({len(dataset)} rows, {dataset.rows_changed} changed)'
+        )
+        return dataset
+
+    def _store(self, dataset: Dataset) -> None:
+        self._entries[dataset.resource] = dataset
+
+        versions = self._versions.setdefault(dataset.resource, {})
+        versions.pop(dataset.version, None)
+        versions[dataset.version] = dataset
+        while len(versions) > self.keep_versions:
+            del versions[next(iter(versions))]
+
+    def _on_refreshed(self, resource: str, task: asyncio.Task) -> None:
+        if self._inflight.get(resource) is task:
+            del self._inflight[resource]
+
+        if not task.cancelled() and task.exception() is not None:
+            self.stats.refresh_errors += 1
+            logger.warning(f"Failed to refresh '{resource}' dataset: {task.exception()!r}")
+
+
+dataset_cache = DatasetCache(
+    ttl=env('SWAPI_CACHE_TTL', default=300, cast=float),
+    stale_ttl=env('SWAPI_CACHE_STALE_TTL', default=3600, cast=float),
+    keep_versions=env('SWAPI_CACHE_KEEP_VERSIONS', default=3, cast=int),
+)
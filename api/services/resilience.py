@@ -0,0 +1,253 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from typing import Any, TypeVar
+
+import httpx
+from decouple import config as env
+
+from shared.logger import get_logger
+
+logger = get_logger('api')
+
+T = TypeVar('T')
+
+# Statuses worth retrying: the request may succeed later (others are the caller's fault)
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of calling an upstream whose circuit breaker is open."""
+
+
+@dataclass
+class ResilienceStats:
+    attempts: int = 0
+    retries: int = 0
+    failures: int = 0  # Calls that failed after their last attempt
+    attempt_timeouts: int = 0
+    hedges: int = 0  # Attempts duplicated because the first one was slow
+    hedge_wins: int = 0  # Duplicates that answered first
+    short_circuits: int = 0  # Calls refused by the open breaker
+    breaker_trips: int = 0
+    errors: dict[str, int] = field(default_factory=dict)  # Failed attempts, by status or error
+
+
+class CircuitBreaker:
+    """
+    Stop calling an upstream after `threshold` consecutive failures, for `reset_after`
+    seconds. Then a single probe call is let through (half-open): its success closes the
+    breaker, its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        reset_after: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.clock = clock
+        self.failures = 0  # Consecutive
+        self.opened_at: float | None = None
+        self.probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if self.probing or self.clock() - self.opened_at >= self.reset_after:
+            return 'half_open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Check whether a call may go through (claiming the probe when half-open)."""
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures, self.opened_at, self.probing = 0, None, False
+
+    def release(self) -> None:
+        """Let another call probe the upstream, when the probe ended without a verdict."""
+        self.probing = False
+
+    def record_failure(self) -> bool:
+        """Count a failure, and return True if it opened the breaker."""
+        self.failures += 1
+        if self.probing or (self.opened_at is None and self.failures >= self.threshold):
+            self.opened_at, self.probing = self.clock(), False
+            return True
+        return False
+
+
+def is_retryable(error: Exception) -> bool:
+    """Check whether a failed request may succeed if repeated (and is upstream's fault)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUSES
+    return isinstance(error, httpx.TransportError)
+
+
+class Resilience:
+    """
+    Call an upstream through bounded retries with jittered exponential backoff, a deadline
+    per attempt, optional hedging (a second identical attempt when the first is slower
+    than `hedge_delay`) and a circuit breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        attempts: int = 3,
+        backoff: float = 0.2,
+        backoff_max: float = 2.0,
+        attempt_timeout: float = 10.0,
+        hedge_delay: float = 0.0,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+    ):
+        self.name = name
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.attempt_timeout = attempt_timeout
+        self.hedge_delay = hedge_delay
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_reset)
+        self.stats = ResilienceStats()
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run a request (a coroutine function, called once per attempt) resiliently.
+
+        Args:
+            request (Callable): Makes the request and returns its result, raising
+                `httpx.HTTPError` on failure.
+
+        Returns:
+            T: The result of the first successful attempt.
+
+        Raises:
+            CircuitOpenError: If the breaker is open.
+            httpx.HTTPError: The error of the last attempt, or the first one that is not
+                worth retrying (e.g. a 404).
+        """
+        for attempt in range(self.attempts):
+            if not self.breaker.allow():
+                self.stats.short_circuits += 1
+                raise CircuitOpenError(f'{self.name} circuit breaker is open')
+
+            self.stats.attempts += 1
+            try:
+                result = await self.attempt(request)
+            except httpx.HTTPError as e:
+                if self.give_up(e, last=attempt == self.attempts - 1):
+                    raise
+                self.stats.retries += 1
+                await asyncio.sleep(self.delay(attempt))
+            except BaseException:
+                self.breaker.release()  # E.g. cancelled: no verdict on the upstream
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+        raise AssertionError('unreachable')  # pragma: no cover
+
+    def give_up(self, error: httpx.HTTPError, last: bool) -> bool:
+        """Record a failed attempt, and decide whether to raise its error or retry."""
+        kind = (
+            str(error.response.status_code)
+            if isinstance(error, httpx.HTTPStatusError)
+            else type(error).__name__
+        )
+        self.stats.errors[kind] = self.stats.errors.get(kind, 0) + 1
+
+        if not is_retryable(error):
+            self.breaker.record_success()  # Upstream answered: the request is at fault
+            return True
+
+        opened = self.breaker.record_failure()
+        if opened:
+            self.stats.breaker_trips += 1
+            logger.warning(f'{self.name} circuit breaker opened after {error!r}')
+
+        if opened or last:
+            self.stats.failures += 1
+            return True
+        return False
+
+    def delay(self, attempt: int) -> float:
+        """Backoff before retrying after `attempt` (0-based): full jitter, capped."""
+        return random.uniform(0, min(self.backoff_max, self.backoff * 2**attempt))
+
+    async def attempt(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run one attempt (possibly hedged) within the per-attempt deadline."""
+        try:
+            async with asyncio.timeout(self.attempt_timeout):
+                if self.hedge_delay > 0:
+                    return await self.hedged(request)
+                return await request()
+        except TimeoutError as e:
+            self.stats.attempt_timeouts += 1
+            raise httpx.TimeoutException(
+                f'{self.name} did not answer within {self.attempt_timeout}s'
+            ) from e
+
+    async def hedged(self, request: Callable[[], Awaitable[T]]) -> T:
+        """Run a request, and a duplicate if it is slow: the first success wins."""
+        tasks = [asyncio.ensure_future(request())]
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+            if not done:
+                self.stats.hedges += 1
+                tasks.append(asyncio.ensure_future(request()))
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        self.stats.hedge_wins += task is not tasks[0]
+                        return task.result()
+
+            raise tasks[0].exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def reset(self) -> None:
+        """Close the breaker and zero the counters."""
+        self.breaker.record_success()
+        self.stats = ResilienceStats()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Breaker state and counters, e.g. for monitoring."""
+        return {
+            'breaker': {
+                'state': self.breaker.state,
+                'consecutive_failures': self.breaker.failures,
+            },
+            **asdict(self.stats),
+        }
+
+
+# The SWAPI upstream, shared by every request of the process
+swapi_resilience = Resilience(
+    'SWAPI',
+    attempts=env('SWAPI_RETRY_ATTEMPTS', default=3, cast=int),
+    backoff=env('SWAPI_RETRY_BACKOFF', default=0.2, cast=float),
+    backoff_max=env('SWAPI_RETRY_BACKOFF_MAX', default=2.0, cast=float),
+    attempt_timeout=env('SWAPI_ATTEMPT_TIMEOUT', default=15.0, cast=float),
+    hedge_delay=env('SWAPI_HEDGE_DELAY', default=0.0, cast=float),
+    breaker_threshold=env('SWAPI_BREAKER_THRESHOLD', default=5, cast=int),
+    breaker_reset=env('SWAPI_BREAKER_RESET', default=30.0, cast=float),
+)
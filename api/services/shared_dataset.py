@@ -0,0 +1,382 @@
+import asyncio
+import bisect
+import fcntl
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from pydantic import BaseModel
+
+from api.services.dataset import Dataset, reserve_versions
+from api.services.dataset_cache import Loader, dataset_cache
+from api.utils.columnar import BufferReader, BufferWriter, ColumnStore
+from api.utils.filters import is_sortable_field
+from api.utils.indexes import SearchIndex, SortIndex, get_search_index, get_sort_index
+from shared.logger import get_logger
+
+logger = get_logger('api')
+
+MAGIC = b'SWSHARE2'
+_HEADER = struct.Struct('<Q')
+_ALIGNMENT = 8
+
+
+class Postings(Mapping[str, Sequence[int]]):
+    """
+    Posting lists of a search index, read in place: the grams (sorted, looked up by
+    bisection) and a flat array of positions, sliced at their offsets.
+    """
+
+    def __init__(self, grams: Sequence[str], offsets: Sequence[int], positions: Sequence[int]):
+        self._grams = grams
+        self._offsets = offsets
+        self._positions = positions
+
+    def __getitem__(self, gram: str) -> Sequence[int]:
+        i = bisect.bisect_left(self._grams, gram)
+        if i == len(self._grams) or self._grams[i] != gram:
+            raise KeyError(gram)
+        return self._positions[self._offsets[i] : self._offsets[i + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._grams)
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+
+def published_path(directory: str | Path, resource: str) -> Path:
+    return Path(directory) / f'{resource}.shared'
+
+
+def publish(dataset: Dataset, directory: str | Path, accents: bool = False) -> Path:
+    """
+    Write a dataset and its indexes (a sort index per sortable field, and the search index)
+    to `<directory>/<resource>.shared`, in a layout other processes can map in memory.
+
+    Columns, string tables, sort indexes and the search index (names, grams and postings)
+    are all written as buffers; the JSON header only describes them (untyped columns
+    excepted, kept in it as JSON values).
+
+    The file is written next to its final path and renamed over it: processes still
+    reading the previous version keep their mapping, new ones map the new version.
+
+    Args:
+        dataset (Dataset): The dataset to publish.
+        directory (str | Path): Shared directory.
+        accents (bool): Whether the published search index folds accents.
+
+    Returns:
+        Path: The published file.
+    """
+    writer = BufferWriter()
+    sort = {}
+
+    for field in dataset.model_class.model_fields:
+        if is_sortable_field(dataset.model_class, field):
+            index = get_sort_index(dataset, field)
+            sort[field] = {
+                'asc': writer.array(array('I', index.asc)),
+                'desc': writer.array(array('I', index.desc)),
+                'present': index.present,
+            }
+
+    search = get_search_index(dataset, accents)
+    grams = sorted(search.grams)
+    offsets = array('I', [0])
+    positions = array('I')
+    for gram in grams:
+        positions.extend(search.grams[gram])
+        offsets.append(len(positions))
+
+    store = dataset.store.to_bytes()
+    meta = json.dumps(
+        {
+            'resource': dataset.resource,
+            'version': dataset.version,
+            'fetched_at': time.time() - dataset.age,
+            'store': len(store),
+            'sort': sort,
+            'search': {
+                'accents': accents,
+                'names': writer.strings(search.names),
+                'grams': writer.strings(grams),
+                'offsets': writer.array(offsets),
+                'positions': writer.array(positions),
+            },
+        },
+        separators=(',', ':'),
+    ).encode()
+
+    path = published_path(directory, dataset.resource)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, delete=False) as file:
+        for chunk in (MAGIC, _HEADER.pack(len(meta)), meta, _padding(len(meta))):
+            file.write(chunk)
+        file.write(store)
+        file.write(_padding(len(store)))
+        for chunk in writer.chunks:
+            file.write(chunk)
+    os.replace(file.name, path)
+
+    logger.info(f"Published '{dataset.resource}' dataset v{dataset.version} to {path}")
+    return path
+
+
+def open_published(model_class: type[BaseModel], path: str | Path) -> Dataset:
+    """
+    Map a published dataset in memory. Column arrays, string tables and indexes are read
+    in place from the mapping (shared with every process mapping the same file), not
+    copied: strings are only decoded when read.
+
+    Args:
+        model_class (type[BaseModel]): The Pydantic model the dataset was built for.
+        path (str | Path): The published file.
+
+    Returns:
+        Dataset: The dataset, with the published version and indexes.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If it is not a dataset published for this model.
+    """
+    with open(path, 'rb') as file:
+        view = memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+
+    meta, start = _read_meta(view)
+    store = ColumnStore.from_bytes(model_class, view[start : start + meta['store']], copy=False)
+    reader = BufferReader(view[start + meta['store'] + len(_padding(meta['store'])) :], copy=False)
+
+    age = max(0.0, time.time() - meta['fetched_at'])  # Wall clock: shared between processes
+    dataset = Dataset(
+        meta['resource'],
+        model_class,
+        store,
+        version=meta['version'],
+        fetched_at=time.monotonic() - age,
+    )
+
+    indexes: dict[Any, Any] = {}
+    for field, spec in meta['sort'].items():
+        asc, desc = reader.array(spec['asc']), reader.array(spec['desc'])
+        indexes['sort', field] = SortIndex(field, asc, desc, spec['present'])
+
+    search = meta['search']
+    grams = Postings(
+        reader.strings(search['grams']),
+        reader.array(search['offsets']),
+        reader.array(search['positions']),
+    )
+    names = reader.strings(search['names'])
+    indexes['search', search['accents']] = SearchIndex(names, grams, search['accents'])
+
+    for key, index in indexes.items():
+        dataset.derive(key, lambda _, index=index: index)
+
+    return dataset
+
+
+def published_version(path: str | Path) -> int:
+    """Read the version of a published dataset, without mapping it."""
+    with open(path, 'rb') as file:
+        prefix = file.read(len(MAGIC) + _HEADER.size)
+        (size,) = _HEADER.unpack(prefix[len(MAGIC) :])
+        meta, _ = _read_meta(memoryview(prefix + file.read(size)))
+    return meta['version']
+
+
+def _read_meta(view: memoryview) -> tuple[dict[str, Any], int]:
+    """Parse the header of a published dataset, returning it and where the data starts."""
+    if bytes(view[: len(MAGIC)]) != MAGIC:
+        raise ValueError('Not a published dataset')
+
+    start = len(MAGIC) + _HEADER.size
+    (size,) = _HEADER.unpack(view[len(MAGIC) : start])
+    meta = json.loads(bytes(view[start : start + size]))
+
+    return meta, start + size + len(_padding(size))
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % _ALIGNMENT)
+
+
+class LeaderLock:
+    """Non-blocking exclusive lock on a file, released when the process exits."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: IO | None = None
+
+    @property
+    def held(self) -> bool:
+        return self._file is not None
+
+    def acquire(self) -> bool:
+        """Take the lock if it is free, returning whether this process holds it."""
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            file = open(self.path, 'a')
+
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                file.close()
+                return False
+
+            self._file = file
+
+        return True
+
+    def release(self) -> None:
+        if self._file is not None:
+            self._file.close()  # Releases the lock
+            self._file = None
+
+
+class SharedDatasets:
+    """
+    Share cached datasets between the worker processes of a machine.
+
+    Workers elect a leader by locking `<directory>/leader.lock`. The leader alone loads
+    datasets from SWAPI (on its usual refresh cycle) and publishes each new version, with
+    its indexes, to a file every other worker maps in memory. Followers pick new versions
+    up by polling, swapping the whole dataset at once. If the leader exits, the next
+    worker to poll takes over.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        load: Loader,
+        poll_interval: float = 1.0,
+        wait_timeout: float = 30.0,
+        accents: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.poll_interval = poll_interval
+        self.wait_timeout = wait_timeout
+        self.accents = accents
+        self.lock = LeaderLock(self.directory / 'leader.lock')
+        self._load = load
+        self._mapped: dict[str, tuple[tuple[int, int], Dataset]] = {}
+
+    @property
+    def is_leader(self) -> bool:
+        return self.lock.held
+
+    def elect(self) -> bool:
+        """Become the leader if there is none, returning whether this process leads."""
+        if self.lock.held or not self.lock.acquire():
+            return self.lock.held
+
+        # Keep versions increasing across leaders (e.g. for cursors bound to a version)
+        published = []
+        for path in self.directory.glob('*.shared'):
+            try:
+                published.append(published_version(path))
+            except (OSError, ValueError, KeyError, struct.error):
+                continue
+        reserve_versions(max(published, default=0))
+
+        logger.info(f'Worker {os.getpid()} leads the shared datasets in {self.directory}')
+        return True
+
+    async def load(
+        self, model_class: type[BaseModel], resource: str, previous: Dataset | None
+    ) -> Dataset:
+        """
+        Loader for the dataset cache: the leader loads from SWAPI and publishes, followers
+        read the published version (waiting for the first one, up to `wait_timeout`).
+        """
+        if self.elect():
+            return await self._load_and_publish(model_class, resource, previous)
+
+        deadline = time.monotonic() + self.wait_timeout
+
+        while (dataset := await asyncio.to_thread(self.read, model_class, resource)) is None:
+            if self.elect():
+                return await self._load_and_publish(model_class, resource, previous)
+            if time.monotonic() > deadline:
+                logger.warning(f"No shared '{resource}' dataset published, loading it directly")
+                return await self._load(model_class, resource, previous)
+            await asyncio.sleep(self.poll_interval)
+
+        if previous is not None and previous.version == dataset.version:
+            return previous
+        return dataset
+
+    def read(self, model_class: type[BaseModel], resource: str) -> Dataset | None:
+        """Return the published version of a dataset (mapping it once), if any."""
+        path = published_path(self.directory, resource)
+
+        try:
+            stat = path.stat()
+            key = (stat.st_ino, stat.st_mtime_ns)
+            mapped = self._mapped.get(resource)
+
+            if mapped is None or mapped[0] != key:
+                mapped = self._mapped[resource] = (key, open_published(model_class, path))
+                logger.info(f"Mapped shared '{resource}' dataset v{mapped[1].version}")
+
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring shared '{resource}' dataset {path}: {e}")
+            return None
+
+        return mapped[1]
+
+    async def run(self, resources: Iterable[tuple[type[BaseModel], str]]) -> None:
+        """
+        Keep the cached datasets in sync until cancelled: the leader refreshes expired
+        datasets (publishing them), followers install the versions it publishes.
+
+        Args:
+            resources (Iterable): Pairs of Pydantic model and SWAPI resource name.
+        """
+        resources = list(resources)
+
+        while True:
+            for model_class, resource in resources:
+                try:
+                    await self._sync(model_class, resource)
+                except Exception as e:
+                    logger.warning(f"Failed to sync shared '{resource}' dataset: {e!r}")
+
+            await asyncio.sleep(self.poll_interval)
+
+    async def _sync(self, model_class: type[BaseModel], resource: str) -> None:
+        current = dataset_cache.peek(resource)
+
+        if self.elect():
+            if current is None or current.age > dataset_cache.ttl:
+                await dataset_cache.refresh(model_class, resource, self.load)
+            return
+
+        dataset = await asyncio.to_thread(self.read, model_class, resource)
+        if dataset is not None and (current is None or current.version != dataset.version):
+            dataset_cache.install(dataset)
+
+    async def _load_and_publish(
+        self, model_class: type[BaseModel], resource: str, previous: Dataset | None
+    ) -> Dataset:
+        dataset = await self._load(model_class, resource, previous)
+
+        published = self._mapped.get(resource)
+        if published is None or published[1].version != dataset.version:
+            await asyncio.to_thread(publish, dataset, self.directory, self.accents)
+            self._mapped[resource] = ((0, 0), dataset)
+
+        return dataset
+
+    def close(self) -> None:
+        self.lock.release()
@@ -0,0 +1,100 @@
+import json
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from api.services.dataset import Dataset
+from api.utils.columnar import ColumnStore
+from shared.logger import get_logger
+
+logger = get_logger('api')
+
+MAGIC = b'SWSNAP1\n'
+_HEADER = struct.Struct('<Q')
+
+
+def snapshot_path(directory: str | Path, resource: str) -> Path:
+    return Path(directory) / f'{resource}.snapshot'
+
+
+def save_snapshot(dataset: Dataset, directory: str | Path) -> Path | None:
+    """
+    Persist a dataset to `<directory>/<resource>.snapshot`.
+
+    The file is written next to its final path and renamed over it, so concurrent
+    readers (and writers, e.g. other workers) always see a complete snapshot.
+
+    Args:
+        dataset (Dataset): The dataset to persist.
+        directory (str | Path): Snapshot directory, created if needed.
+
+    Returns:
+        Path | None: The snapshot path, or None if it could not be written.
+    """
+    path = snapshot_path(directory, dataset.resource)
+    meta = json.dumps(
+        {'resource': dataset.resource, 'fetched_at': time.time() - dataset.age}
+    ).encode()
+
+    temporary = None
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, delete=False) as file:
+            temporary = Path(file.name)
+            file.write(MAGIC + _HEADER.pack(len(meta)) + meta)
+            file.write(dataset.store.to_bytes())
+        os.replace(temporary, path)
+
+    except OSError as e:
+        logger.warning(f"Failed to save '{dataset.resource}' snapshot to {path}: {e}")
+        if temporary is not None:
+            temporary.unlink(missing_ok=True)
+        return None
+
+    logger.info(f"Saved '{dataset.resource}' snapshot v{dataset.version} to {path}")
+    return path
+
+
+def load_snapshot(
+    model_class: type[BaseModel], resource: str, directory: str | Path
+) -> Dataset | None:
+    """
+    Load the dataset persisted for a resource, keeping the age it had when saved.
+
+    Args:
+        model_class (type[BaseModel]): The Pydantic model (e.g., Person or Planet)
+        resource (str): The SWAPI resource endpoint name (e.g., people, planets)
+        directory (str | Path): Snapshot directory.
+
+    Returns:
+        Dataset | None: The dataset, or None if there is no usable snapshot (missing,
+        corrupted, or written for another version of the model).
+    """
+    path = snapshot_path(directory, resource)
+
+    try:
+        data = memoryview(path.read_bytes())
+        if bytes(data[: len(MAGIC)]) != MAGIC:
+            raise ValueError('not a snapshot file')
+
+        start = len(MAGIC) + _HEADER.size
+        (size,) = _HEADER.unpack(data[len(MAGIC) : start])
+        meta = json.loads(bytes(data[start : start + size]))
+        store = ColumnStore.from_bytes(model_class, data[start + size :])
+        age = max(0.0, time.time() - meta['fetched_at'])
+
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+        logger.warning(f"Ignoring '{resource}' snapshot {path}: {e}")
+        return None
+
+    dataset = Dataset(resource, model_class, store, fetched_at=time.monotonic() - age)
+
+    logger.info(f"Loaded '{resource}' snapshot ({len(dataset)} rows, {age:.0f}s old)")
+    return dataset
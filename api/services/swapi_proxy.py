@@ -1,24 +1,109 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
+
 import httpx
 from decouple import config as env
 from pydantic import BaseModel
 
 from api.models import Person, Planet
-from api.utils.filters import normalize_swapi_data
+from api.services.resilience import swapi_resilience
+from api.utils.metrics import timed
+from api.utils.normalization import normalize_swapi_batch
 from shared.logger import get_logger
 
 logger = get_logger('api')
 
+# Shared pooled client, owned by the FastAPI lifespan (see api.main)
+_client: httpx.AsyncClient | None = None
+
 
-async def fetch_swapi_data(model_class: type[BaseModel], resource: str) -> list[Person | Planet]:
+def create_swapi_client() -> httpx.AsyncClient:
     """
-    Fetch and normalize data from the SWAPI for a given resource.
+    Build an HTTP client for SWAPI configured from the environment.
+
+    Pool limits, timeouts and HTTP/2 (requires the `h2` package) are read through decouple.
+
+    Returns:
+        httpx.AsyncClient: A new, unopened client.
+    """
+    return httpx.AsyncClient(
+        http2=env('SWAPI_HTTP2', default=False, cast=bool),
+        limits=httpx.Limits(
+            max_connections=env('SWAPI_HTTP_MAX_CONNECTIONS', default=20, cast=int),
+            max_keepalive_connections=env('SWAPI_HTTP_MAX_KEEPALIVE', default=10, cast=int),
+            keepalive_expiry=env('SWAPI_HTTP_KEEPALIVE_EXPIRY', default=30.0, cast=float),
+        ),
+        timeout=httpx.Timeout(
+            env('SWAPI_HTTP_TIMEOUT', default=10.0, cast=float),
+            connect=env('SWAPI_HTTP_CONNECT_TIMEOUT', default=5.0, cast=float),
+        ),
+    )
+
+
+@asynccontextmanager
+async def swapi_client_lifespan() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Open the shared SWAPI client for the lifetime of the application and close it on exit.
+    """
+    global _client
+
+    async with create_swapi_client() as client:
+        _client = client
+        try:
+            yield client
+        finally:
+            _client = None
+
+
+@asynccontextmanager
+async def get_swapi_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Yield the shared SWAPI client, or a short-lived one when used outside the app lifespan
+    (e.g. scripts or tests).
+    """
+    if _client is not None:
+        yield _client
+        return
+
+    async with create_swapi_client() as client:
+        yield client
+
+
+async def get_json(url: str) -> Any:
+    """
+    GET a SWAPI URL through the resilience layer (retries, deadlines, circuit breaker).
+
+    Args:
+        url (str): The URL.
+
+    Returns:
+        Any: The JSON body.
+
+    Raises:
+        httpx.HTTPError: If every attempt fails, the response is an error that is not worth
+        retrying, or the circuit breaker is open (`CircuitOpenError`).
+    """
+    async with get_swapi_client() as client:
+
+        async def request() -> Any:
+            response = await client.get(url)
+            response.raise_for_status()
+            return response.json()
+
+        with timed('fetch'):
+            return await swapi_resilience.call(request)
+
+
+async def fetch_swapi_items(resource: str) -> list[dict]:
+    """
+    Fetch the raw items of a SWAPI resource, without normalizing them.
 
     Args:
-        model_class (type[BaseModel]): The Pydantic model (e.g., Person or Planet)
         resource (str): The SWAPI resource endpoint name (e.g., people, planets)
 
     Returns:
-        list[Person] | list[Planet]: List of parsed and validated model instances.
+        list[dict]: Items as returned by SWAPI.
 
     Raises:
         httpx.HTTPError: If the HTTP request fails or returns an error status.
@@ -26,16 +111,56 @@ async def fetch_swapi_data(model_class: type[BaseModel], resource: str) -> list[
     url = f'{env("SWAPI_BASE_URL")}/{resource}'
 
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url)
-            response.raise_for_status()
-
-            raw_data: list[dict] = response.json()
-            # Normalize data (strip 'unknown', cast numbers/dates, etc.)
-            normalized_data = list(filter(None, map(normalize_swapi_data, raw_data)))
-            # Parse into Pydantic model instances
-            return [model_class(**item) for item in normalized_data]
+        return await get_json(url)
 
     except httpx.HTTPError:
         logger.exception(f"Failed to fetch '{resource}' from SWAPI: {url}")
         raise
+
+
+async def fetch_swapi_item(resource: str, id: str) -> dict:
+    """
+    Fetch a single raw item of a SWAPI resource (e.g. `films/1`), without normalizing it.
+
+    Args:
+        resource (str): The SWAPI resource endpoint name (e.g., films, species)
+        id (str): The item id, as in its URL.
+
+    Returns:
+        dict: The item as returned by SWAPI.
+
+    Raises:
+        httpx.HTTPError: If the HTTP request fails or returns an error status.
+    """
+    return await get_json(f'{env("SWAPI_BASE_URL")}/{resource}/{id}')
+
+
+async def fetch_swapi_data(
+    model_class: type[BaseModel], resource: str, validate: bool = True
+) -> list[Person | Planet] | list[dict]:
+    """
+    Fetch and normalize data from the SWAPI for a given resource.
+
+    Args:
+        model_class (type[BaseModel]): The Pydantic model (e.g., Person or Planet)
+        resource (str): The SWAPI resource endpoint name (e.g., people, planets)
+        validate (bool): Parse the items into models (default). When False, the normalized
+            dicts are returned and validation is left to the caller.
+
+    Returns:
+        list[Person] | list[Planet] | list[dict]: Parsed and validated model instances,
+        or normalized items if `validate` is False.
+
+    Raises:
+        httpx.HTTPError: If the HTTP request fails or returns an error status.
+    """
+    raw_data = await fetch_swapi_items(resource)
+
+    # Normalize data (strip 'unknown', cast numbers/dates, etc.)
+    normalized_data = normalize_swapi_batch(model_class, raw_data)
+    if not validate:
+        return normalized_data
+
+    # Parse into Pydantic model instances
+    with timed('validate'):
+        return [model_class(**item) for item in normalized_data]
@@ -0,0 +1,695 @@
+import json
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import cache
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin
+
+from pydantic import AnyUrl, BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_jsonable_python
+
+EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+MICROSECOND = timedelta(microseconds=1)
+
+SNAPSHOT_MAGIC = b'SWCOLS2\n'
+_HEADER = struct.Struct('<Q')
+_ALIGNMENT = 8
+
+
+class StringTable:
+    """
+    Dictionary encoding of strings: each distinct value is stored once, rows keep codes.
+
+    A table read in place from a buffer (see `PackedStrings`) is only copied and indexed
+    when a new value is first encoded into it.
+    """
+
+    def __init__(self) -> None:
+        self.values: Sequence[str | None] = [None]
+        self._codes: dict[str | None, int] | None = {None: 0}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @classmethod
+    def from_values(cls, values: Sequence[str | None]) -> 'StringTable':
+        table = cls()
+        table.values, table._codes = values, None
+        return table
+
+    def encode(self, value: str | None) -> int:
+        if self._codes is None:
+            self.values = list(self.values)
+            self._codes = {value: code for code, value in enumerate(self.values)}
+
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class PackedStrings(Sequence[str | None]):
+    """
+    Strings read in place from a buffer (e.g. a memory-mapped file): their UTF-8 bytes end
+    to end, and the offsets they start at. Each string is decoded when read.
+    """
+
+    def __init__(self, offsets: Sequence[int], data: bytes | memoryview, nulls: Iterable[int]):
+        self._offsets = offsets
+        self._data = data
+        self._nulls = frozenset(nulls)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str | None:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('string index out of range')
+        if index in self._nulls:
+            return None
+        return str(self._data[self._offsets[index] : self._offsets[index + 1]], 'utf-8')
+
+
+class NumberColumn:
+    """Integers or floats in a typed array, with a null mask."""
+
+    def __init__(self, typecode: str, values: list[Any]):
+        self.data = array(
+            typecode, [0 if value is None else self.encode(value) for value in values]
+        )
+        self.nulls = bytearray(value is None for value in values)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Any:
+        return None if self.nulls[index] else self.data[index]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.itemsize * len(self.data) + len(self.nulls)
+
+    def encode(self, value: Any) -> Any:
+        return value
+
+    def updated(self, changes: Mapping[int, Any], appended: list[Any]) -> 'NumberColumn':
+        """Return a copy with some rows replaced and new rows appended."""
+        column = object.__new__(type(self))
+        column.data, column.nulls = _copy(self.data), bytearray(self.nulls)
+
+        for index, value in changes.items():
+            column.data[index] = 0 if value is None else self.encode(value)
+            column.nulls[index] = value is None
+
+        column.data.extend(0 if value is None else self.encode(value) for value in appended)
+        column.nulls.extend(value is None for value in appended)
+        return column
+
+    def dump(self, writer: 'BufferWriter') -> dict[str, Any]:
+        return {'data': writer.array(self.data), 'nulls': writer.array(self.nulls)}
+
+    @classmethod
+    def load(cls, spec: dict[str, Any], reader: 'BufferReader') -> 'NumberColumn':
+        column = object.__new__(cls)
+        column.data, column.nulls = reader.array(spec['data']), reader.bytes(spec['nulls'])
+        return column
+
+
+class DatetimeColumn(NumberColumn):
+    """Timezone-aware datetimes stored as microseconds since the epoch (UTC)."""
+
+    def __init__(self, values: list[datetime | None]):
+        super().__init__('q', values)
+
+    def __getitem__(self, index: int) -> datetime | None:
+        return None if self.nulls[index] else EPOCH + self.data[index] * MICROSECOND
+
+    def encode(self, value: datetime) -> int:
+        if value.utcoffset() is None:
+            raise ValueError('Naive datetimes cannot be stored in a DatetimeColumn')
+        return (value - EPOCH) // MICROSECOND
+
+
+class StringColumn:
+    """Strings stored as integer codes into a (possibly shared) string table."""
+
+    def __init__(self, values: list[str | None], table: StringTable):
+        self.table = table
+        self.codes = array('I', [table.encode(value) for value in values])
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index: int) -> str | None:
+        return self.table.values[self.codes[index]]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes)
+
+    def updated(self, changes: Mapping[int, Any], appended: list[Any]) -> 'StringColumn':
+        """Return a copy with some rows replaced and new rows appended."""
+        # String tables only ever grow, so they can be shared with the previous version
+        column = object.__new__(StringColumn)
+        column.table, column.codes = self.table, _copy(self.codes)
+
+        for index, value in changes.items():
+            column.codes[index] = self.table.encode(value)
+
+        column.codes.extend(self.table.encode(value) for value in appended)
+        return column
+
+    def dump(self, writer: 'BufferWriter') -> dict[str, Any]:
+        return {'table': writer.table(self.table), 'codes': writer.array(self.codes)}
+
+    @classmethod
+    def load(cls, spec: dict[str, Any], reader: 'BufferReader') -> 'StringColumn':
+        column = object.__new__(cls)
+        column.table, column.codes = reader.tables[spec['table']], reader.array(spec['codes'])
+        return column
+
+
+class StringListColumn:
+    """
+    Lists of strings stored as integer codes in a flat array, each row pointing to its
+    slice (start and length) of it.
+    """
+
+    def __init__(self, values: list[list[str]], table: StringTable):
+        self.table = table
+        self.starts = array('I')
+        self.lengths = array('I')
+        self.codes = array('I')
+
+        for items in values:
+            self._append(items)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> list[str]:
+        start = self.starts[index]
+        codes = self.codes[start : start + self.lengths[index]]
+        return [self.table.values[code] for code in codes]
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.itemsize * (len(self.codes) + len(self.starts) + len(self.lengths))
+
+    def updated(self, changes: Mapping[int, Any], appended: list[Any]) -> 'StringListColumn':
+        """
+        Return a copy with some rows replaced and new rows appended. Replaced lists are
+        written at the end of the code array; the array is compacted once it is mostly
+        made of lists that are no longer referenced.
+        """
+        column = object.__new__(StringListColumn)
+        column.table = self.table
+        column.starts, column.lengths = _copy(self.starts), _copy(self.lengths)
+        column.codes = _copy(self.codes)
+
+        for index, items in changes.items():
+            column.starts[index], column.lengths[index] = len(column.codes), len(items)
+            column.codes.extend(self.table.encode(item) for item in items)
+
+        for items in appended:
+            column._append(items)
+
+        if len(column.codes) > 2 * sum(column.lengths):
+            return StringListColumn([column[index] for index in range(len(column))], self.table)
+        return column
+
+    def dump(self, writer: 'BufferWriter') -> dict[str, Any]:
+        return {
+            'table': writer.table(self.table),
+            'starts': writer.array(self.starts),
+            'lengths': writer.array(self.lengths),
+            'codes': writer.array(self.codes),
+        }
+
+    @classmethod
+    def load(cls, spec: dict[str, Any], reader: 'BufferReader') -> 'StringListColumn':
+        column = object.__new__(cls)
+        column.table = reader.tables[spec['table']]
+        column.starts, column.lengths = reader.array(spec['starts']), reader.array(spec['lengths'])
+        column.codes = reader.array(spec['codes'])
+        return column
+
+    def _append(self, items: list[str]) -> None:
+        self.starts.append(len(self.codes))
+        self.lengths.append(len(items))
+        self.codes.extend(self.table.encode(item) for item in items)
+
+
+class ObjectColumn:
+    """Fallback for values without a compact representation (e.g. fields typed `Any`)."""
+
+    def __init__(self, values: list[Any]):
+        self.data = values
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.data[index]
+
+    @property
+    def nbytes(self) -> int:
+        return 8 * len(self.data)
+
+    def updated(self, changes: Mapping[int, Any], appended: list[Any]) -> 'ObjectColumn':
+        """Return a copy with some rows replaced and new rows appended."""
+        data = self.data.copy()
+        for index, value in changes.items():
+            data[index] = value
+        return ObjectColumn(data + appended)
+
+    def dump(self, writer: 'BufferWriter') -> dict[str, Any]:
+        # As JSON values, validated again against the field annotation when loaded
+        return {'values': to_jsonable_python(self.data)}
+
+    @classmethod
+    def load(cls, spec: dict[str, Any], reader: 'BufferReader') -> 'ObjectColumn':
+        return cls(spec['values'])
+
+
+Column = NumberColumn | StringColumn | StringListColumn | ObjectColumn
+
+COLUMN_TYPES: dict[str, type[Column]] = {
+    'number': NumberColumn,
+    'datetime': DatetimeColumn,
+    'string': StringColumn,
+    'string_list': StringListColumn,
+    'object': ObjectColumn,
+}
+
+
+def column_kind(annotation: Any) -> str:
+    """
+    Map a field annotation to the kind of column storing it.
+
+    Args:
+        annotation (Any): Field annotation (e.g. `int | None`, `list[HttpUrl]`).
+
+    Returns:
+        str: One of 'int', 'float', 'datetime', 'str', 'url', 'url_list' or 'object'.
+    """
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) != 1:
+            return 'object'
+        annotation = args[0]
+
+    if get_origin(annotation) is list:
+        (item,) = get_args(annotation) or (Any,)
+        return 'url_list' if column_kind(item) == 'url' else 'object'
+
+    if not isinstance(annotation, type):
+        return 'object'
+    if issubclass(annotation, AnyUrl):
+        return 'url'
+    if issubclass(annotation, bool):
+        return 'object'
+
+    for kind, base in (('int', int), ('float', float), ('datetime', datetime), ('str', str)):
+        if issubclass(annotation, base):
+            return kind
+
+    return 'object'
+
+
+class ColumnStore:
+    """
+    Column-oriented storage of the normalized rows of a Pydantic model.
+
+    Numbers and datetimes live in typed arrays, strings (colors, climates, terrains...)
+    are dictionary-encoded and URL lists are stored as integer ids into a URL table
+    shared by every column. Pydantic models are only built on demand, with `row`.
+
+    Values that are not already of the column type are validated against the field
+    annotation when the store is built (raising `pydantic.ValidationError` like the model
+    would). URLs are kept as strings and only validated when their row is materialized.
+    """
+
+    def __init__(self, model_class: type[BaseModel], length: int, columns: dict[str, Column]):
+        self.model_class = model_class
+        self.length = length
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return self.length
+
+    @classmethod
+    def from_records(
+        cls, model_class: type[BaseModel], records: Iterable[Mapping[str, Any] | BaseModel]
+    ) -> 'ColumnStore':
+        """
+        Build a store from normalized records (dicts) or already validated models.
+
+        Args:
+            model_class (type[BaseModel]): The Pydantic model (e.g., Person or Planet)
+            records (Iterable): Normalized SWAPI items or model instances.
+
+        Returns:
+            ColumnStore: The store.
+        """
+        records = _as_dicts(records)
+        urls = StringTable()
+        columns: dict[str, Column] = {}
+
+        for name, spec in field_specs(model_class).items():
+            values = [spec.coerce(record.get(name, spec.default)) for record in records]
+            columns[name] = _build_column(spec.kind, values, urls)
+
+        return cls(model_class, len(records), columns)
+
+    def with_changes(
+        self,
+        changes: Mapping[int, Mapping[str, Any] | BaseModel],
+        appended: Iterable[Mapping[str, Any] | BaseModel] = (),
+    ) -> 'ColumnStore':
+        """
+        Return a new store with some rows replaced and new rows appended, leaving this one
+        untouched. Unchanged values are copied as raw buffers, without decoding them.
+
+        Args:
+            changes (Mapping): New records, by row position.
+            appended (Iterable): Records added after the last row.
+
+        Returns:
+            ColumnStore: The new store.
+
+        Raises:
+            ValueError: If a value no longer fits its column (rebuild the store instead).
+            pydantic.ValidationError: If a value is invalid for its field.
+        """
+        changes = dict(zip(changes, _as_dicts(changes.values()), strict=True))
+        appended = _as_dicts(appended)
+        columns: dict[str, Column] = {}
+
+        for name, spec in field_specs(self.model_class).items():
+            columns[name] = self.columns[name].updated(
+                {
+                    index: spec.coerce(record.get(name, spec.default))
+                    for index, record in changes.items()
+                },
+                [spec.coerce(record.get(name, spec.default)) for record in appended],
+            )
+
+        return ColumnStore(self.model_class, self.length + len(appended), columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate size of the column buffers, excluding shared string tables."""
+        return sum(column.nbytes for column in self.columns.values())
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize the store: a JSON header describing the columns, followed by the raw,
+        8-byte aligned buffers of their arrays and string tables (untyped columns alone are
+        kept in the header, as JSON values).
+
+        Returns:
+            bytes: The serialized store, to be read back with `from_bytes`.
+        """
+        writer = BufferWriter()
+        columns = {}
+
+        for name, column in self.columns.items():
+            kind = next(kind for kind, cls in COLUMN_TYPES.items() if type(column) is cls)
+            columns[name] = {'type': kind, **column.dump(writer)}
+
+        header = json.dumps(
+            {
+                'fields': _signature(self.model_class),
+                'length': self.length,
+                'byteorder': sys.byteorder,
+                'tables': writer.tables,
+                'columns': columns,
+            },
+            separators=(',', ':'),
+        ).encode()
+
+        return b''.join(
+            [SNAPSHOT_MAGIC, _HEADER.pack(len(header)), header, _padding(len(header))]
+            + writer.chunks
+        )
+
+    @classmethod
+    def from_bytes(
+        cls, model_class: type[BaseModel], data: bytes | memoryview, copy: bool = True
+    ) -> 'ColumnStore':
+        """
+        Load a store serialized with `to_bytes`.
+
+        Args:
+            model_class (type[BaseModel]): The Pydantic model the store was built for.
+            data (bytes | memoryview): The serialized store.
+            copy (bool): Whether to copy the arrays, or to read them in place from `data`
+                (which must then outlive the store, and stay unchanged).
+
+        Returns:
+            ColumnStore: The store.
+
+        Raises:
+            ValueError: If the data is not a serialized store of this model (e.g. the model
+                changed since), or was written on a platform with another byte order.
+        """
+        view = memoryview(data)
+        start = len(SNAPSHOT_MAGIC) + _HEADER.size
+
+        if bytes(view[: len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+            raise ValueError('Not a serialized column store')
+
+        (size,) = _HEADER.unpack(view[len(SNAPSHOT_MAGIC) : start])
+        header = json.loads(bytes(view[start : start + size]))
+
+        if header['fields'] != _signature(model_class):
+            raise ValueError(f'Serialized store does not match {model_class.__name__}')
+        if header['byteorder'] != sys.byteorder:
+            raise ValueError(f'Serialized store is {header["byteorder"]}-endian')
+
+        reader = BufferReader(view[start + size + len(_padding(size)) :], header['tables'], copy)
+        specs = field_specs(model_class)
+        columns: dict[str, Column] = {}
+
+        for name, spec in header['columns'].items():
+            column = COLUMN_TYPES[spec['type']].load(spec, reader)
+            if isinstance(column, ObjectColumn):
+                column = ObjectColumn([specs[name].coerce(value) for value in column.data])
+            columns[name] = column
+
+        return cls(model_class, header['length'], columns)
+
+    def values(self, field: str) -> list[Any]:
+        """Return every value of a column, in row order."""
+        column = self.columns[field]
+        return [column[index] for index in range(self.length)]
+
+    def record(self, index: int) -> dict[str, Any]:
+        """Return the normalized values of one row."""
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def row(self, index: int) -> BaseModel:
+        """Build the Pydantic model of one row."""
+        return self.model_class.model_validate(self.record(index))
+
+
+NATIVE_TYPES = {
+    'int': lambda value: type(value) is int,
+    'float': lambda value: type(value) in (int, float),
+    'datetime': lambda value: isinstance(value, datetime),
+    'str': lambda value: isinstance(value, str),
+    'url': lambda value: isinstance(value, str),
+    'url_list': lambda value: isinstance(value, list) and all(type(item) is str for item in value),
+    'object': lambda value: True,
+}
+
+
+def _accepts_none(adapter: TypeAdapter) -> bool:
+    try:
+        adapter.validate_python(None)
+    except ValidationError:
+        return False
+    return True
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """How the values of one model field are stored."""
+
+    kind: str
+    adapter: TypeAdapter
+    nullable: bool
+    default: Any
+
+    def coerce(self, value: Any) -> Any:
+        """
+        Return values already normalized to the column type as is, and validate the others
+        against the field annotation (URLs are kept as strings).
+        """
+        if value is None:
+            if self.nullable:
+                return None
+        elif NATIVE_TYPES[self.kind](value):
+            return value
+
+        value = self.adapter.validate_python(value)
+
+        if isinstance(value, AnyUrl):
+            return str(value)
+        if isinstance(value, list):
+            return [str(item) if isinstance(item, AnyUrl) else item for item in value]
+        return value
+
+
+@cache
+def field_specs(model_class: type[BaseModel]) -> dict[str, FieldSpec]:
+    """Return the storage spec of every field of a model."""
+    specs = {}
+
+    for name, field_info in model_class.model_fields.items():
+        adapter = TypeAdapter(field_info.annotation)
+        specs[name] = FieldSpec(
+            kind=column_kind(field_info.annotation),
+            adapter=adapter,
+            nullable=_accepts_none(adapter),
+            default=(
+                None
+                if field_info.is_required()
+                else field_info.get_default(call_default_factory=True)
+            ),
+        )
+
+    return specs
+
+
+def _copy(values: array | memoryview) -> array:
+    """Copy an array, or a memoryview read in place (see `BufferReader`), as raw bytes."""
+    if isinstance(values, array):
+        return array(values.typecode, values)
+
+    copied = array(values.format)
+    copied.frombytes(values.cast('B'))
+    return copied
+
+
+def _signature(model_class: type[BaseModel]) -> list[list[str]]:
+    """Field names and column kinds of a model, to check serialized stores against."""
+    return [[name, spec.kind] for name, spec in field_specs(model_class).items()]
+
+
+def _padding(size: int) -> bytes:
+    return bytes(-size % _ALIGNMENT)
+
+
+class BufferWriter:
+    """
+    Collects the 8-byte aligned buffers of the arrays (and strings) being serialized.
+    Each buffer is referenced by its typecode, item size, offset and size.
+    """
+
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.size = 0
+        self.tables: list[dict[str, Any]] = []
+        self._table_ids: dict[int, int] = {}
+
+    def array(self, data: array | bytearray | memoryview) -> list[Any]:
+        """Append a buffer, returning its typecode, item size, offset and size."""
+        if isinstance(data, array):
+            raw, typecode, itemsize = data.tobytes(), data.typecode, data.itemsize
+        else:
+            view = memoryview(data)
+            raw, typecode, itemsize = view.tobytes(), view.format, view.itemsize
+        reference = [typecode, itemsize, self.size, len(raw)]
+
+        self.chunks += [raw, _padding(len(raw))]
+        self.size += len(raw) + len(_padding(len(raw)))
+        return reference
+
+    def table(self, table: StringTable) -> int:
+        """Register a string table (shared tables are written once), returning its index."""
+        if id(table) not in self._table_ids:
+            self._table_ids[id(table)] = len(self.tables)
+            self.tables.append(self.strings(table.values))
+        return self._table_ids[id(table)]
+
+    def strings(self, values: Sequence[str | None]) -> dict[str, Any]:
+        """Append strings (their UTF-8 bytes and offsets), returning their reference."""
+        offsets, data, nulls = array('Q', [0]), bytearray(), []
+
+        for position, value in enumerate(values):
+            if value is None:
+                nulls.append(position)
+            else:
+                data += value.encode()
+            offsets.append(len(data))
+
+        return {'offsets': self.array(offsets), 'data': self.array(data), 'nulls': nulls}
+
+
+class BufferReader:
+    """
+    Rebuilds the arrays and strings written by a BufferWriter. Arrays and strings are
+    copied, unless `copy` is False: they are then memoryviews of the data (e.g. of a
+    memory-mapped file) and `PackedStrings`, with the same read interface but no copy.
+    """
+
+    def __init__(self, data: memoryview, tables: Sequence[dict[str, Any]] = (), copy: bool = True):
+        self.data = data
+        self.copy = copy
+        self.tables = [StringTable.from_values(self.strings(table)) for table in tables]
+
+    def array(self, reference: list[Any]) -> array | memoryview:
+        typecode, itemsize, offset, size = reference
+        values = array(typecode)
+        if values.itemsize != itemsize:
+            raise ValueError(f"Serialized '{typecode}' array has another item size")
+
+        if not self.copy:
+            return self.data[offset : offset + size].cast(typecode)
+        values.frombytes(self.data[offset : offset + size])
+        return values
+
+    def bytes(self, reference: list[Any]) -> bytearray | memoryview:
+        _, _, offset, size = reference
+        if not self.copy:
+            return self.data[offset : offset + size]
+        return bytearray(self.data[offset : offset + size])
+
+    def strings(self, reference: dict[str, Any]) -> Sequence[str | None]:
+        offsets, data = self.array(reference['offsets']), self.bytes(reference['data'])
+        strings = PackedStrings(offsets, data, reference['nulls'])
+        return strings if not self.copy else list(strings)
+
+
+def _as_dicts(records: Iterable[Mapping[str, Any] | BaseModel]) -> list[Mapping[str, Any]]:
+    return [dict(record) if isinstance(record, BaseModel) else record for record in records]
+
+
+def _build_column(kind: str, values: list[Any], urls: StringTable) -> Column:
+    """Store values in the most compact column their kind and actual types allow."""
+    if kind == 'int':
+        return NumberColumn('q', values)
+    if kind == 'float':
+        return NumberColumn('d', [None if value is None else float(value) for value in values])
+    if kind == 'datetime' and all(
+        value is None or value.utcoffset() is not None for value in values
+    ):
+        return DatetimeColumn(values)
+    if kind == 'str':
+        return StringColumn(values, StringTable())
+    if kind == 'url':
+        return StringColumn(values, urls)
+    if kind == 'url_list':
+        return StringListColumn(values, urls)
+
+    # Naive datetimes and untyped fields
+    return ObjectColumn(values)
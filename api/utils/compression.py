@@ -0,0 +1,133 @@
+import gzip
+from collections.abc import Callable
+
+import brotli
+from decouple import config as env
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.utils.serialization import quality_values
+
+# Responses smaller than this (in bytes) are sent uncompressed (0 compresses them all)
+COMPRESSION_MIN_SIZE = env('COMPRESSION_MIN_SIZE', default=1024, cast=int)
+# Disable to leave compression to a reverse proxy
+COMPRESSION = env('COMPRESSION', default=True, cast=bool)
+
+# Content codings by order of preference, with their compressors (fast levels: responses
+# are compressed on every request)
+CODINGS: dict[str, Callable[[bytes], bytes]] = {
+    'br': lambda body: brotli.compress(body, quality=5),
+    'gzip': lambda body: gzip.compress(body, compresslevel=6, mtime=0),
+}
+COMPRESSIBLE_TYPES = ('application/json', 'application/msgpack')
+
+
+def choose_coding(accept_encoding: str) -> str | None:
+    """
+    Choose the content coding of a response from the `Accept-Encoding` of its request.
+
+    Args:
+        accept_encoding (str): The header (e.g. `gzip, deflate, br`).
+
+    Returns:
+        str | None: The preferred coding among `CODINGS`, None to send the body as is.
+    """
+    qualities = quality_values(accept_encoding)
+    default = qualities.get('*', 0)
+    ranked = [(qualities.get(coding, default), coding) for coding in CODINGS]
+    ranked = [(quality, coding) for quality, coding in ranked if quality > 0]
+
+    # Highest quality first, ties broken by `CODINGS` order (max keeps the first maximum)
+    return max(ranked, key=lambda item: item[0])[1] if ranked else None
+
+
+def coded_etag(etag: str, coding: str) -> str:
+    """Tag a compressed representation, like `"people-3-ab12"` gzipped: `"people-3-ab12-gzip"`."""
+    return f'{etag[:-1]}-{coding}"'
+
+
+def strip_coding(etag: str) -> str:
+    """Return the entity tag a `coded_etag` was derived from (others are left as is)."""
+    for coding in CODINGS:
+        suffix = f'-{coding}"'
+        if etag.endswith(suffix):
+            return etag.removesuffix(suffix) + '"'
+    return etag
+
+
+def not_modified(start: Message, coding: str, if_none_match: str) -> None:
+    """Give a 304 the entity tag the client has, if it is the compressed representation's."""
+    headers = MutableHeaders(raw=start['headers'])
+    if 'etag' in headers and coded_etag(headers['etag'], coding) in if_none_match:
+        headers['ETag'] = coded_etag(headers['etag'], coding)
+        headers.add_vary_header('Accept-Encoding')
+
+
+class CompressionMiddleware:
+    """
+    Compress JSON and MessagePack responses with Brotli or gzip, as negotiated through
+    `Accept-Encoding`, once they are larger than `minimum_size`. Streamed responses (e.g.
+    exports) are sent as they are.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        coding = choose_coding(request_headers.get('accept-encoding', ''))
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+
+            if message['type'] == 'http.response.start':
+                start = message  # Sent along with the body, once its encoding is known
+                return
+
+            if start is not None and message['type'] == 'http.response.body':
+                if start['status'] == 304:
+                    not_modified(start, coding, request_headers.get('if-none-match', ''))
+                else:
+                    message = self.compress(start, message, coding)
+                await send(start)
+                start = None
+
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def compress(self, start: Message, message: Message, coding: str) -> Message:
+        """Compress a whole body, updating the headers of its response start."""
+        headers = MutableHeaders(raw=start['headers'])
+        body = message.get('body', b'')
+        media_type = headers.get('content-type', '').partition(';')[0].strip()
+
+        if (
+            message.get('more_body', False)
+            or 'content-encoding' in headers
+            or media_type not in COMPRESSIBLE_TYPES
+        ):
+            return message
+
+        headers.add_vary_header('Accept-Encoding')
+        if len(body) < self.minimum_size:
+            return message
+
+        body = CODINGS[coding](body)
+        headers['Content-Encoding'] = coding
+        headers['Content-Length'] = str(len(body))
+        if 'etag' in headers:
+            # Strong validators identify the exact bytes, which compression changes
+            headers['ETag'] = coded_etag(headers['etag'], coding)
+
+        return {**message, 'body': body}
@@ -0,0 +1,78 @@
+import hashlib
+from collections.abc import Iterable
+from typing import Any
+
+from decouple import config as env
+from fastapi import Request
+
+from api.services.dataset import Dataset
+from api.services.dataset_cache import dataset_cache
+from api.utils.compression import strip_coding
+
+# Cache-Control directives of list responses (empty to send no Cache-Control header)
+HTTP_CACHE_CONTROL = env('HTTP_CACHE_CONTROL', default='public')
+# max-age of list responses; by default, the seconds left before the data is refreshed
+HTTP_MAX_AGE = env('HTTP_MAX_AGE', default='', cast=lambda value: int(value) if value else None)
+
+
+def list_etag(dataset: Dataset, query: dict[str, Any], linked: Iterable[str] = ()) -> str:
+    """
+    Build the strong ETag of a list response: the dataset version and a digest of the
+    normalized query, so it changes exactly when a refresh or the query may change the body.
+
+    Args:
+        dataset (Dataset): The current dataset of the listed resource.
+        query (dict): The parsed query parameters (defaults included, so that `?page=1`
+            and no page share their tag).
+        linked (Iterable[str]): Other resources whose items are embedded (`expand`).
+
+    Returns:
+        str: The quoted entity tag.
+    """
+    versions = [(name, getattr(dataset_cache.peek(name), 'version', None)) for name in linked]
+    key = repr((sorted(query.items()), versions)).encode()
+    digest = hashlib.blake2b(key, digest_size=8).hexdigest()
+    return f'"{dataset.resource}-{dataset.version}-{digest}"'
+
+
+def cache_headers(dataset: Dataset, etag: str) -> dict[str, str]:
+    """
+    Validator and freshness headers of a list response.
+
+    Args:
+        dataset (Dataset): The current dataset of the listed resource.
+        etag (str): The response's entity tag (see `list_etag`).
+
+    Returns:
+        dict[str, str]: `ETag`, `Vary` and, unless disabled, `Cache-Control`.
+    """
+    headers = {'ETag': etag, 'Vary': 'Accept'}  # Lists can be JSON or MessagePack
+
+    if HTTP_CACHE_CONTROL:
+        max_age = HTTP_MAX_AGE
+        if max_age is None:
+            max_age = max(0, int(dataset_cache.ttl - dataset.age))
+        headers['Cache-Control'] = f'{HTTP_CACHE_CONTROL}, max-age={max_age}'
+
+    return headers
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """
+    Check whether the client already has the response, from its `If-None-Match` header
+    (weak comparison, as RFC 9110 requires for GET, and compressed representations
+    matching their uncompressed one).
+
+    Args:
+        request (Request): The incoming request.
+        etag (str): The entity tag of the current response.
+
+    Returns:
+        bool: True if a 304 Not Modified can be returned instead of the body.
+    """
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+
+    tags = {strip_coding(tag.strip().removeprefix('W/')) for tag in header.split(',')}
+    return '*' in tags or etag in tags
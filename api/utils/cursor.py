@@ -0,0 +1,72 @@
+import base64
+import binascii
+import json
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """
+    Position of a paginated walk: the query, the dataset version it runs on, and the sort
+    key and position of the last row returned (rows follow in (key, position) order).
+    """
+
+    version: int
+    page: int  # Number of the page the cursor points to
+    search: str | None
+    sort_by: str | None
+    order: str | None
+    key: Any  # Sort value of the last row (None if unsorted, or the row has no value)
+    position: int  # Row position of the last row
+    filter: str | None = None
+
+    def encode(self) -> str:
+        """Encode the cursor as an opaque, URL-safe token."""
+        payload = {**asdict(self), 'key': _encode_key(self.key)}
+        data = json.dumps(payload, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).rstrip(b'=').decode()
+
+    @classmethod
+    def decode(cls, token: str) -> 'Cursor':
+        """
+        Decode a token made by `encode`.
+
+        Raises:
+            ValueError: If the token is not a valid cursor.
+        """
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            payload = json.loads(data)
+            cursor = cls(**{**payload, 'key': _decode_key(payload['key'])})
+        except (binascii.Error, UnicodeDecodeError, TypeError, KeyError, AttributeError) as e:
+            raise ValueError('Invalid cursor') from e
+
+        checks = {
+            'version': type(cursor.version) is int,
+            'page': type(cursor.page) is int and cursor.page > 1,
+            'search': cursor.search is None or isinstance(cursor.search, str),
+            'sort_by': cursor.sort_by is None or isinstance(cursor.sort_by, str),
+            'order': cursor.order in ('asc', 'desc', None),
+            'filter': cursor.filter is None or isinstance(cursor.filter, str),
+            'position': type(cursor.position) is int and cursor.position >= 0,
+        }
+        if not all(checks.values()):
+            raise ValueError('Invalid cursor')
+
+        return cursor
+
+
+def _encode_key(key: Any) -> Any:
+    if isinstance(key, datetime):
+        return {'datetime': key.isoformat()}
+    return key
+
+
+def _decode_key(key: Any) -> Any:
+    if isinstance(key, dict):
+        return datetime.fromisoformat(key['datetime'])
+    if key is None or isinstance(key, int | float | str):
+        return key
+    raise TypeError(f'Invalid cursor key: {key!r}')
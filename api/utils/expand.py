@@ -0,0 +1,177 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+from urllib.parse import urlsplit
+
+import httpx
+from decouple import config as env
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from api.resources import RESOURCES
+from api.services.dataset import RowKeys
+from api.services.swapi_proxy import fetch_swapi_item
+from api.utils.columnar import column_kind
+from api.utils.pagination import Page, get_dataset
+from shared.logger import get_logger
+
+logger = get_logger('api')
+
+# Links resolved from SWAPI at the same time, per request, when they are not cached
+EXPAND_CONCURRENCY = env('EXPAND_CONCURRENCY', default=8, cast=int)
+
+# Cached collections links are resolved against, by SWAPI resource name
+COLLECTIONS: dict[str, type[BaseModel]] = {
+    name: resource.model for name, resource in RESOURCES.items()
+}
+
+
+def link_fields(model_class: type[BaseModel]) -> list[str]:
+    """Fields of a model linking to other SWAPI items (e.g. `homeworld`, `films`)."""
+    return [
+        name
+        for name, field in model_class.model_fields.items()
+        if name != 'url' and column_kind(field.annotation) in ('url', 'url_list')
+    ]
+
+
+def parse_expand(model_class: type[BaseModel], expand: str) -> list[str]:
+    """
+    Parse the comma-separated link fields of an `expand` query parameter.
+
+    Raises:
+        HTTPException: If a name is not a link field of the model (400).
+    """
+    fields = list(dict.fromkeys(name.strip() for name in expand.split(',') if name.strip()))
+    allowed = link_fields(model_class)
+
+    invalid = [name for name in fields if name not in allowed]
+    if invalid:
+        names = ', '.join(map(repr, invalid))
+        raise HTTPException(
+            status_code=400, detail=f'Cannot expand {names} (expected: {", ".join(allowed)})'
+        )
+
+    return fields
+
+
+def link_target(url: str) -> tuple[str, str] | None:
+    """Resource name and id of a SWAPI link (e.g. `('planets', '1')`), if it is one."""
+    parts = urlsplit(url).path.rstrip('/').split('/')
+    if len(parts) < 3 or not parts[-1]:
+        return None
+    return parts[-2], parts[-1]
+
+
+async def resolve_links(urls: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """
+    Resolve SWAPI links to the items they point to, in one batch.
+
+    Links are deduplicated and grouped by resource. Links to a cached collection are looked
+    up in it (loading each collection at most once, concurrently); the others are fetched
+    from SWAPI one by one, at most `EXPAND_CONCURRENCY` at a time.
+
+    Args:
+        urls (Iterable[str]): Links to resolve.
+
+    Returns:
+        dict[str, dict]: Items (as JSON objects) by link. Links that cannot be resolved
+        (unknown, or failing upstream) are left out.
+    """
+    groups: dict[str, dict[str, str]] = defaultdict(dict)
+    for url in dict.fromkeys(urls):
+        if (target := link_target(url)) is not None:
+            groups[target[0]][url] = target[1]
+
+    cached = [resource for resource in groups if resource in COLLECTIONS]
+    fetched = [
+        (url, resource, id)
+        for resource, links in groups.items()
+        if resource not in COLLECTIONS
+        for url, id in links.items()
+    ]
+
+    semaphore = asyncio.Semaphore(EXPAND_CONCURRENCY)
+
+    async def fetch(url: str, resource: str, id: str) -> dict[str, dict[str, Any]]:
+        async with semaphore:
+            try:
+                return {url: await fetch_swapi_item(resource, id)}
+            except httpx.HTTPError as e:
+                logger.warning(f'Failed to expand {url}: {e!r}')
+                return {}
+
+    found = await asyncio.gather(
+        *(lookup(resource, groups[resource]) for resource in cached),
+        *(fetch(*link) for link in fetched),
+    )
+
+    return {url: item for items in found for url, item in items.items()}
+
+
+async def lookup(resource: str, urls: Iterable[str]) -> dict[str, dict[str, Any]]:
+    """Look links up in the cached collection of a resource (none if it fails to load)."""
+    try:
+        dataset = await get_dataset(COLLECTIONS[resource], resource)
+    except httpx.HTTPError as e:
+        logger.warning(f"Failed to expand links to '{resource}': {e!r}")
+        return {}
+
+    positions = dataset.derive('row_keys', RowKeys.build).positions
+
+    found = [url for url in urls if url in positions]
+    rows = dataset.rows(positions[url] for url in found)
+
+    return {url: row.model_dump(mode='json') for url, row in zip(found, rows, strict=True)}
+
+
+async def expand_page(page: Page, fields: list[str]) -> dict[str, Any]:
+    """
+    Build the paginated response dictionary of a page, embedding the items its link
+    fields point to instead of their URLs (unresolved links stay URLs).
+
+    Args:
+        page (Page): The selected page.
+        fields (list[str]): Link fields to expand (see `parse_expand`).
+
+    Returns:
+        dict: The response, with JSON values.
+    """
+    results = [row.model_dump(mode='json') for row in page.dataset.rows(page.positions)]
+
+    urls = []
+    for row in results:
+        for field in fields:
+            value = row[field]
+            urls.extend(value if isinstance(value, list) else [value])
+
+    resolved = await resolve_links(url for url in urls if url is not None)
+
+    for row in results:
+        for field in fields:
+            value = row[field]
+            if isinstance(value, list):
+                row[field] = [resolved.get(url, url) for url in value]
+            elif value is not None:
+                row[field] = resolved.get(value, value)
+
+    return {
+        'count': page.count,
+        'page': page.page,
+        'results_count': len(results),
+        'results': results,
+        'next_cursor': page.next_cursor,
+    }
+
+
+async def expand_response(page: Page, expand: str) -> JSONResponse:
+    """
+    Respond with a page whose `expand` link fields embed the items they point to.
+
+    Raises:
+        HTTPException: If `expand` names something else than link fields (400).
+    """
+    fields = parse_expand(page.dataset.model_class, expand)
+    return JSONResponse(await expand_page(page, fields))
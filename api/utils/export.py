@@ -0,0 +1,119 @@
+import csv
+import io
+from collections.abc import Iterable, Iterator, Sequence
+
+from decouple import config as env
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from api.services.dataset import Dataset
+from api.utils.pagination import find_rows, get_dataset
+from shared.logger import get_logger
+
+request_logger = get_logger('api.requests')
+
+# Rows encoded per chunk of an export response
+EXPORT_CHUNK_ROWS = env('EXPORT_CHUNK_ROWS', default=500, cast=int)
+
+MEDIA_TYPES = {'ndjson': 'application/x-ndjson', 'csv': 'text/csv'}
+
+
+def iter_positions(order: Sequence[int], matches: set[int] | None) -> Iterator[int]:
+    """Row positions of an order, restricted to the matching rows (if any)."""
+    if matches is None:
+        return iter(order)
+    return (position for position in order if position in matches)
+
+
+def iter_chunks(positions: Iterable[int], size: int) -> Iterator[list[int]]:
+    chunk: list[int] = []
+    for position in positions:
+        chunk.append(position)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ndjson_chunks(dataset: Dataset, positions: Iterable[int], size: int) -> Iterator[bytes]:
+    """Encode rows as JSON lines (like the list endpoints encode them), `size` rows at a time."""
+    for chunk in iter_chunks(positions, size):
+        yield b''.join(row.model_dump_json().encode() + b'\n' for row in dataset.rows(chunk))
+
+
+def csv_chunks(dataset: Dataset, positions: Iterable[int], size: int) -> Iterator[bytes]:
+    """
+    Encode rows as CSV, after a header row with the model fields, `size` rows at a time.
+    Lists (e.g. of film URLs) are joined with spaces, missing values are left empty.
+    """
+    fields = list(dataset.model_class.model_fields)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(fields)
+
+    for chunk in iter_chunks(positions, size):
+        for row in dataset.rows(chunk):
+            values = row.model_dump(mode='json')
+            writer.writerow(
+                ' '.join(value) if isinstance(value, list) else value
+                for value in (values[field] for field in fields)
+            )
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():  # Header of an empty export
+        yield buffer.getvalue().encode()
+
+
+ENCODERS = {'ndjson': ndjson_chunks, 'csv': csv_chunks}
+
+
+async def export_response(
+    model_class: type[BaseModel],
+    resource: str,
+    search: str | None,
+    sort_by: str | None,
+    order: str | None,
+    format: str = 'ndjson',
+    filter: str | None = None,
+) -> StreamingResponse:
+    """
+    Stream every row matching a search, in the requested order, as NDJSON or CSV.
+
+    Rows are found with the same semantics as `apply_filters_and_sorting` and encoded in
+    chunks of `EXPORT_CHUNK_ROWS` as the client reads them, so memory stays bounded by a
+    chunk whatever the size of the collection. The dataset version is fixed when the
+    export starts: a refresh during the download does not change its content.
+
+    Args:
+        model_class (type[BaseModel]): the Pydantic model (e.g., Person, Planet).
+        resource (str): the SWAPI resource endpoint name (e.g., people, planets).
+        search (str): optional name-based filter.
+        sort_by (str): optional attribute to sort by.
+        order (str): asc or desc (default asc).
+        format (str): ndjson or csv.
+        filter (str): optional filter expression (see `parse_filter`).
+
+    Returns:
+        StreamingResponse: The streamed export.
+    """
+    request_logger.info(
+        'GET /%s/export | search=%s sort_by=%s order=%s format=%s',
+        resource,
+        search,
+        sort_by,
+        order,
+        format,
+    )
+
+    dataset = await get_dataset(model_class, resource)
+    order_ids, matches = find_rows(dataset, search, sort_by, order, filter)
+    chunks = ENCODERS[format](dataset, iter_positions(order_ids, matches), EXPORT_CHUNK_ROWS)
+
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={'Content-Disposition': f'attachment; filename="{resource}.{format}"'},
+    )
@@ -34,21 +34,24 @@ def normalize_value(value: Any) -> Any:
     return value
 
 
-def normalize_swapi_data(item: dict) -> dict | None:
+def normalize_swapi_data(item: dict, model_class: type[BaseModel] | None = None) -> dict | None:
     """
     Normalize a SWAPI object by cleaning and casting values.
 
-    Skips entries without a 'name' field, as these are incomplete (e.g. /planets/28).
+    Skips entries without a value for the model's search field ('name', or e.g. 'title'
+    for films), as these are incomplete (e.g. /planets/28).
 
     Args:
         item (dict): Original SWAPI item.
+        model_class (type[BaseModel]): The Pydantic model of the item, if not a named one
+            (e.g., Film).
 
     Returns:
         dict | None: Cleaned item or None if invalid.
     """
     cleaned = {k: normalize_value(v) for k, v in item.items()}
 
-    if cleaned.get('name') is None:
+    if cleaned.get(search_field(model_class) if model_class else 'name') is None:
         return None
 
     return cleaned
@@ -69,6 +72,20 @@ def is_sortable_field(model_class: type[BaseModel], field: str) -> bool:
     return field_info is not None and get_origin(field_info.annotation) is not list
 
 
+def search_field(model_class: type[BaseModel]) -> str:
+    """
+    Return the field `search` matches: `name`, unless the model declares another one
+    (e.g. films have a `title`).
+
+    Args:
+        model_class (type[BaseModel]): The Pydantic model (e.g., Person or Film)
+
+    Returns:
+        str: Field name.
+    """
+    return getattr(model_class, 'search_field', 'name')
+
+
 def try_parse_date(value: str) -> datetime:
     """
     Try to parse an ISO datetime string, replacing 'Z' with UTC format.
@@ -82,20 +99,23 @@ def try_parse_date(value: str) -> datetime:
     return datetime.fromisoformat(value.replace('Z', '+00:00'))
 
 
-def sort_key(model: BaseModel, attr: str) -> tuple[int, Any]:
+def sort_key(model: BaseModel, attr: str, reverse: bool = False) -> tuple[int, Any]:
     """
     Generate a sort key for optional values.
-    None values are sorted last.
+    None values are sorted last, in both ascending and descending order.
 
     Args:
         model (BaseModel): The data item.
         attr (str): Attribute name.
+        reverse (bool): Whether the key is used for a descending sort.
 
     Returns:
         tuple: Sorting key.
     """
     value = getattr(model, attr, None)
-    return (1, '') if value is None else (0, value)
+    if value is None:
+        return (-1 if reverse else 1, '')
+    return (0, value)
 
 
 def apply_filters_and_sorting(
@@ -119,17 +139,17 @@ def apply_filters_and_sorting(
         list: Filtered and optionally sorted data.
     """
     if search:
-        data = [item for item in data if search.lower() in item.name.lower()]
+        field = search_field(model_class)
+        data = [item for item in data if search.lower() in getattr(item, field).lower()]
 
     if sort_by:
         if not is_sortable_field(model_class, sort_by):
             raise HTTPException(status_code=400, detail=f"Cannot sort by '{sort_by}'")
 
+        reverse = order == 'desc'
+
         try:
-            data.sort(
-                key=lambda x: sort_key(x, sort_by),
-                reverse=(order == 'desc'),
-            )
+            data = sorted(data, key=lambda x: sort_key(x, sort_by, reverse), reverse=reverse)
         except Exception as e:
             logger.warning(f"Failed to sort by '{sort_by}': {e}")
 
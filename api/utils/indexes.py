@@ -0,0 +1,565 @@
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from itertools import pairwise
+from typing import Any
+
+from api.services.dataset import Changes, Dataset
+from api.utils.filters import search_field
+from shared.logger import get_logger
+
+logger = get_logger('api')
+
+
+@dataclass(frozen=True)
+class SortIndex:
+    """
+    Precomputed row orders (as row positions) of a dataset for one field.
+
+    Matches `apply_filters_and_sorting`: stable ordering, None values last in both orders.
+    Within each order, rows with a value come first (`present` of them), ordered by value
+    then position, followed by rows without one, by position.
+    """
+
+    field: str
+    asc: Sequence[int]
+    desc: Sequence[int]
+    present: int | None = None  # None if the values could not be compared
+
+    # Past this share of changed rows, one sort is cheaper than moving rows one by one
+    MAX_PATCHED = 1 / 32
+
+    @classmethod
+    def build(cls, values: Sequence[Any], field: str) -> 'SortIndex':
+        """
+        Build the ascending and descending orders of a column.
+
+        Args:
+            values (Sequence[Any]): Column values, one per row.
+            field (str): Field name (for logging).
+
+        Returns:
+            SortIndex: The index. If the values are not comparable, both orders keep the
+            original row order.
+        """
+        present = [i for i, value in enumerate(values) if value is not None]
+        missing = [i for i, value in enumerate(values) if value is None]
+
+        try:
+            present.sort(key=values.__getitem__)
+        except Exception as e:
+            logger.warning(f"Failed to sort by '{field}': {e}")
+            identity = list(range(len(values)))
+            return cls(field, identity, identity)
+
+        asc, desc = present + missing, reverse_groups(present, values) + missing
+        return cls(field, asc, desc, len(present))
+
+    def order(self, order: str | None) -> Sequence[int]:
+        return self.desc if order == 'desc' else self.asc
+
+    def between(
+        self,
+        values: Sequence[Any],
+        low: Any = None,
+        high: Any = None,
+        include_low: bool = True,
+        include_high: bool = True,
+    ) -> Sequence[int]:
+        """
+        Find the rows whose value lies within bounds, in O(log n). Rows without a value
+        never match.
+
+        Args:
+            values (Sequence[Any]): Column values, one per row.
+            low (Any): Lower bound, or None for no lower bound.
+            high (Any): Upper bound, or None for no upper bound.
+            include_low (bool): Whether rows equal to `low` match.
+            include_high (bool): Whether rows equal to `high` match.
+
+        Returns:
+            Sequence[int]: Row positions of the matching rows, in ascending order.
+
+        Raises:
+            TypeError: If the bounds cannot be compared to the column values.
+        """
+        if self.present is None:
+            raise TypeError(f"'{self.field}' values are not comparable")
+
+        key = values.__getitem__
+        start, end = 0, self.present
+
+        if low is not None:
+            find = bisect_left if include_low else bisect_right
+            start = find(self.asc, low, 0, end, key=key)
+        if high is not None:
+            find = bisect_right if include_high else bisect_left
+            end = find(self.asc, high, start, end, key=key)
+
+        return self.asc[start : max(start, end)]
+
+    def after(self, values: Sequence[Any], order: str | None, value: Any, position: int) -> int:
+        """
+        Find where the rows following a given row start in an order. The row does not have
+        to exist (e.g. it comes from another version of the dataset).
+
+        Args:
+            values (Sequence[Any]): Column values, one per row.
+            order (str | None): asc or desc.
+            value (Any): Sort value of the row.
+            position (int): Position of the row.
+
+        Returns:
+            int: Index in the order of the first row after (value, position).
+
+        Raises:
+            TypeError: If the value cannot be compared to the column values.
+        """
+        rows = self.order(order)
+
+        if self.present is None:
+            return bisect_right(rows, position)  # Identity order
+        if value is None:
+            return bisect_right(rows, position, lo=self.present)
+        if order == 'desc':
+            probe = (_Descending(value), position)
+            return bisect_right(rows, probe, 0, self.present, key=_descending(values))
+        return bisect_right(rows, (value, position), 0, self.present, key=_ascending(values))
+
+    def apply_changes(self, dataset: Dataset, changes: Changes) -> 'SortIndex | None':
+        """
+        Move the changed rows of a refreshed dataset to their new place in both orders.
+
+        Args:
+            dataset (Dataset): The new version.
+            changes (Changes): Rows changed since the version this index was built for.
+
+        Returns:
+            SortIndex | None: The updated index, or None if it must be rebuilt.
+        """
+        changed = len(changes.updated) + len(changes.appended)
+        if self.present is None or changed > len(dataset) * self.MAX_PATCHED:
+            return None
+
+        old, new = changes.previous.store.columns[self.field], dataset.store.columns[self.field]
+        asc, desc, present = list(self.asc), list(self.desc), self.present
+
+        try:
+            # Rows with a value are ordered by (value, position), the others by position
+            for position in changes.updated:
+                if old[position] is None:
+                    _remove(asc, position, present, len(asc))
+                    _remove(desc, position, present, len(desc))
+                else:
+                    _remove(asc, position, 0, present, _ascending(old))
+                    _remove(desc, position, 0, present, _descending(old))
+                    present -= 1
+
+            for position in [*changes.updated, *changes.appended]:
+                if new[position] is None:
+                    insort(asc, position, present)
+                    insort(desc, position, present)
+                else:
+                    insort(asc, position, 0, present, key=_ascending(new))
+                    insort(desc, position, 0, present, key=_descending(new))
+                    present += 1
+
+        except (TypeError, ValueError) as e:
+            logger.info(f"Rebuilding '{self.field}' sort index: {e}")
+            return None
+
+        return SortIndex(self.field, asc, desc, present)
+
+
+class _Descending:
+    """Sort key wrapper reversing the order of a value."""
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+    def __lt__(self, other: '_Descending') -> bool:
+        return other.value < self.value
+
+
+def _ascending(values: Sequence[Any]) -> Callable[[int], tuple]:
+    return lambda position: (values[position], position)
+
+
+def _descending(values: Sequence[Any]) -> Callable[[int], tuple]:
+    return lambda position: (_Descending(values[position]), position)
+
+
+def _remove(
+    order: list[int],
+    position: int,
+    lo: int,
+    hi: int,
+    key: Callable[[int], Any] | None = None,
+) -> None:
+    """Remove a position from a sorted slice of an order, found by binary search."""
+    index = bisect_left(order, key(position) if key else position, lo, hi, key=key)
+    if index >= hi or order[index] != position:
+        raise ValueError(f'row {position} not found')
+    del order[index]
+
+
+def reverse_groups(asc: list[int], values: Sequence[Any]) -> list[int]:
+    """
+    Reverse an ascending order while keeping rows with equal values in their original
+    relative order, which is what a stable `sort(reverse=True)` produces.
+
+    Args:
+        asc (list[int]): Stable ascending order of row positions.
+        values (Sequence[Any]): Column values, one per row.
+
+    Returns:
+        list[int]: The descending order.
+    """
+    desc: list[int] = []
+    end = len(asc)
+
+    while end > 0:
+        start = end - 1
+        while start > 0 and not values[asc[start - 1]] < values[asc[end - 1]]:
+            start -= 1
+        desc.extend(asc[start:end])
+        end = start
+
+    return desc
+
+
+def get_sort_index(dataset: Dataset, field: str) -> SortIndex:
+    """
+    Return the sort index of a dataset field, building it once per dataset version.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        field (str): A sortable field of the dataset model.
+
+    Returns:
+        SortIndex: The memoized index.
+    """
+    return dataset.derive(
+        ('sort', field),
+        lambda ds: SortIndex.build(ds.column(field), field),
+    )
+
+
+@dataclass(frozen=True)
+class ValueIndex:
+    """
+    Rows of every distinct value of a column (strings folded to lower case), answering
+    equality and set membership filters with set unions instead of scans.
+    """
+
+    postings: Mapping[Any, Sequence[int]]
+
+    @classmethod
+    def build(cls, values: Sequence[Any]) -> 'ValueIndex':
+        postings: dict[Any, array] = defaultdict(lambda: array('I'))
+        for position, value in enumerate(values):
+            postings[value_key(value)].append(position)
+        return cls(dict(postings))
+
+    def matching(self, values: Iterable[Any]) -> set[int]:
+        """Row positions whose value is one of `values` (None matches rows without one)."""
+        rows: set[int] = set()
+        for value in values:
+            rows.update(self.postings.get(value_key(value), ()))
+        return rows
+
+
+def value_key(value: Any) -> Any:
+    return value.lower() if isinstance(value, str) else value
+
+
+def get_value_index(dataset: Dataset, field: str) -> ValueIndex:
+    """
+    Return the value index of a dataset field, building it once per dataset version.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        field (str): A scalar field of the dataset model.
+
+    Returns:
+        ValueIndex: The memoized index.
+    """
+    return dataset.derive(('values', field), lambda ds: ValueIndex.build(ds.column(field)))
+
+
+def fold(text: str, accents: bool = False) -> str:
+    """
+    Fold text for case-insensitive (and optionally accent-insensitive) matching.
+
+    Args:
+        text (str): Text to fold.
+        accents (bool): Whether to also strip accents (e.g. 'Padmé' -> 'padme').
+
+    Returns:
+        str: Folded text.
+    """
+    text = text.lower()
+
+    if accents:
+        decomposed = unicodedata.normalize('NFKD', text)
+        text = ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+    return text
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """
+    N-gram index of folded names, answering substring queries without scanning every row.
+
+    Every 1, 2 and 3 character gram of each name is mapped to the rows containing it.
+    Queries of up to 3 characters are answered directly from their posting list; longer
+    queries intersect the postings of their trigrams and verify the few candidates left.
+    Postings are sorted by row position.
+    """
+
+    names: Sequence[str]
+    grams: Mapping[str, Sequence[int]]
+    accents: bool = False
+
+    GRAM_SIZE = 3
+
+    @classmethod
+    def build(cls, names: Sequence[str], accents: bool = False) -> 'SearchIndex':
+        """
+        Build the index over a column of names.
+
+        Args:
+            names (Sequence[str]): Names, one per row.
+            accents (bool): Whether to fold accents as well as case.
+
+        Returns:
+            SearchIndex: The index.
+        """
+        folded = [fold(name, accents) for name in names]
+        grams: defaultdict[str, list[int]] = defaultdict(list)
+
+        for position, name in enumerate(folded):
+            for gram in cls.grams_of(name):
+                grams[gram].append(position)
+
+        return cls(folded, dict(grams), accents)
+
+    @classmethod
+    def grams_of(cls, name: str) -> set[str]:
+        """Every distinct 1 to GRAM_SIZE character gram of a folded name."""
+        return {
+            name[i : i + size]
+            for size in range(1, cls.GRAM_SIZE + 1)
+            for i in range(len(name) - size + 1)
+        }
+
+    def apply_changes(self, dataset: Dataset, changes: Changes) -> 'SearchIndex':
+        """
+        Re-index the changed rows of a refreshed dataset, copying only the postings they
+        touch (the others are shared with this index).
+
+        Args:
+            dataset (Dataset): The new version.
+            changes (Changes): Rows changed since the version this index was built for.
+
+        Returns:
+            SearchIndex: The updated index.
+        """
+        names, grams = list(self.names), dict(self.grams)
+        copied: set[str] = set()
+        column = dataset.store.columns[search_field(dataset.model_class)]
+
+        def posting(gram: str) -> list[int]:
+            if gram not in copied:
+                copied.add(gram)
+                grams[gram] = list(grams.get(gram, ()))
+            return grams[gram]
+
+        for position in changes.updated:
+            name = fold(column[position], self.accents)
+            before, after = self.grams_of(names[position]), self.grams_of(name)
+            names[position] = name
+
+            for gram in before - after:
+                positions = posting(gram)
+                positions.remove(position)
+                if not positions:
+                    del grams[gram]
+                    copied.discard(gram)
+            for gram in after - before:
+                insort(posting(gram), position)
+
+        for position in changes.appended:
+            name = fold(column[position], self.accents)
+            names.append(name)
+            for gram in self.grams_of(name):
+                posting(gram).append(position)  # Appended rows come after every other
+
+        return SearchIndex(names, grams, self.accents)
+
+    def search(self, query: str) -> set[int]:
+        """
+        Find the rows whose name contains the query.
+
+        Args:
+            query (str): Substring to look for (folded like the names).
+
+        Returns:
+            set[int]: Row positions of the matching rows.
+        """
+        needle = fold(query, self.accents)
+
+        if not needle:
+            return set(range(len(self.names)))
+
+        if len(needle) <= self.GRAM_SIZE:
+            return set(self.grams.get(needle, ()))
+
+        postings = sorted(
+            (
+                self.grams.get(needle[i : i + self.GRAM_SIZE], [])
+                for i in range(len(needle) - self.GRAM_SIZE + 1)
+            ),
+            key=len,
+        )
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates.intersection_update(posting)
+
+        return {position for position in candidates if needle in self.names[position]}
+
+
+def get_search_index(dataset: Dataset, accents: bool = False) -> SearchIndex:
+    """
+    Return the name search index of a dataset, building it once per dataset version.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        accents (bool): Whether the index folds accents as well as case.
+
+    Returns:
+        SearchIndex: The memoized index.
+    """
+    return dataset.derive(
+        ('search', accents),
+        lambda ds: SearchIndex.build(ds.column(search_field(ds.model_class)), accents),
+    )
+
+
+def sort_matches(
+    values: Sequence[Any], matches: Iterable[int], field: str, order: str | None
+) -> list[int]:
+    """
+    Sort matching rows by a column whose values are not comparable as a whole (no
+    `SortIndex` order), like `apply_filters_and_sorting`: the matching ones may be.
+
+    Args:
+        values (Sequence[Any]): Column values, one per row.
+        matches (Iterable[int]): Row positions of the matching rows.
+        field (str): Field name (for logging).
+        order (str | None): asc or desc.
+
+    Returns:
+        list[int]: The row positions, sorted (None values last), or in their original order
+        if these values are not comparable either.
+    """
+    rows, reverse = sorted(matches), order == 'desc'
+
+    try:
+        return sorted(rows, key=lambda i: _match_key(values[i], reverse), reverse=reverse)
+    except Exception as e:
+        logger.warning(f"Failed to sort by '{field}': {e}")
+        return rows
+
+
+def matches_after(
+    values: Sequence[Any], rows: Sequence[int], order: str | None, value: Any, position: int
+) -> int:
+    """
+    Find where the rows following a given row start in an order of `sort_matches`, in
+    O(log n). Like `SortIndex.after`, the row does not have to be in it.
+
+    Args:
+        values (Sequence[Any]): Column values, one per row.
+        rows (Sequence[int]): Row positions, as ordered by `sort_matches`.
+        order (str | None): asc or desc.
+        value (Any): Sort value of the row.
+        position (int): Position of the row.
+
+    Returns:
+        int: Index in the order of the first row after (value, position).
+
+    Raises:
+        TypeError: If the value cannot be compared to the values of the rows.
+    """
+    reverse = order == 'desc'
+
+    def key(row: int) -> tuple:
+        # Equal values keep ascending positions in both orders (stable sorts)
+        sort_key = _match_key(values[row], reverse)
+        return (_Descending(sort_key) if reverse else sort_key, row)
+
+    probe = _match_key(value, reverse)
+    try:
+        return bisect_right(rows, (_Descending(probe) if reverse else probe, position), key=key)
+    except TypeError:
+        if all(a < b for a, b in pairwise(rows)):  # The values were not comparable
+            return bisect_right(rows, position)
+        raise
+
+
+def _match_key(value: Any, reverse: bool) -> tuple:
+    """Sort key of `apply_filters_and_sorting` (see `sort_key`): None values last."""
+    return (-1 if reverse else 1, '') if value is None else (0, value)
+
+
+def select_page(
+    order: Sequence[int],
+    matches: Iterable[int] | None,
+    start: int,
+    end: int,
+    scan_from: int = 0,
+) -> list[int]:
+    """
+    Slice a page of row positions out of an order, optionally restricted to matching rows.
+
+    Args:
+        order (Sequence[int]): Row positions in the requested order.
+        matches (Iterable[int] | None): Row positions to keep, or None to keep all.
+        start (int): Index of the first row of the page.
+        end (int): Index after the last row of the page.
+        scan_from (int): Index in the order where rows start being counted (e.g. after a
+            cursor), instead of its beginning.
+
+    Returns:
+        list[int]: Row positions of the page.
+    """
+    if matches is None:
+        return list(order[scan_from + start : scan_from + end])
+
+    keep = matches if isinstance(matches, set | frozenset) else set(matches)
+    page: list[int] = []
+    seen = 0
+
+    for index in range(scan_from, len(order)):
+        position = order[index]
+        if position not in keep:
+            continue
+        if seen >= start:
+            page.append(position)
+            if len(page) == end - start:
+                break
+        seen += 1
+
+    return page
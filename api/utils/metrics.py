@@ -0,0 +1,186 @@
+import functools
+import inspect
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from decouple import config as env
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Disable to skip every measurement (`/metrics` then only reports the collected values)
+METRICS = env('METRICS', default=True, cast=bool)
+
+# Upper bounds (seconds) of the latency buckets, from 50µs to 10s
+LATENCY_BUCKETS = (
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    A Prometheus histogram with labels: per label values, the count of observations in
+    each bucket, their sum and their count. Observations are not locked (a lost update under
+    thread contention is an acceptable error for metrics).
+    """
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...], buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def count(self, *labels: str) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def clear(self) -> None:
+        self._series.clear()
+
+    def render(self) -> Iterable[str]:
+        yield f'# HELP {self.name} {self.help}'
+        yield f'# TYPE {self.name} histogram'
+
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            pairs = [
+                f'{name}="{escape(value)}"' for name, value in zip(self.labels, labels, strict=True)
+            ]
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, '+Inf'), counts, strict=True):
+                cumulative += bucket
+                le = ','.join([*pairs, f'le="{bound}"'])
+                yield f'{self.name}_bucket{{{le}}} {cumulative}'
+            selector = '{' + ','.join(pairs) + '}' if pairs else ''
+            yield f'{self.name}_sum{selector} {total}'
+            yield f'{self.name}_count{selector} {count}'
+
+
+STAGE_SECONDS = Histogram(
+    'api_stage_duration_seconds',
+    'Time spent in each stage of the request path.',
+    ('stage',),
+)
+REQUEST_SECONDS = Histogram(
+    'api_request_duration_seconds',
+    'Time to answer HTTP requests, by route and status.',
+    ('method', 'route', 'status'),
+)
+
+
+class timed:
+    """
+    Measure a stage of the request path into `STAGE_SECONDS`, as a context manager or as a
+    decorator of (sync or async) functions.
+
+        with timed('sort'):
+            ...
+
+        @timed('fetch')
+        async def fetch(...): ...
+    """
+
+    __slots__ = ('stage', 'started')
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self) -> 'timed':
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if METRICS:
+            STAGE_SECONDS.observe(time.perf_counter() - self.started, self.stage)
+
+    def __call__(self, function: Callable) -> Callable:
+        stage = self.stage
+
+        if inspect.iscoroutinefunction(function):
+
+            @functools.wraps(function)
+            async def timed_coroutine(*args, **kwargs):
+                with timed(stage):
+                    return await function(*args, **kwargs)
+
+            return timed_coroutine
+
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            with timed(stage):
+                return function(*args, **kwargs)
+
+        return timed_function
+
+
+def escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def family(
+    name: str, help: str, samples: Iterable[tuple[dict[str, Any], float]], type: str = 'gauge'
+) -> Iterable[str]:
+    """A metric with several labelled samples, collected at scrape time."""
+    yield f'# HELP {name} {help}'
+    yield f'# TYPE {name} {type}'
+    for labels, value in samples:
+        pairs = ','.join(f'{key}="{escape(str(label))}"' for key, label in labels.items())
+        yield f'{name}{{{pairs}}} {value}'
+
+
+def route_template(scope: Scope) -> str:
+    """The path template of the route that handled a request (e.g. `/people/stats`)."""
+    # Newer FastAPI versions keep included routes unprefixed, and resolve them per request
+    route = scope.get('fastapi', {}).get('effective_route_context') or scope.get('route')
+    return getattr(route, 'path', 'unmatched')
+
+
+class MetricsMiddleware:
+    """Measure every HTTP request into `REQUEST_SECONDS`, labelled by route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not METRICS:
+            await self.app(scope, receive, send)
+            return
+
+        started, status = time.perf_counter(), '500'
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = str(message['status'])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            route = route_template(scope)
+            REQUEST_SECONDS.observe(time.perf_counter() - started, scope['method'], route, status)
@@ -0,0 +1,168 @@
+import re
+from calendar import monthrange
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel
+
+from api.utils.columnar import column_kind
+from api.utils.filters import normalize_value, search_field, try_parse_date
+from api.utils.metrics import timed
+
+PLACEHOLDERS = frozenset({'unknown', 'n/a', 'none'})
+
+_INT = re.compile(r'[+-]?\d+')
+_FLOAT = re.compile(r'[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?')
+_DIGIT = re.compile(r'\d')
+_FLOAT_WORDS = frozenset({'inf', 'infinity', 'nan'})
+# SWAPI timestamps, with every field range checked except the length of the month
+_DATETIME = re.compile(
+    r'(?P<year>[0-9]{4})-(?P<month>0[1-9]|1[0-2])-(?P<day>0[1-9]|[12][0-9]|3[01])'
+    r'T(?:[01][0-9]|2[0-3]):[0-5][0-9]:[0-5][0-9](?:\.[0-9]{3}(?:[0-9]{3})?)?'
+    r'(?:Z|[+-](?:[01][0-9]|2[0-3]):[0-5][0-9])?'
+)
+
+_MISSING = object()
+
+
+def _is_ambiguous(text: str) -> bool:
+    """
+    Whether `int`, `float` or `try_parse_date` could accept text the fast paths did not
+    recognize (underscores, 'inf'/'nan', compact ISO dates...), so it needs the slow path.
+    """
+    return '_' in text or text.lstrip('+-').lower() in _FLOAT_WORDS or text[:4].isdecimal()
+
+
+def _is_valid_datetime(match: re.Match) -> bool:
+    year, day = match['year'], int(match['day'])
+    return year != '0000' and (day <= 28 or day <= monthrange(int(year), int(match['month']))[1])
+
+
+def to_text(value: Any) -> Any:
+    """Normalize a value of a string field: most of them contain no digit at all."""
+    if type(value) is not str:
+        return value
+    if value.strip().lower() in PLACEHOLDERS:
+        return None
+
+    stripped = value.replace(',', '').strip()
+
+    if _DIGIT.search(stripped) is None and not _is_ambiguous(stripped):
+        return stripped
+    return to_number(value)
+
+
+def to_number(value: Any) -> Any:
+    """Normalize a value of a numeric field: integers first, then floats."""
+    if type(value) is not str:
+        return value
+    if value.strip().lower() in PLACEHOLDERS:
+        return None
+
+    stripped = value.replace(',', '').strip()
+
+    if _INT.fullmatch(stripped):
+        return int(stripped)
+    if _FLOAT.fullmatch(stripped):
+        return float(stripped)
+    if not _is_ambiguous(stripped):
+        return stripped
+    return normalize_value(value)
+
+
+def to_datetime(value: Any) -> Any:
+    """Normalize a value of a datetime field, in SWAPI's ISO 8601 format."""
+    if type(value) is not str:
+        return value
+
+    stripped = value.replace(',', '').strip()
+    match = _DATETIME.fullmatch(stripped)
+
+    if match is not None and _is_valid_datetime(match):
+        return try_parse_date(stripped)
+    return normalize_value(value)
+
+
+def to_url(value: Any) -> Any:
+    """Normalize a value of a URL field: absolute URLs can only stay strings."""
+    if type(value) is str and value.startswith(('http://', 'https://')):
+        return value.replace(',', '').strip()
+    return to_text(value)
+
+
+CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    'int': to_number,
+    'float': to_number,
+    'datetime': to_datetime,
+    'str': to_text,
+    'url': to_url,
+}
+
+
+def convert_column(convert: Callable[[Any], Any], values: list[Any]) -> list[Any]:
+    """
+    Apply a converter to a column, converting each distinct string only once (colors,
+    climates, placeholders and timestamps repeat a lot). Non-string values are kept as is,
+    like `normalize_value` does.
+    """
+    converted: dict[str, Any] = {}
+    result = []
+
+    for value in values:
+        if type(value) is str:
+            if value not in converted:
+                converted[value] = convert(value)
+            value = converted[value]
+        result.append(value)
+
+    return result
+
+
+@timed('normalize')
+def normalize_swapi_batch(model_class: type[BaseModel], items: list[dict]) -> list[dict]:
+    """
+    Normalize a whole SWAPI payload one column at a time.
+
+    Gives the same output as `normalize_swapi_data` applied to every item with the model
+    (invalid items dropped), but picks a converter per field from its type in the model, so
+    common values are recognized with a single check instead of trying `int`, `float` and
+    date parsing in turn, and repeated strings are converted once. Values the fast paths
+    cannot classify fall back to `normalize_value`.
+
+    Args:
+        model_class (type[BaseModel]): The Pydantic model (e.g., Person or Planet)
+        items (list[dict]): Original SWAPI items.
+
+    Returns:
+        list[dict]: Cleaned items.
+    """
+    return [row for row in normalize_swapi_items(model_class, items) if row is not None]
+
+
+def normalize_swapi_items(model_class: type[BaseModel], items: list[dict]) -> list[dict | None]:
+    """
+    Like `normalize_swapi_batch`, but keeps one entry per item: None for invalid items.
+
+    Args:
+        model_class (type[BaseModel]): The Pydantic model (e.g., Person or Planet)
+        items (list[dict]): Original SWAPI items.
+
+    Returns:
+        list[dict | None]: Cleaned items, or None where `normalize_swapi_data` gives None.
+    """
+    fields = model_class.model_fields
+    columns: dict[str, list[Any]] = {}
+
+    for key in dict.fromkeys(key for item in items for key in item):
+        field_info = fields.get(key)
+        kind = column_kind(field_info.annotation) if field_info else 'object'
+        values = [item.get(key, _MISSING) for item in items]
+        columns[key] = convert_column(CONVERTERS.get(kind, to_text), values)
+
+    rows = [
+        {key: values[index] for key, values in columns.items() if values[index] is not _MISSING}
+        for index in range(len(items))
+    ]
+
+    name = search_field(model_class)
+    return [row if row.get(name) is not None else None for row in rows]
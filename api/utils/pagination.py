@@ -1,13 +1,378 @@
+import asyncio
+import contextlib
+from bisect import bisect_right
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import dataclass
 from typing import Any
 
+from decouple import config as env
+from fastapi import HTTPException
 from pydantic import BaseModel
 
-from api.models import Person, Planet
-from api.services.swapi_proxy import fetch_swapi_data
-from api.utils.filters import apply_filters_and_sorting
+from api.services.dataset import Dataset, refresh_dataset
+from api.services.dataset_cache import Loader, dataset_cache
+from api.services.shared_dataset import SharedDatasets
+from api.services.snapshot import load_snapshot, save_snapshot
+from api.services.swapi_proxy import fetch_swapi_data, fetch_swapi_items
+from api.utils.cursor import Cursor
+from api.utils.filters import is_sortable_field
+from api.utils.indexes import (
+    get_search_index,
+    get_sort_index,
+    matches_after,
+    select_page,
+    sort_matches,
+)
+from api.utils.metrics import timed
+from api.utils.predicates import filter_rows, parse_filter
 from shared.logger import get_logger
 
 logger = get_logger('api')
+request_logger = get_logger('api.requests')
+
+# Opt-in: make `search` ignore accents as well as case (e.g. 'padme' matches 'Padmé')
+SEARCH_FOLD_ACCENTS = env('SEARCH_FOLD_ACCENTS', default=False, cast=bool)
+# Refresh cached datasets from the rows whose `edited` timestamp changed, not from scratch
+INCREMENTAL_REFRESH = env('SWAPI_INCREMENTAL_REFRESH', default=True, cast=bool)
+# Directory of the dataset snapshots restored at startup (empty to disable them)
+SNAPSHOT_DIR = env('SWAPI_SNAPSHOT_DIR', default='')
+# Directory through which the workers of a machine share their datasets (empty to disable)
+SHARED_DIR = env('SWAPI_SHARED_DIR', default='')
+SHARED_POLL_INTERVAL = env('SWAPI_SHARED_POLL_INTERVAL', default=1.0, cast=float)
+
+
+@dataclass
+class Page:
+    """
+    A page of a cached dataset, as row positions: models are only built when needed.
+    """
+
+    dataset: Dataset
+    positions: list[int]
+    count: int  # Total after filtering
+    page: int
+    next_cursor: str | None = None  # None on the last page
+    search: str | None = None  # Query the rows match (from the cursor, if any)
+    filter: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Build the paginated response dictionary (with Pydantic models as results)."""
+        return {
+            'count': self.count,
+            'page': self.page,
+            'results_count': len(self.positions),  # Current page size
+            'results': self.dataset.rows(self.positions),
+            'next_cursor': self.next_cursor,
+        }
+
+
+async def load_dataset(
+    model_class: type[BaseModel], resource: str, previous: Dataset | None
+) -> Dataset:
+    """
+    Load the next version of a resource's dataset from SWAPI, and snapshot it to disk.
+
+    Rows are validated lazily: only the ones on a returned page become models.
+
+    Args:
+        model_class (type[BaseModel]): the Pydantic model (e.g., Person, Planet).
+        resource (str): the SWAPI resource endpoint name (e.g., people, planets).
+        previous (Dataset | None): the cached version, if any.
+
+    Returns:
+        Dataset: The new version, or `previous` if nothing changed upstream.
+    """
+    if previous is not None and INCREMENTAL_REFRESH:
+        dataset = refresh_dataset(previous, await fetch_swapi_items(resource))
+    else:
+        records = await fetch_swapi_data(model_class, resource, validate=False)
+        dataset = Dataset.from_records(resource, model_class, records)
+
+    if SNAPSHOT_DIR and dataset is not previous:
+        await asyncio.to_thread(save_snapshot, dataset, SNAPSHOT_DIR)
+
+    return dataset
+
+
+# Set when datasets are shared between workers: the leader loads them, the others map them
+shared_datasets = (
+    SharedDatasets(
+        SHARED_DIR, load_dataset, poll_interval=SHARED_POLL_INTERVAL, accents=SEARCH_FOLD_ACCENTS
+    )
+    if SHARED_DIR
+    else None
+)
+
+
+def get_loader() -> Loader:
+    """Return how the dataset cache loads datasets: from SWAPI, or from the shared ones."""
+    return shared_datasets.load if shared_datasets is not None else load_dataset
+
+
+@contextlib.asynccontextmanager
+async def dataset_lifespan(resources: Iterable[tuple[type[BaseModel], str]]) -> AsyncIterator[None]:
+    """
+    Restore dataset snapshots and, when datasets are shared between workers, keep them in
+    sync in the background. Cached datasets are dropped on exit.
+
+    Args:
+        resources (Iterable): Pairs of Pydantic model and SWAPI resource name.
+    """
+    resources = list(resources)
+    await restore_datasets(resources)
+
+    sync = None
+    if shared_datasets is not None:
+        sync = asyncio.create_task(shared_datasets.run(resources))
+
+    try:
+        yield
+    finally:
+        if sync is not None:
+            sync.cancel()
+            shared_datasets.close()
+        # Stop background refreshes before the shared client is closed
+        dataset_cache.clear()
+
+
+async def restore_datasets(resources: Iterable[tuple[type[BaseModel], str]]) -> None:
+    """
+    Seed the dataset cache from the snapshots on disk (when enabled), so a restarted
+    worker serves requests right away instead of waiting for SWAPI. Snapshots older than
+    the cache TTL are refreshed in the background.
+
+    Args:
+        resources (Iterable): Pairs of Pydantic model and SWAPI resource name.
+    """
+    if not SNAPSHOT_DIR:
+        return
+
+    for model_class, resource in resources:
+        dataset = await asyncio.to_thread(load_snapshot, model_class, resource, SNAPSHOT_DIR)
+        if dataset is not None:
+            dataset_cache.seed(dataset, get_loader())
+
+
+async def get_page(
+    model_class: type[BaseModel],
+    resource: str,
+    page: int,
+    page_size: int,
+    search: str | None,
+    sort_by: str | None,
+    order: str | None,
+    cursor: str | None = None,
+    filter: str | None = None,
+    current: Dataset | None = None,
+) -> Page:
+    """
+    Fetch data from SWAPI (through the dataset cache), apply search/sort filters,
+    and select the requested page.
+
+    Pages can also be walked with cursors: every page links to the next one with an opaque
+    `next_cursor`, which carries the query and resumes right after the last row returned,
+    on the same dataset version while it is kept (see `DatasetCache.keep_versions`).
+
+    Args:
+        model_class (type[BaseModel]): the Pydantic model (e.g., Person, Planet).
+        resource (str): the SWAPI resource endpoint name (e.g., people, planets).
+        page (int): page number (1-based), ignored with a cursor.
+        page_size (int): number of results per page.
+        search (str): optional name-based filter, ignored with a cursor.
+        sort_by (str): optional attribute to sort by, ignored with a cursor.
+        order (str): asc or desc (default asc), ignored with a cursor.
+        cursor (str): optional `next_cursor` of a previous page.
+        filter (str): optional filter expression (see `parse_filter`), ignored with a
+            cursor.
+        current (Dataset): the current dataset, if the caller already looked it up.
+
+    Returns:
+        Page: The selected page.
+    """
+    request_logger.info(
+        'GET /%s | page=%s page_size=%s search=%s sort_by=%s order=%s filter=%s cursor=%s',
+        resource,
+        page,
+        page_size,
+        search,
+        sort_by,
+        order,
+        filter,
+        cursor,
+    )
+
+    after = None
+    if cursor is not None:
+        try:
+            after = Cursor.decode(cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+        page, search, sort_by, order = after.page, after.search, after.sort_by, after.order
+        filter = after.filter
+
+    # Walks stay on their version; if it expired, they resume on the current one by key
+    dataset = None
+    if after is not None:
+        dataset = dataset_cache.get_version(resource, after.version)
+    if dataset is None:
+        dataset = current if current is not None else await get_dataset(model_class, resource)
+
+    order_ids, matches = find_rows(dataset, search, sort_by, order, filter)
+
+    # Manual pagination (or right after the cursor), with one more row to know if it is last
+    with timed('paginate'):
+        start, scan_from = (page - 1) * page_size, 0
+        if after is not None:
+            start, scan_from = 0, resume_index(dataset, order_ids, sort_by, order, after)
+
+        positions = select_page(order_ids, matches, start, start + page_size + 1, scan_from)
+
+    next_cursor = None
+    if len(positions) > page_size:
+        positions = positions[:page_size]
+        last = positions[-1]
+        next_cursor = Cursor(
+            version=dataset.version,
+            page=page + 1,
+            search=search,
+            sort_by=sort_by,
+            order=order,
+            key=dataset.store.columns[sort_by][last] if sort_by else None,
+            position=last,
+            filter=filter,
+        ).encode()
+
+    return Page(
+        dataset=dataset,
+        positions=positions,
+        count=len(order_ids) if matches is None else len(matches),
+        page=page,
+        next_cursor=next_cursor,
+        search=search,
+        filter=filter,
+    )
+
+
+async def get_dataset(model_class: type[BaseModel], resource: str) -> Dataset:
+    """
+    Return the current dataset of a resource, through the dataset cache.
+
+    Args:
+        model_class (type[BaseModel]): the Pydantic model (e.g., Person, Planet).
+        resource (str): the SWAPI resource endpoint name (e.g., people, planets).
+
+    Returns:
+        Dataset: The cached (possibly stale) dataset.
+    """
+    return await dataset_cache.get(model_class, resource, get_loader())
+
+
+def find_rows(
+    dataset: Dataset,
+    search: str | None,
+    sort_by: str | None,
+    order: str | None,
+    filter: str | None = None,
+) -> tuple[Sequence[int], set[int] | None]:
+    """
+    Apply search/sort filters with the same semantics as `apply_filters_and_sorting`,
+    and an optional filter expression, served from per-version indexes.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        search (str): optional name-based filter.
+        sort_by (str): optional attribute to sort by.
+        order (str): asc or desc (default asc).
+        filter (str): optional filter expression (see `parse_filter`).
+
+    Returns:
+        tuple: Row positions in the requested order, and the positions of the rows
+        matching the search and filter (None if every row of the order matches).
+
+    Raises:
+        HTTPException: If the rows cannot be sorted by `sort_by`, or the filter is invalid
+        (400).
+    """
+    index = None
+    if sort_by:
+        if not is_sortable_field(dataset.model_class, sort_by):
+            raise HTTPException(status_code=400, detail=f"Cannot sort by '{sort_by}'")
+        with timed('sort'):
+            index = get_sort_index(dataset, sort_by)
+            order_ids = index.order(order)
+    else:
+        order_ids = range(len(dataset))
+
+    with timed('filter'):
+        matches = match_rows(dataset, search, filter)
+
+    if matches is not None and index is None:
+        # Unsorted results keep the upstream order: no need to scan every row
+        order_ids, matches = sorted(matches), None
+    elif matches is not None and index.present is None:
+        # The column is not comparable as a whole, but the matching rows may be
+        with timed('sort'):
+            values = dataset.store.columns[sort_by]
+            order_ids, matches = sort_matches(values, matches, sort_by, order), None
+
+    return order_ids, matches
+
+
+def match_rows(dataset: Dataset, search: str | None, filter: str | None) -> set[int] | None:
+    """
+    Find the rows matching a search and a filter expression, from per-version indexes.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        search (str): optional name-based filter.
+        filter (str): optional filter expression (see `parse_filter`).
+
+    Returns:
+        set[int] | None: Positions of the matching rows, or None if there is neither.
+
+    Raises:
+        HTTPException: If the filter is invalid (400).
+    """
+    matches = None
+    if search:
+        matches = get_search_index(dataset, SEARCH_FOLD_ACCENTS).search(search)
+    if filter:
+        filtered = filter_rows(dataset, parse_filter(dataset.model_class, filter))
+        matches = filtered if matches is None else filtered.intersection(matches)
+    return matches
+
+
+def resume_index(
+    dataset: Dataset,
+    order_ids: Sequence[int],
+    sort_by: str | None,
+    order: str | None,
+    cursor: Cursor,
+) -> int:
+    """
+    Find where a cursor resumes in an order, in O(log n).
+
+    Args:
+        dataset (Dataset): The dataset being paginated.
+        order_ids (Sequence[int]): Row positions in the requested order.
+        sort_by (str): attribute the rows are sorted by, if any.
+        order (str): asc or desc.
+        cursor (Cursor): The decoded cursor.
+
+    Returns:
+        int: Index in the order of the first row after the cursor.
+    """
+    if not sort_by:
+        return bisect_right(order_ids, cursor.position)  # Upstream order: by position
+
+    index, values = get_sort_index(dataset, sort_by), dataset.store.columns[sort_by]
+    try:
+        if index.present is None and (cursor.search or cursor.filter):
+            # Matching rows sorted on their own, not an index order (see `find_rows`)
+            return matches_after(values, order_ids, order, cursor.key, cursor.position)
+        return index.after(values, order, cursor.key, cursor.position)
+    except TypeError as e:
+        raise HTTPException(status_code=400, detail='Invalid cursor') from e
 
 
 async def get_filtered_paginated_data(
@@ -20,7 +385,8 @@ async def get_filtered_paginated_data(
     order: str | None,
 ) -> dict[str, Any]:
     """
-    Fetch data from SWAPI, apply search/sort filters, and return paginated results.
+    Fetch data from SWAPI (through the dataset cache), apply search/sort filters,
+    and return paginated results.
 
     Args:
         model_class (type[BaseModel]): the Pydantic model (e.g., Person, Planet).
@@ -34,25 +400,5 @@ async def get_filtered_paginated_data(
     Returns:
         dict[str, Any]: A paginated response dictionary
     """
-    logger.info(
-        f'GET /{resource} | page={page} page_size={page_size} '
-        f'search={search} sort_by={sort_by} order={order}'
-    )
-
-    data: list[Person | Planet] = await fetch_swapi_data(model_class, resource)
-
-    filtered_data: list[Person | Planet] = apply_filters_and_sorting(
-        model_class, data, search=search, sort_by=sort_by, order=order
-    )
-
-    # Manual pagination
-    start = (page - 1) * page_size
-    end = start + page_size
-    paged_data = filtered_data[start:end]
-
-    return {
-        'count': len(filtered_data),  # Total after filtering
-        'page': page,
-        'results_count': len(paged_data),  # Current page size
-        'results': paged_data,
-    }
+    result = await get_page(model_class, resource, page, page_size, search, sort_by, order)
+    return result.to_dict()
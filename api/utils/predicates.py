@@ -0,0 +1,157 @@
+import re
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel, ValidationError
+
+from api.services.dataset import Dataset
+from api.utils.columnar import field_specs
+from api.utils.filters import is_sortable_field
+from api.utils.indexes import get_sort_index, get_value_index
+from api.utils.normalization import CONVERTERS, to_text
+
+_CLAUSE = re.compile(r'\s*(?P<field>\w+)\s*(?P<op>>=|<=|!=|=|>|<)\s*(?P<value>.*?)\s*')
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """A clause of a filter expression, on one scalar field."""
+
+    field: str
+    op: str  # One of '=', '!=', '>', '>=', '<', '<=', or '..' (inclusive range)
+    values: tuple[Any, ...]  # Several for sets (`a|b`), two for ranges (`low..high`)
+
+
+def parse_filter(model_class: type[BaseModel], expression: str) -> list[Predicate]:
+    """
+    Parse a filter expression: comma-separated clauses, all of which rows must match.
+
+    Clauses compare a scalar field to a value, like `population>1000000`, `climate=arid`,
+    `hair_color!=none` (rows with a value) or `gender=male|female` (set membership), or
+    bound it to an inclusive range, like `height=150..190`. Values are normalized like
+    SWAPI values are, and times without a time zone are taken as UTC (on timestamp fields,
+    like `created`; dates, like `release_date`, have none). Strings are equal
+    (`=`, `!=`, sets) case-insensitively, but ordered (`>`, `<`, ranges) as they are, like
+    `sort_by` orders them.
+
+    Args:
+        model_class (type[BaseModel]): The Pydantic model (e.g., Person or Planet)
+        expression (str): The filter expression.
+
+    Returns:
+        list[Predicate]: The clauses.
+
+    Raises:
+        HTTPException: If a clause is malformed, is not on a scalar field of the model or
+        has a value invalid for it (400).
+    """
+    predicates = []
+
+    for clause in filter(str.strip, expression.split(',')):
+        match = _CLAUSE.fullmatch(clause)
+        if match is None:
+            raise HTTPException(status_code=400, detail=f"Invalid filter '{clause.strip()}'")
+
+        field, op, text = match['field'], match['op'], match['value']
+        if not is_sortable_field(model_class, field):
+            raise HTTPException(status_code=400, detail=f"Cannot filter by '{field}'")
+
+        if op == '=' and '..' in text:
+            op, literals = '..', text.split('..', 1)
+        elif op in ('=', '!='):
+            literals = text.split('|')
+        else:
+            literals = [text]
+
+        values = tuple(parse_value(model_class, field, literal) for literal in literals)
+        if op not in ('=', '!=') and None in values:
+            raise HTTPException(status_code=400, detail=f"Invalid bound in '{clause.strip()}'")
+
+        predicates.append(Predicate(field, op, values))
+
+    return predicates
+
+
+def parse_value(model_class: type[BaseModel], field: str, literal: str) -> Any:
+    """
+    Convert a literal of a filter to the type of its field's column. On datetime columns,
+    whose values are aware (like SWAPI's timestamps), naive literals are taken as UTC;
+    other columns (e.g. dates) keep them naive, like their values.
+
+    Raises:
+        HTTPException: If the literal is not a valid value of the field (400).
+    """
+    spec = field_specs(model_class)[field]
+    value = CONVERTERS.get(spec.kind, to_text)(literal.strip())
+
+    try:
+        value = spec.coerce(value)
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid value '{literal.strip()}' for '{field}'"
+        ) from e
+
+    if spec.kind == 'datetime' and isinstance(value, datetime) and value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value
+
+
+def filter_rows(dataset: Dataset, predicates: list[Predicate]) -> set[int]:
+    """
+    Find the rows matching every predicate, from per-version column indexes: the sorted
+    orders of the sort indexes for comparisons and ranges (found by binary search), and
+    per-value row sets for equality and set membership.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        predicates (list[Predicate]): Clauses of a filter (see `parse_filter`).
+
+    Returns:
+        set[int]: Positions of the matching rows.
+
+    Raises:
+        HTTPException: If a field cannot be compared to its bound (400).
+    """
+    matches: set[int] | None = None
+
+    for predicate in predicates:
+        rows = predicate_rows(dataset, predicate)
+        matches = rows if matches is None else matches & rows
+        if not matches:
+            break
+
+    return set(range(len(dataset))) if matches is None else matches
+
+
+def predicate_rows(dataset: Dataset, predicate: Predicate) -> set[int]:
+    """Positions of the rows matching one predicate."""
+    if predicate.op in ('=', '!='):
+        index = get_value_index(dataset, predicate.field)
+        rows = index.matching(predicate.values)
+        if predicate.op == '=':
+            return rows
+        # Like comparisons, `!=` never matches rows without a value
+        return set(range(len(dataset))) - rows - index.matching([None])
+
+    if predicate.op == '..':
+        bounds = (*predicate.values, True, True)
+    else:
+        value = predicate.values[0]
+        bounds = {
+            '>': (value, None, False, True),
+            '>=': (value, None, True, True),
+            '<': (None, value, True, False),
+            '<=': (None, value, True, True),
+        }[predicate.op]
+
+    values = dataset.store.columns[predicate.field]
+    try:
+        rows = get_sort_index(dataset, predicate.field).between(values, *bounds)
+    except TypeError as e:
+        raise HTTPException(
+            status_code=400, detail=f"Cannot compare '{predicate.field}' values to this bound"
+        ) from e
+
+    return set(rows)
@@ -0,0 +1,159 @@
+import json
+from typing import Any
+
+import msgpack
+from decouple import config as env
+from fastapi import Response
+
+from api.services.dataset import Changes, Dataset
+from api.utils.pagination import Page
+
+# Opt-in: serve list pages from pre-encoded JSON rows instead of re-validating the models
+FAST_SERIALIZATION = env('FAST_SERIALIZATION', default=False, cast=bool)
+
+MSGPACK = 'application/msgpack'
+
+
+class JsonFragments:
+    """
+    JSON encoding of each row of a dataset, computed once per row and dataset version.
+    """
+
+    def __init__(self, dataset: Dataset):
+        self.dataset = dataset
+        self._fragments: list[bytes | None] = [None] * len(dataset)
+
+    def __getitem__(self, position: int) -> bytes:
+        fragment = self._fragments[position]
+        if fragment is None:
+            row = self.dataset.store.row(position)
+            fragment = self._fragments[position] = row.model_dump_json().encode()
+        return fragment
+
+    def apply_changes(self, dataset: Dataset, changes: Changes) -> 'JsonFragments':
+        """Keep the fragments of the rows a refresh did not change."""
+        fragments = JsonFragments.__new__(JsonFragments)
+        fragments.dataset = dataset
+        fragments._fragments = self._fragments.copy()
+
+        for position in changes.updated:
+            fragments._fragments[position] = None
+        fragments._fragments.extend([None] * len(changes.appended))
+
+        return fragments
+
+
+def get_json_fragments(dataset: Dataset) -> JsonFragments:
+    """
+    Return the JSON fragments of a dataset, memoized per dataset version.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+
+    Returns:
+        JsonFragments: The memoized fragments.
+    """
+    return dataset.derive('json', JsonFragments)
+
+
+def render_page(page: Page) -> bytes:
+    """
+    Encode a page exactly like its `response_model`, by concatenating cached row fragments.
+
+    Args:
+        page (Page): The selected page.
+
+    Returns:
+        bytes: The JSON body.
+    """
+    fragments = get_json_fragments(page.dataset)
+    header = json.dumps(
+        {'count': page.count, 'page': page.page, 'results_count': len(page.positions)},
+        separators=(',', ':'),
+    )
+
+    return b''.join(
+        (
+            header[:-1].encode(),
+            b',"results":[',
+            b','.join(fragments[position] for position in page.positions),
+            b'],"next_cursor":',
+            json.dumps(page.next_cursor).encode(),
+            b'}',
+        )
+    )
+
+
+def page_response(page: Page) -> Response:
+    """
+    Build a raw JSON response for a page, skipping FastAPI's response model validation.
+
+    Args:
+        page (Page): The selected page.
+
+    Returns:
+        Response: The response.
+    """
+    return Response(content=render_page(page), media_type='application/json')
+
+
+def quality_values(header: str) -> dict[str, float]:
+    """
+    Parse a content negotiation header (e.g. `Accept`, `Accept-Encoding`).
+
+    Args:
+        header (str): The header, like `application/msgpack, application/json;q=0.5`.
+
+    Returns:
+        dict[str, float]: Quality (0 to 1) of each listed value, in lower case.
+    """
+    qualities = {}
+
+    for item in header.split(','):
+        value, *params = (part.strip() for part in item.split(';'))
+        quality = 1.0
+        for param in params:
+            name, _, number = param.partition('=')
+            if name.strip() == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if value:
+            qualities[value.lower()] = quality
+
+    return qualities
+
+
+def wants_msgpack(accept: str | None) -> bool:
+    """
+    Check whether a client prefers MessagePack to JSON, from its `Accept` header.
+
+    Args:
+        accept (str | None): The `Accept` header, if any.
+
+    Returns:
+        bool: True if MessagePack is acceptable and at least as wanted as JSON.
+    """
+    if not accept:
+        return False
+
+    qualities = quality_values(accept)
+    binary = max(qualities.get(MSGPACK, 0), qualities.get('application/x-msgpack', 0))
+    text = max(
+        qualities.get(media_type, 0) for media_type in ('application/json', 'application/*', '*/*')
+    )
+    return binary > 0 and binary >= text
+
+
+def msgpack_response(content: dict[str, Any]) -> Response:
+    """
+    Build a MessagePack response, the binary encoding of a JSON response (same members).
+
+    Args:
+        content (dict): The response, with JSON values.
+
+    Returns:
+        Response: The response.
+    """
+    return Response(content=msgpack.packb(content), media_type=MSGPACK)
@@ -0,0 +1,314 @@
+import math
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, TypeVar
+
+from decouple import config as env
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from api.services.dataset import Dataset
+from api.utils.columnar import field_specs
+from api.utils.expand import expand_page, parse_expand
+from api.utils.filters import is_sortable_field
+from api.utils.indexes import get_value_index
+from api.utils.pagination import Page, get_dataset, match_rows
+from shared.logger import get_logger
+
+request_logger = get_logger('api.requests')
+
+# Aggregates (stats and facets) memoized per dataset version, least recently used dropped
+STATS_CACHE_SIZE = env('STATS_CACHE_SIZE', default=256, cast=int)
+
+T = TypeVar('T')
+
+
+class QueryCache:
+    """Results of the aggregate queries run on one dataset version, by query shape."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._results: OrderedDict[Any, Any] = OrderedDict()
+
+    def get(self, key: Any, compute: Callable[[], T]) -> T:
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        result = self._results[key] = compute()
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+        return result
+
+
+def memoize(dataset: Dataset, key: Any, compute: Callable[[], T]) -> T:
+    """
+    Return the result of a query on a dataset version, computing it on first use. Results
+    go away with their version (a refresh does not carry them over).
+    """
+    cache = dataset.derive('queries', lambda _: QueryCache(STATS_CACHE_SIZE))
+    return cache.get(key, compute)
+
+
+def summarize(values: Sequence[float]) -> dict[str, Any]:
+    """Count, min, max and mean of numbers."""
+    if not values:
+        return {'count': 0, 'min': None, 'max': None, 'mean': None}
+    return {
+        'count': len(values),
+        'min': min(values),
+        'max': max(values),
+        'mean': math.fsum(values) / len(values),
+    }
+
+
+def histogram(values: Sequence[float], buckets: int) -> list[dict[str, Any]]:
+    """
+    Count numbers in `buckets` equal-width buckets spanning their range.
+
+    Args:
+        values (Sequence[float]): Numbers.
+        buckets (int): Number of buckets.
+
+    Returns:
+        list[dict]: Buckets (`low`, `high`, `count`); only the last one includes `high`.
+    """
+    if not values:
+        return []
+
+    low, high = min(values), max(values)
+    width = (high - low) / buckets or 1
+    counts = [0] * buckets
+
+    for value in values:
+        counts[min(int((value - low) / width), buckets - 1)] += 1
+
+    return [
+        {'low': low + i * width, 'high': low + (i + 1) * width, 'count': count}
+        for i, count in enumerate(counts)
+    ]
+
+
+def numbers(dataset: Dataset, field: str, rows: Iterable[int]) -> list[float]:
+    """Values of a numeric field in some rows, without the missing ones."""
+    column = dataset.store.columns[field]
+    return [value for value in map(column.__getitem__, rows) if value is not None]
+
+
+def groups(dataset: Dataset, field: str, rows: set[int] | None) -> list[tuple[Any, list[int]]]:
+    """
+    Split rows by the value of a field (strings folded), largest groups first.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        field (str): A scalar field.
+        rows (set[int] | None): Rows to split, or None for all of them.
+
+    Returns:
+        list[tuple]: Pairs of value and row positions (ascending).
+    """
+    postings = get_value_index(dataset, field).postings
+    split = [
+        (value, list(posting) if rows is None else sorted(rows.intersection(posting)))
+        for value, posting in postings.items()
+    ]
+    split = [(value, positions) for value, positions in split if positions]
+    split.sort(key=lambda group: -len(group[1]))
+    return split
+
+
+def compute_stats(
+    dataset: Dataset,
+    rows: set[int] | None,
+    field: str | None,
+    group_by: str | None,
+    buckets: int | None,
+) -> dict[str, Any]:
+    """
+    Aggregate the rows matching a query.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        rows (set[int] | None): Matching rows, or None for all of them.
+        field (str): optional numeric field to summarize.
+        group_by (str): optional scalar field to group the rows by.
+        buckets (int): optional number of histogram buckets of `field`.
+
+    Returns:
+        dict: The `Stats` response.
+    """
+    matching = range(len(dataset)) if rows is None else sorted(rows)
+    stats: dict[str, Any] = {'count': len(matching), 'field': field}
+
+    if field:
+        values = numbers(dataset, field, matching)
+        stats['summary'] = summarize(values)
+        if buckets:
+            stats['histogram'] = histogram(values, buckets)
+
+    if group_by:
+        stats['groups'] = [
+            {
+                'value': value,
+                'count': len(positions),
+                'summary': summarize(numbers(dataset, field, positions)) if field else None,
+            }
+            for value, positions in groups(dataset, group_by, rows)
+        ]
+
+    return stats
+
+
+def check_field(model_class: type[BaseModel], field: str, action: str, numeric: bool) -> None:
+    """
+    Reject fields that cannot be aggregated (numeric fields) or grouped (scalar fields).
+
+    Raises:
+        HTTPException: In the `is_sortable_field` 400 style (e.g. "Cannot group by 'films'").
+    """
+    valid = is_sortable_field(model_class, field)
+    if valid and numeric:
+        valid = field_specs(model_class)[field].kind in ('int', 'float')
+    if not valid:
+        raise HTTPException(status_code=400, detail=f"Cannot {action} '{field}'")
+
+
+async def get_stats(
+    model_class: type[BaseModel],
+    resource: str,
+    search: str | None,
+    filter: str | None,
+    field: str | None,
+    group_by: str | None,
+    buckets: int | None,
+) -> dict[str, Any]:
+    """
+    Aggregate the rows of a resource matching a search and filter: count, summary (count,
+    min, max, mean) and histogram of a numeric field, optionally by group.
+
+    Results are memoized per dataset version and query, so repeated queries (e.g.
+    dashboard polls) are answered without touching the rows until the next refresh.
+
+    Args:
+        model_class (type[BaseModel]): the Pydantic model (e.g., Person, Planet).
+        resource (str): the SWAPI resource endpoint name (e.g., people, planets).
+        search (str): optional name-based filter.
+        filter (str): optional filter expression (see `parse_filter`).
+        field (str): optional numeric field to summarize.
+        group_by (str): optional scalar field to group the rows by.
+        buckets (int): optional number of histogram buckets of `field`.
+
+    Returns:
+        dict: The `Stats` response.
+
+    Raises:
+        HTTPException: If a field cannot be aggregated or grouped by, or the filter is
+        invalid (400).
+    """
+    request_logger.info(
+        'GET /%s/stats | search=%s filter=%s field=%s group_by=%s buckets=%s',
+        resource,
+        search,
+        filter,
+        field,
+        group_by,
+        buckets,
+    )
+
+    if field:
+        check_field(model_class, field, 'aggregate', numeric=True)
+    if group_by:
+        check_field(model_class, group_by, 'group by', numeric=False)
+    if buckets and not field:
+        raise HTTPException(status_code=400, detail='Histogram buckets need a field')
+
+    dataset = await get_dataset(model_class, resource)
+    return dataset_stats(dataset, search, filter, field, group_by, buckets)
+
+
+def dataset_stats(
+    dataset: Dataset,
+    search: str | None,
+    filter: str | None,
+    field: str | None,
+    group_by: str | None,
+    buckets: int | None,
+) -> dict[str, Any]:
+    """Aggregate the rows of a dataset version matching a query (see `get_stats`), once."""
+    return memoize(
+        dataset,
+        ('stats', search, filter, field, group_by, buckets),
+        lambda: compute_stats(
+            dataset, match_rows(dataset, search, filter), field, group_by, buckets
+        ),
+    )
+
+
+def get_facets(
+    dataset: Dataset, search: str | None, filter: str | None, fields: str
+) -> dict[str, list[dict[str, Any]]]:
+    """
+    Count the rows matching a search and filter by value of some fields, most common
+    values first. Memoized per dataset version and query, like `get_stats`.
+
+    Args:
+        dataset (Dataset): The cached dataset.
+        search (str): optional name-based filter.
+        filter (str): optional filter expression (see `parse_filter`).
+        fields (str): comma-separated scalar fields.
+
+    Returns:
+        dict: Value counts (`value`, `count`) by field, with JSON values (e.g. dates as
+        ISO 8601 strings).
+
+    Raises:
+        HTTPException: If a field cannot be faceted (400).
+    """
+    names = list(dict.fromkeys(name.strip() for name in fields.split(',') if name.strip()))
+    for name in names:
+        check_field(dataset.model_class, name, 'facet by', numeric=False)
+
+    def compute() -> dict[str, list[dict[str, Any]]]:
+        rows = match_rows(dataset, search, filter)
+        return {
+            name: [
+                {'value': jsonable_encoder(value), 'count': len(positions)}
+                for value, positions in groups(dataset, name, rows)
+            ]
+            for name in names
+        }
+
+    return memoize(dataset, ('facets', search, filter, tuple(names)), compute)
+
+
+async def facets_page(page: Page, facets: str, expand: str | None = None) -> dict[str, Any]:
+    """
+    Build the response dictionary of a page with the facet counts of the rows its query
+    matches (all pages).
+
+    Args:
+        page (Page): The selected page.
+        facets (str): comma-separated scalar fields to count the rows by.
+        expand (str): optional link fields to embed (see `expand_response`).
+
+    Returns:
+        dict: The paginated response, with JSON values and a `facets` member.
+
+    Raises:
+        HTTPException: If a field cannot be faceted, or expanded (400).
+    """
+    counts = get_facets(page.dataset, page.search, page.filter, facets)
+
+    if expand:
+        body = await expand_page(page, parse_expand(page.dataset.model_class, expand))
+    else:
+        body = jsonable_encoder(page.to_dict())
+
+    return {**body, 'facets': counts}
+
+
+async def facets_response(page: Page, facets: str, expand: str | None = None) -> JSONResponse:
+    """Respond with a page and its facet counts (see `facets_page`)."""
+    return JSONResponse(await facets_page(page, facets, expand))
@@ -0,0 +1,108 @@
+"""
+CLI `list --all`: time and peak memory to write a whole collection as NDJSON, paging
+sequentially versus prefetching pages concurrently, from a local stand-in for the API
+answering each page after some latency.
+
+Usage: python -m benchmarks.bench_cli_export [rows] [latency_seconds]
+"""
+
+import io
+import json
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.synthetic import generate
+from cli import utils
+from cli.output import WRITERS
+from cli.utils import MAX_PAGE_SIZE, iter_pages
+
+CONCURRENCY = (1, 2, 4, 8)
+
+
+class NullStream(io.TextIOBase):
+    """Counts what is written, keeping none of it."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, text: str) -> int:
+        self.size += len(text)
+        return len(text)
+
+
+def serve_pages(rows: list[dict], latency: float) -> ThreadingHTTPServer:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            query = parse_qs(urlsplit(self.path).query)
+            page, size = int(query['page'][0]), int(query['page_size'][0])
+            body = json.dumps(
+                {'count': len(rows), 'results': rows[(page - 1) * size : page * size]}
+            ).encode()
+
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def export(url: str, concurrency: int) -> int:
+    """Write every row as NDJSON, returning how many bytes were written."""
+    stream = NullStream()
+    pages = iter_pages(url, {'page_size': MAX_PAGE_SIZE}, concurrency=concurrency)
+    WRITERS['ndjson']((page['results'] for page in pages), stream)
+    return stream.size
+
+
+def measure(url: str, concurrency: int) -> tuple[float, int]:
+    """Elapsed seconds of an export, and its peak memory (traced in a second run)."""
+    started = time.perf_counter()
+    export(url, concurrency)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    export(url, concurrency)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main(rows: int = 5_000, latency: float = 0.02) -> None:
+    utils.response_cache = None  # Measure the API, not the disk cache
+
+    print(f'{"rows":>8}{"concurrency":>13}{"time (s)":>10}{"speedup":>9}{"peak (KiB)":>12}')
+
+    for count in (rows // 5, rows):
+        server = serve_pages(generate('people', count), latency)
+        host, port = server.server_address[:2]
+        url = f'http://{host}:{port}/people/'
+        export(url, 1)  # Warm the connection
+
+        sequential = None
+        for concurrency in CONCURRENCY:
+            elapsed, peak = measure(url, concurrency)
+            sequential = sequential or elapsed
+            print(
+                f'{count:>8}{concurrency:>13}{elapsed:>10.3f}'
+                f'{sequential / elapsed:>8.1f}x{peak / 1024:>12.0f}'
+            )
+
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000, *map(float, sys.argv[2:]))
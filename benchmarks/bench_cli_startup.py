@@ -0,0 +1,78 @@
+"""
+CLI cold start: import time of `cli.main` (from `python -X importtime`, with its slowest
+imports) and wall time of `--help`, against an interpreter doing nothing. The test suite
+checks the import time against `IMPORT_BUDGET`.
+
+Usage: python -m benchmarks.bench_cli_startup [runs]
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Cold import of `cli.main`, in seconds (httpx and Rich alone take longer than that)
+IMPORT_BUDGET = 0.1
+
+# Loaded by commands that need them, never to start the CLI
+HEAVY_MODULES = ('httpx', 'msgpack', 'rich')
+
+
+def run(*args: str) -> subprocess.CompletedProcess:
+    env = {**os.environ, 'PYTHONPATH': str(ROOT), 'PYTHONDONTWRITEBYTECODE': '1'}
+    return subprocess.run(
+        [sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def import_times(*args: str) -> dict[str, tuple[int, int]]:
+    """Self and cumulative import times (µs) of every module a command imports."""
+    times = {}
+    for line in run('-X', 'importtime', *args).stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line.removeprefix('import time:').split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def import_time(module: str = 'cli.main', runs: int = 5) -> float:
+    """Best cold import time of a module, in seconds."""
+    return min(import_times('-c', f'import {module}')[module][1] for _ in range(runs)) / 1e6
+
+
+def wall_time(*args: str, runs: int = 5) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        run(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(runs: int = 5) -> None:
+    elapsed = import_time(runs=runs)
+    times = import_times('-c', 'import cli.main')
+    heavy = [module for module in HEAVY_MODULES if module in times]
+
+    print(f'import cli.main: {elapsed * 1000:.1f} ms (budget {IMPORT_BUDGET * 1000:.0f} ms)')
+    print(f'heavy modules imported: {", ".join(heavy) or "none"}\n')
+
+    print(f'{"slowest imports (self)":<40}{"self (ms)":>10}{"total (ms)":>12}')
+    slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:10]
+    for module, (own, cumulative) in slowest:
+        print(f'{module:<40}{own / 1000:>10.2f}{cumulative / 1000:>12.2f}')
+
+    baseline = wall_time('-c', 'pass', runs=runs)
+    help = wall_time('-m', 'cli.main', 'people', 'list', '--help', runs=runs)
+    print(f'\n{"python -c pass":<40}{baseline * 1000:>10.1f} ms')
+    print(f'{"python -m cli.main people list --help":<40}{help * 1000:>10.1f} ms')
+
+    sys.exit(0 if elapsed <= IMPORT_BUDGET and not heavy else 1)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,46 @@
+"""
+Memory of a cached dataset: list of Pydantic models vs ColumnStore.
+
+Usage: python -m benchmarks.bench_columnar [rows]
+"""
+
+import gc
+import sys
+import time
+import tracemalloc
+
+from api.models import Person, Planet
+from api.utils.columnar import ColumnStore
+from api.utils.filters import normalize_swapi_data
+from benchmarks.synthetic import generate
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main(rows: int = 10_000) -> None:
+    print(f'{"resource":<10}{"layout":<14}{"MiB / 10k rows":>16}{"build (s)":>12}')
+
+    for resource, model_class in (('people', Person), ('planets', Planet)):
+        records = list(filter(None, map(normalize_swapi_data, generate(resource, rows))))
+        scale = 10_000 / rows
+
+        layouts = {
+            'models': lambda: [model_class(**record) for record in records],  # noqa: B023
+            'columnar': lambda: ColumnStore.from_records(model_class, records),  # noqa: B023
+        }
+        for layout, build in layouts.items():
+            _, size, elapsed = measure(build)
+            print(f'{resource:<10}{layout:<14}{size * scale / 2**20:>16.2f}{elapsed:>12.3f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
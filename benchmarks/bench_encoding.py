@@ -0,0 +1,63 @@
+"""
+Bytes on the wire and encode time of a full list page (`page_size=100`) of people and
+planets, per body encoding (JSON, MessagePack) and content coding (none, gzip, Brotli),
+as negotiated by the list endpoints.
+
+Usage: python -m benchmarks.bench_encoding [page_size] [runs]
+"""
+
+import json
+import sys
+import time
+
+import msgpack
+from fastapi.encoders import jsonable_encoder
+
+from api.models import Person, Planet
+from api.services.dataset import Dataset
+from api.utils.compression import CODINGS
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.pagination import Page
+from benchmarks.synthetic import generate
+
+ENCODINGS = {
+    'json': lambda content: json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode(),
+    'msgpack': msgpack.packb,
+}
+CODINGS = {'identity': lambda body: body, **CODINGS}
+
+
+def best(function, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(page_size: int = 100, runs: int = 50) -> None:
+    print(f'{"resource":<10}{"format":<18}{"bytes":>9}{"ratio":>8}{"encode (ms)":>13}')
+
+    for resource, model_class in (('people', Person), ('planets', Planet)):
+        records = normalize_swapi_batch(model_class, generate(resource, page_size))
+        dataset = Dataset.from_records(resource, model_class, records)
+        content = jsonable_encoder(Page(dataset, list(range(page_size)), page_size, 1).to_dict())
+        reference = len(ENCODINGS['json'](content))
+
+        for encoding, encode in ENCODINGS.items():
+            for coding, compress in CODINGS.items():
+
+                def render(encode=encode, compress=compress, content=content):
+                    return compress(encode(content))
+
+                size = len(render())
+                elapsed = best(render, runs)
+                print(
+                    f'{resource:<10}{f"{encoding}+{coding}":<18}{size:>9}'
+                    f'{size / reference:>8.2f}{elapsed * 1000:>13.3f}'
+                )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,76 @@
+"""
+Related-entity expansion: latency of a 100-person page with `expand=homeworld` versus the
+client-side N+1 pattern (the page, then one request per homeworld link, one at a time or
+six at a time). SWAPI is replaced by a local stand-in with some latency; the API runs
+in-process.
+
+Usage: python -m benchmarks.bench_expand [rows] [latency_seconds] [runs]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from api.main import app
+from api.utils.expand import link_target
+from benchmarks.fake_swapi import FakeSwapi
+
+PAGE = '/people/?page_size=100&sort_by=name'
+
+
+async def expanded(api: httpx.AsyncClient, swapi: httpx.AsyncClient) -> int:
+    response = await api.get(f'{PAGE}&expand=homeworld')
+    return sum(isinstance(row['homeworld'], dict) for row in response.json()['results'])
+
+
+async def n_plus_one(api: httpx.AsyncClient, swapi: httpx.AsyncClient) -> int:
+    response = await api.get(PAGE)
+    homeworlds = []
+    for row in response.json()['results']:
+        resource, id = link_target(row['homeworld'])
+        homeworlds.append((await swapi.get(f'{resource}/{id}')).json())
+    return len(homeworlds)
+
+
+async def n_plus_one_concurrent(api: httpx.AsyncClient, swapi: httpx.AsyncClient) -> int:
+    response = await api.get(PAGE)
+    links = [link_target(row['homeworld']) for row in response.json()['results']]
+    semaphore = asyncio.Semaphore(6)  # Like a browser, per host
+
+    async def get(resource: str, id: str) -> httpx.Response:
+        async with semaphore:
+            return await swapi.get(f'{resource}/{id}')
+
+    responses = await asyncio.gather(*(get(*link) for link in links))
+    return len(responses)
+
+
+async def measure(base_url: str, runs: int) -> None:
+    os.environ['SWAPI_BASE_URL'] = base_url
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        httpx.AsyncClient(transport=transport, base_url='http://api') as api,
+        httpx.AsyncClient(base_url=f'{base_url}/') as swapi,
+    ):
+        await api.get(f'{PAGE}&expand=homeworld')  # Warm the people and planets datasets
+
+        print(f'{"pattern":<24}{"resolved":>10}{"latency (ms)":>15}')
+        for pattern in (expanded, n_plus_one_concurrent, n_plus_one):
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                resolved = await pattern(api, swapi)
+                timings.append(time.perf_counter() - started)
+            print(f'{pattern.__name__:<24}{resolved:>10}{min(timings) * 1000:>15.1f}')
+
+
+def main(rows: int = 1_000, latency: float = 0.02, runs: int = 5) -> None:
+    with FakeSwapi(rows, latency) as fake:
+        asyncio.run(measure(fake.base_url, runs))
+
+
+if __name__ == '__main__':
+    main(*(cast(arg) for cast, arg in zip((int, float, int), sys.argv[1:], strict=False)))
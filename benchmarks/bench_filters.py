@@ -0,0 +1,60 @@
+"""
+Filter expressions: indexed evaluation (`filter_rows`, over sort and value indexes) versus
+scanning every row's model, once the indexes of the dataset version are built.
+
+Usage: python -m benchmarks.bench_filters [rows] [runs]
+"""
+
+import sys
+import time
+
+from api.models import Planet
+from api.services.dataset import Dataset
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.predicates import filter_rows, parse_filter
+from benchmarks.synthetic import generate
+
+QUERIES = {
+    'population>1000000': lambda p: p.population is not None and p.population > 1_000_000,
+    'climate=arid': lambda p: p.climate is not None and p.climate.lower() == 'arid',
+    'diameter=5000..8000': lambda p: p.diameter is not None and 5000 <= p.diameter <= 8000,
+    'population>1000000,climate=arid|frozen': lambda p: (
+        p.population is not None
+        and p.population > 1_000_000
+        and p.climate is not None
+        and p.climate.lower() in ('arid', 'frozen')
+    ),
+}
+
+
+def best(function, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(rows: int = 100_000, runs: int = 5) -> None:
+    dataset = Dataset.from_records(
+        'planets', Planet, normalize_swapi_batch(Planet, generate('planets', rows))
+    )
+
+    print(f'{"filter":<42}{"matches":>9}{"scan (ms)":>12}{"indexed (ms)":>14}')
+
+    for expression, check in QUERIES.items():
+        predicates = parse_filter(Planet, expression)
+        matches = filter_rows(dataset, predicates)  # Builds the indexes
+
+        def scan(check=check):
+            return [i for i, row in enumerate(dataset.rows(range(rows))) if check(row)]
+
+        assert set(scan()) == matches
+        scanned = best(scan, 1)
+        indexed = best(lambda predicates=predicates: filter_rows(dataset, predicates), runs)
+        print(f'{expression:<42}{len(matches):>9}{scanned * 1000:>12.1f}{indexed * 1000:>14.2f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,106 @@
+"""
+Logging at INFO: time a caller spends per request log line, and list request throughput,
+with handlers called directly (as before) versus through the queue (I/O and formatting
+on a background thread), with JSON lines and with sampled request logs.
+
+Log files and console output go to a temporary directory.
+
+Usage: python -m benchmarks.bench_logging [rows] [requests]
+"""
+
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.models import Person
+from api.utils import pagination
+from api.utils.normalization import normalize_swapi_batch
+from benchmarks.synthetic import generate
+from shared import logger as logger_module
+from shared.logger import SamplingFilter, configure_logger
+
+MODES = {
+    'direct (before)': {'queued': False, 'format': 'text', 'sampling': None},
+    'queued': {'queued': True, 'format': 'text', 'sampling': None},
+    'queued, json': {'queued': True, 'format': 'json', 'sampling': None},
+    'queued, sampled 10%': {'queued': True, 'format': 'text', 'sampling': 0.1},
+}
+
+
+def configure(queued: bool, format: str, sampling: float | None) -> None:
+    logger, requests = logging.getLogger('api'), logging.getLogger('api.requests')
+    logger.setLevel(logging.INFO)
+    configure_logger(logger, queued=queued, format=format)
+
+    for filter in requests.filters[:]:
+        requests.removeFilter(filter)
+    if sampling is not None:
+        requests.addFilter(SamplingFilter(sampling))
+
+
+def flush() -> None:
+    """Wait for the queued records to be written (by restarting the listener)."""
+    for handler in logging.getLogger('api').handlers:
+        listener = getattr(handler, 'listener', None)
+        if listener is not None:
+            listener.stop()
+            listener.start()
+
+
+def per_line(calls: int = 20_000) -> float:
+    requests = logging.getLogger('api.requests')
+    started = time.perf_counter()
+    for page in range(calls):
+        requests.info('GET /%s | page=%s page_size=%s search=%s', 'people', page, 10, None)
+    elapsed = (time.perf_counter() - started) / calls
+    flush()
+    return elapsed
+
+
+def throughput(client: TestClient, requests: int) -> float:
+    started = time.perf_counter()
+    for page in range(requests):
+        client.get('/people/', params={'page': page % 50 + 1, 'sort_by': 'name'})
+    elapsed = time.perf_counter() - started
+    flush()
+    return requests / elapsed
+
+
+def main(rows: int = 1_000, requests: int = 500) -> None:
+    records = normalize_swapi_batch(Person, generate('people', rows))
+
+    async def fetch(model_class, resource, validate=True):
+        return records
+
+    pagination.fetch_swapi_data = fetch
+
+    with tempfile.TemporaryDirectory() as directory:
+        logger_module.LOG_DIR = Path(directory)
+        stderr, sys.stderr = sys.stderr, open(Path(directory) / 'console.log', 'w')
+        client = TestClient(app, headers={'Accept-Encoding': 'identity'})
+        client.get('/people/', params={'sort_by': 'name'})  # Warm the cache and indexes
+
+        results = {mode: ([], []) for mode in MODES}
+        for _ in range(3):  # Alternate the modes, so drifts of the machine affect all alike
+            for mode, options in MODES.items():
+                configure(**options)
+                results[mode][0].append(per_line())
+                results[mode][1].append(throughput(client, requests))
+
+        for handler in logging.getLogger('api').handlers:
+            handler.close()
+        sys.stderr.close()
+        sys.stderr = stderr
+
+    print(f'{"logging":<24}{"per line (µs)":>15}{"requests/s":>12}')
+    for mode, (lines, rates) in results.items():
+        print(f'{mode:<24}{min(lines) * 1e6:>15.2f}{max(rates):>12.0f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,139 @@
+"""
+Overhead of the metrics: the cost of one `timed` measurement (as a context manager and as
+a decorator) and of the request middleware, and their share of the latency of list
+requests, checked against a budget.
+
+Usage: python -m benchmarks.bench_metrics [rows] [requests]
+"""
+
+import asyncio
+import sys
+import time
+
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.models import Person
+from api.utils import pagination
+from api.utils.metrics import REQUEST_SECONDS, STAGE_SECONDS, MetricsMiddleware, timed
+from api.utils.normalization import normalize_swapi_batch
+from benchmarks.synthetic import generate
+
+# Budgets: per measured stage, and per request (share of its latency)
+STAGE_BUDGET = 2e-6
+REQUEST_BUDGET = 0.01
+
+QUERIES = [
+    {'page_size': 10},
+    {'page_size': 100, 'sort_by': 'height'},
+    {'page_size': 10, 'search': 'a', 'sort_by': 'name'},
+]
+
+
+def per_call(function, calls: int = 200_000, runs: int = 5) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        for _ in range(calls):
+            function()
+        timings.append((time.perf_counter() - started) / calls)
+    return min(timings)
+
+
+def stage_overhead() -> float:
+    def bare():
+        pass
+
+    def block():
+        with timed('bench'):
+            pass
+
+    decorated = timed('bench')(bare)
+
+    baseline = per_call(bare)
+    with_block, with_decorator = per_call(block) - baseline, per_call(decorated) - baseline
+    STAGE_SECONDS.clear()
+
+    print(f'{"timed":<28}{"overhead (µs)":>14}')
+    print(f'{"context manager":<28}{with_block * 1e6:>14.3f}')
+    print(f'{"decorator":<28}{with_decorator * 1e6:>14.3f}')
+    return max(with_block, with_decorator)
+
+
+def middleware_overhead(calls: int = 20_000) -> float:
+    async def endpoint(scope, receive, send):
+        await send({'type': 'http.response.start', 'status': 200})
+
+    async def send(message):
+        pass
+
+    middleware = MetricsMiddleware(endpoint)
+    scope = {'type': 'http', 'method': 'GET', 'path': '/'}
+
+    async def run(app) -> float:
+        started = time.perf_counter()
+        for _ in range(calls):
+            await app(scope, None, send)
+        return (time.perf_counter() - started) / calls
+
+    overhead = min(asyncio.run(run(middleware)) - asyncio.run(run(endpoint)) for _ in range(5))
+    REQUEST_SECONDS.clear()
+
+    print(f'{"middleware":<28}{overhead * 1e6:>14.3f}')
+    return overhead
+
+
+def observations() -> int:
+    return sum(series[2] for series in STAGE_SECONDS._series.values())
+
+
+def request_overhead(rows: int, requests: int, stage: float, middleware: float) -> float:
+    """
+    Share of the latency of list requests spent measuring them: their measurements times
+    the cost of each. (Timing requests with metrics on and off would not do: the noise of
+    end-to-end timings is larger than the difference.)
+    """
+    records = normalize_swapi_batch(Person, generate('people', rows))
+
+    async def fetch(model_class, resource, validate=True):
+        return records
+
+    pagination.fetch_swapi_data = fetch
+    client = TestClient(app, headers={'Accept-Encoding': 'identity'})
+
+    print(f'\n{"query":<40}{"stages":>8}{"latency (ms)":>14}{"overhead":>10}')
+    worst = 0.0
+    for query in QUERIES:
+        client.get('/people/', params=query)  # Warm the cache and indexes
+
+        before, timings = observations(), []
+        for _ in range(requests):
+            started = time.perf_counter()
+            client.get('/people/', params=query)
+            timings.append(time.perf_counter() - started)
+
+        stages = (observations() - before) / requests
+        latency = sorted(timings)[len(timings) // 2]
+        overhead = (stages * stage + middleware) / latency
+        worst = max(worst, overhead)
+
+        label = '&'.join(f'{key}={value}' for key, value in query.items())
+        print(f'{label:<40}{stages:>8.1f}{latency * 1000:>14.3f}{overhead:>10.2%}')
+
+    return worst
+
+
+def main(rows: int = 10_000, requests: int = 500) -> None:
+    stage = stage_overhead()
+    request = request_overhead(rows, requests, stage, middleware_overhead())
+
+    within = stage <= STAGE_BUDGET and request <= REQUEST_BUDGET
+    print(
+        f'\nBudget: {STAGE_BUDGET * 1e6:.0f}µs per stage, {REQUEST_BUDGET:.0%} per request: '
+        f'{"met" if within else "EXCEEDED"}'
+    )
+    sys.exit(0 if within else 1)
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
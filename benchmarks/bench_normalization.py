@@ -0,0 +1,37 @@
+"""
+Normalization of raw SWAPI payloads: per-value `normalize_swapi_data` vs the column-wise
+`normalize_swapi_batch`.
+
+Usage: python -m benchmarks.bench_normalization [rows ...]
+"""
+
+import sys
+import time
+
+from api.models import Person, Planet
+from api.utils.filters import normalize_swapi_data
+from api.utils.normalization import normalize_swapi_batch
+from benchmarks.synthetic import generate
+
+
+def timed(function, *args) -> float:
+    started = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - started
+
+
+def main(*sizes: int) -> None:
+    print(f'{"resource":<10}{"rows":>8}{"per-value (s)":>16}{"batch (s)":>12}{"speedup":>10}')
+
+    for resource, model_class in (('people', Person), ('planets', Planet)):
+        for rows in sizes or (1_000, 10_000, 100_000):
+            items = generate(resource, rows)
+            baseline = timed(lambda: list(filter(None, map(normalize_swapi_data, items))))  # noqa: B023
+            batch = timed(normalize_swapi_batch, model_class, items)
+            print(
+                f'{resource:<10}{rows:>8}{baseline:>16.3f}{batch:>12.3f}{baseline / batch:>9.1f}x'
+            )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
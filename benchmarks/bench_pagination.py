@@ -0,0 +1,64 @@
+"""
+Walking a whole collection page by page: offset pages (`page=N`) versus cursors
+(`next_cursor`), on a cached dataset, for a few search/sort combinations.
+
+Usage: python -m benchmarks.bench_pagination [rows] [page_size]
+"""
+
+import asyncio
+import sys
+import time
+
+from api.models import Person
+from api.utils import pagination
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.pagination import get_page
+from benchmarks.synthetic import generate
+
+QUERIES = [(None, None), (None, 'height'), ('a', 'name')]
+
+
+async def walk_offsets(page_size: int, search: str | None, sort_by: str | None) -> int:
+    pages, page = 0, 1
+    while True:
+        result = await get_page(Person, 'people', page, page_size, search, sort_by, 'asc')
+        pages, page = pages + 1, page + 1
+        if not result.positions or (page - 1) * page_size >= result.count:
+            return pages
+
+
+async def walk_cursors(page_size: int, search: str | None, sort_by: str | None) -> int:
+    result = await get_page(Person, 'people', 1, page_size, search, sort_by, 'asc')
+    pages = 1
+    while result.next_cursor:
+        result = await get_page(
+            Person, 'people', 1, page_size, None, None, None, cursor=result.next_cursor
+        )
+        pages += 1
+    return pages
+
+
+async def main(rows: int = 100_000, page_size: int = 100) -> None:
+    records = normalize_swapi_batch(Person, generate('people', rows))
+
+    async def fetch(model_class, resource, validate=True):
+        return records
+
+    pagination.fetch_swapi_data = fetch
+    await get_page(Person, 'people', 1, 1, None, None, 'asc')  # Warm the cache
+
+    print(f'{"search":<8}{"sort_by":<10}{"pages":>8}{"offset (s)":>12}{"cursor (s)":>12}')
+
+    for search, sort_by in QUERIES:
+        timings = []
+        for walk in (walk_offsets, walk_cursors):
+            started = time.perf_counter()
+            pages = await walk(page_size, search, sort_by)
+            timings.append(time.perf_counter() - started)
+
+        offset, cursor = timings
+        print(f'{search or "-":<8}{sort_by or "-":<10}{pages:>8}{offset:>12.3f}{cursor:>12.3f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main(*map(int, sys.argv[1:])))
@@ -0,0 +1,55 @@
+"""
+Dataset refresh: full rebuild vs incremental `refresh_dataset`, for a growing share of rows
+edited upstream. Derived structures (sort indexes, search index, JSON fragments) are built
+beforehand, so the incremental refresh has to patch them.
+
+Usage: python -m benchmarks.bench_refresh [rows]
+"""
+
+import copy
+import sys
+import time
+
+from api.models import Person
+from api.services.dataset import Dataset, refresh_dataset
+from api.utils.indexes import get_search_index, get_sort_index
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.serialization import get_json_fragments
+from benchmarks.synthetic import generate
+
+
+def build(items: list[dict]) -> Dataset:
+    dataset = Dataset.from_records('people', Person, normalize_swapi_batch(Person, items))
+    for field in ('name', 'height', 'mass'):
+        get_sort_index(dataset, field)
+    get_search_index(dataset)
+    get_json_fragments(dataset)
+    return dataset
+
+
+def main(rows: int = 100_000) -> None:
+    items = generate('people', rows)
+    previous = build(items)
+
+    print(f'{"changed":>8}{"rebuild (s)":>14}{"incremental (s)":>18}{"speedup":>10}')
+
+    for changed in (0, 10, 100, 1_000, 10_000):
+        payload = copy.deepcopy(items)
+        for item in payload[:: max(1, rows // changed)][:changed] if changed else ():
+            item['name'] += ' II'
+            item['edited'] = '2030-01-01T00:00:00.000000Z'
+
+        started = time.perf_counter()
+        build(payload)
+        rebuild = time.perf_counter() - started
+
+        started = time.perf_counter()
+        refreshed = refresh_dataset(previous, payload)
+        incremental = time.perf_counter() - started
+
+        assert refreshed.rows_changed == changed or refreshed is previous
+        print(f'{changed:>8}{rebuild:>14.3f}{incremental:>18.3f}{rebuild / incremental:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""
+Every registered resource through the generic resource engine: first request (loading the
+dataset from SWAPI), first sorted search (building the indexes) and the same query once
+cached. SWAPI is replaced by a local stand-in, so the benchmark runs offline; the API runs
+in-process.
+
+Usage: python -m benchmarks.bench_resources [rows] [runs]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+from api.main import app
+from api.resources import RESOURCES
+from benchmarks.fake_swapi import FakeSwapi
+
+
+async def timed(client: httpx.AsyncClient, path: str, params: dict) -> float:
+    started = time.perf_counter()
+    response = await client.get(path, params=params)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.text
+    return elapsed
+
+
+async def measure(base_url: str, runs: int) -> None:
+    os.environ['SWAPI_BASE_URL'] = base_url
+    transport = httpx.ASGITransport(app=app)
+
+    print(f'{"resource":<12}{"first (ms)":>12}{"indexed (ms)":>14}{"cached (ms)":>13}')
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://api') as client:
+        for resource in RESOURCES.values():
+            path = f'/{resource.name}/'
+            query = {
+                'search': 'a',
+                'sort_by': resource.sortable_fields[1],
+                'order': 'desc',
+                'page_size': 100,
+            }
+
+            first = await timed(client, path, {})
+            indexed = await timed(client, path, query)
+            cached = min([await timed(client, path, query) for _ in range(runs)])
+
+            print(
+                f'{resource.name:<12}{first * 1000:>12.1f}{indexed * 1000:>14.1f}'
+                f'{cached * 1000:>13.2f}'
+            )
+
+
+def main(rows: int = 10_000, runs: int = 20) -> None:
+    with FakeSwapi(rows) as fake:
+        asyncio.run(measure(fake.base_url, runs))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
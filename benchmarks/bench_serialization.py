@@ -0,0 +1,56 @@
+"""
+Requests/second of `GET /people/?page_size=100`, with and without the fast serialization
+path. Runs in-process against `api.main:app` with a stubbed, pre-warmed SWAPI dataset.
+
+Usage: python -m benchmarks.bench_serialization [requests] [rows]
+"""
+
+import asyncio
+import sys
+import time
+
+import httpx
+
+from api.main import app
+from api.routers import resources
+from api.utils import pagination
+from api.utils.filters import normalize_swapi_data
+from benchmarks.synthetic import generate
+
+
+async def run(requests: int, fast: bool) -> float:
+    resources.FAST_SERIALIZATION = fast
+    transport = httpx.ASGITransport(app=app)
+
+    # Uncompressed, to measure serialization alone (see bench_encoding)
+    headers = {'Accept-Encoding': 'identity'}
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url='http://bench', headers=headers
+    ) as client:
+        await client.get('/people/', params={'page_size': 100})  # warm cache and fragments
+
+        started = time.perf_counter()
+        for i in range(requests):
+            page = i % 5 + 1
+            response = await client.get('/people/', params={'page': page, 'page_size': 100})
+            response.raise_for_status()
+
+        return requests / (time.perf_counter() - started)
+
+
+def main(requests: int = 500, rows: int = 1_000) -> None:
+    records = list(filter(None, map(normalize_swapi_data, generate('people', rows))))
+
+    async def fetch(model_class, resource, **kwargs):
+        return records
+
+    pagination.fetch_swapi_data = fetch
+
+    for fast in (False, True):
+        rps = asyncio.run(run(requests, fast))
+        print(f'fast_serialization={fast!s:<6} {rps:>8.0f} req/s')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
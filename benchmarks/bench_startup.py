@@ -0,0 +1,80 @@
+"""
+API startup: time from process start to the first 200 response of `/people/`, starting
+cold (fetching from SWAPI) versus from a dataset snapshot. SWAPI is replaced by a local
+stand-in with some latency.
+
+Usage: python -m benchmarks.bench_startup [rows] [latency_seconds] [runs]
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from benchmarks.fake_swapi import FakeSwapi
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def time_to_first_response(base_url: str, snapshot_dir: str, timeout: float = 60) -> float:
+    port = free_port()
+    env = {
+        **os.environ,
+        'LOG_LEVEL': 'WARNING',
+        'SWAPI_BASE_URL': base_url,
+        'SWAPI_SNAPSHOT_DIR': snapshot_dir,
+    }
+    command = [
+        *(sys.executable, '-m', 'uvicorn', 'api.main:app', '--port', str(port)),
+        *('--log-level', 'warning', '--no-access-log'),
+    ]
+
+    started = time.perf_counter()
+    server = subprocess.Popen(command, env=env, stderr=subprocess.DEVNULL)
+
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                response = httpx.get(
+                    f'http://127.0.0.1:{port}/people/?page_size=1', timeout=timeout
+                )
+                if response.status_code == 200:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                pass
+            time.sleep(0.005)
+        raise TimeoutError('The API did not answer in time')
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(rows: int = 10_000, latency: float = 1.0, runs: int = 3) -> None:
+    with FakeSwapi(rows, latency) as fake, tempfile.TemporaryDirectory() as snapshots:
+        print(f'{"mode":<10}{"rows":>8}{"first 200 (s)":>16}{"upstream calls":>16}')
+
+        for mode in ('cold', 'snapshot'):
+            timings = []
+            before = fake.requests
+            for _ in range(runs):
+                # Snapshots written by the cold runs are fresh: no upstream call at all after
+                if mode == 'cold':
+                    for name in os.listdir(snapshots):
+                        os.remove(os.path.join(snapshots, name))
+                timings.append(time_to_first_response(fake.base_url, snapshots))
+
+            calls = (fake.requests - before) / runs
+            print(f'{mode:<10}{rows:>8}{min(timings):>16.3f}{calls:>16.1f}')
+
+
+if __name__ == '__main__':
+    main(*(cast(arg) for cast, arg in zip((int, float, int), sys.argv[1:], strict=False)))
@@ -0,0 +1,55 @@
+"""
+Aggregates of `/planets/stats` and list facets: first query of a dataset version (scanning
+the matching rows) versus the same query polled again (memoized for the version).
+
+Usage: python -m benchmarks.bench_stats [rows] [runs]
+"""
+
+import sys
+import time
+
+from api.models import Planet
+from api.services.dataset import Dataset
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.stats import dataset_stats, get_facets
+from benchmarks.synthetic import generate
+
+QUERIES = {
+    'population': (None, 'population', None, 10),
+    'population by climate': (None, 'population', 'climate', None),
+    'diameter by terrain, filtered': ('population>1000000', 'diameter', 'terrain', 20),
+}
+
+
+def timed(function) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def main(rows: int = 100_000, runs: int = 1000) -> None:
+    dataset = Dataset.from_records(
+        'planets', Planet, normalize_swapi_batch(Planet, generate('planets', rows))
+    )
+
+    print(f'{"query":<32}{"first (ms)":>12}{"polled (us)":>13}')
+
+    for name, (filter, field, group_by, buckets) in QUERIES.items():
+
+        def query(filter=filter, field=field, group_by=group_by, buckets=buckets):
+            return dataset_stats(dataset, None, filter, field, group_by, buckets)
+
+        first = timed(query)
+        polled = min(timed(query) for _ in range(runs))
+        print(f'{name:<32}{first * 1000:>12.1f}{polled * 1e6:>13.2f}')
+
+    def facets():
+        return get_facets(dataset, None, None, 'climate,terrain')
+
+    first = timed(facets)
+    polled = min(timed(facets) for _ in range(runs))
+    print(f'{"facets climate,terrain":<32}{first * 1000:>12.1f}{polled * 1e6:>13.2f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
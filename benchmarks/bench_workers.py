@@ -0,0 +1,96 @@
+"""
+Multi-worker API: upstream requests and worker memory with per-worker datasets versus
+datasets shared by a leader worker (SWAPI_SHARED_DIR). SWAPI is replaced by a local
+stand-in; memory is the proportional set size (shared pages split between processes).
+
+Usage: python -m benchmarks.bench_workers [rows] [workers]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+from benchmarks.bench_startup import free_port
+from benchmarks.fake_swapi import FakeSwapi
+
+
+def children(pid: int) -> list[int]:
+    """Process ids of the direct children of a process (Linux)."""
+    found = []
+    for stat in Path('/proc').glob('[0-9]*/stat'):
+        try:
+            fields = stat.read_text().rsplit(')', 1)[1].split()
+        except OSError:
+            continue
+        if int(fields[1]) == pid:
+            found.append(int(stat.parent.name))
+    return found
+
+
+def pss_mb(pid: int) -> float:
+    for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines():
+        if line.startswith('Pss:'):
+            return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run(base_url: str, workers: int, shared_dir: str) -> tuple[float, list[float]]:
+    port = free_port()
+    env = {
+        **os.environ,
+        'LOG_LEVEL': 'WARNING',
+        'SWAPI_BASE_URL': base_url,
+        'SWAPI_SNAPSHOT_DIR': '',
+        'SWAPI_SHARED_DIR': shared_dir,
+        'SWAPI_SHARED_POLL_INTERVAL': '0.2',
+    }
+    command = [
+        *(sys.executable, '-m', 'uvicorn', 'api.main:app', '--port', str(port)),
+        *('--workers', str(workers), '--log-level', 'warning', '--no-access-log'),
+    ]
+    server = subprocess.Popen(command, env=env)
+    url = f'http://127.0.0.1:{port}'
+
+    try:
+        while True:
+            try:
+                httpx.get(f'{url}/docs', timeout=1)
+                break
+            except httpx.TransportError:
+                time.sleep(0.05)
+
+        def get(path: str) -> int:
+            return httpx.get(f'{url}{path}', timeout=120).status_code
+
+        # Enough concurrent requests to reach every worker
+        started = time.perf_counter()
+        with ThreadPoolExecutor(8 * workers) as pool:
+            paths = ['/people/?sort_by=name', '/planets/?search=a'] * 8 * workers
+            assert set(pool.map(get, paths)) == {200}
+        elapsed = time.perf_counter() - started
+
+        time.sleep(1)  # Let followers map the published datasets
+        return elapsed, [pss_mb(pid) for pid in children(server.pid)]
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(rows: int = 50_000, workers: int = 4) -> None:
+    print(f'{"mode":<12}{"workers":>8}{"first wave (s)":>16}{"upstream calls":>16}{"PSS (MB)":>10}')
+
+    for mode in ('per-worker', 'shared'):
+        with FakeSwapi(rows, latency=0.5) as fake, tempfile.TemporaryDirectory() as shared:
+            elapsed, memory = run(fake.base_url, workers, shared if mode == 'shared' else '')
+            print(f'{mode:<12}{workers:>8}{elapsed:>16.2f}{fake.requests:>16}{sum(memory):>10.0f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,151 @@
+"""
+A local stand-in for SWAPI serving synthetic payloads (or the recorded fixtures of the
+tests), with optional latency and injected faults (errors and slow responses).
+
+Usage: python -m benchmarks.fake_swapi [rows|fixtures] [port] [error_rate] [slow_rate]
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.synthetic import GENERATORS, generate
+
+# Real SWAPI payloads, recorded for the tests
+FIXTURES = Path(__file__).resolve().parent.parent / 'tests' / 'fixtures' / 'swapi'
+
+
+class FakeSwapi:
+    """
+    Serves `/api/<resource>` and `/api/<resource>/<id>` for every synthetic resource, in a
+    background thread. Collections of `rows` items are generated on their first request
+    (so large ones, e.g. 1M rows, only cost what is asked for); with `fixtures`, the
+    recorded payloads of that directory are served instead.
+
+    Faults are injected at random (`error_rate` of the requests get a 503, `slow_rate` take
+    `slow_latency` more seconds) or on demand: the next `fail_next` requests get a 503.
+    """
+
+    def __init__(
+        self,
+        rows: int = 1_000,
+        latency: float = 0.0,
+        port: int = 0,
+        error_rate: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 1.0,
+        seed: int = 0,
+        fixtures: Path | None = None,
+    ):
+        self.rows = rows
+        self.fixtures = fixtures
+        self.latency = latency
+        self.error_rate = error_rate
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.fail_next = 0
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._collections: dict[str, tuple[list[dict], bytes] | None] = {}
+        self._collections_lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f'http://{host}:{port}/api'
+
+    def __enter__(self) -> 'FakeSwapi':
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def collection(self, resource: str) -> tuple[list[dict], bytes] | None:
+        """The items of a resource and their JSON payload, built on first use."""
+        with self._collections_lock:
+            if resource not in self._collections:
+                if self.fixtures is not None:
+                    path = self.fixtures / f'{resource}.json'
+                    items = json.loads(path.read_bytes()) if path.exists() else None
+                else:
+                    items = generate(resource, self.rows) if resource in GENERATORS else None
+                self._collections[resource] = (
+                    None if items is None else (items, json.dumps(items).encode())
+                )
+            return self._collections[resource]
+
+    def body(self, path: str) -> bytes | None:
+        resource, _, id = path.partition('/')
+        collection = self.collection(resource)
+        if collection is None:
+            return None
+
+        items, payload = collection
+        if not id:
+            return payload
+        if not id.isdigit():
+            return None
+
+        if self.fixtures is not None:  # Recorded ids are not positions
+            items = [item for item in items if item['url'].rstrip('/').endswith(f'/{id}')]
+            return json.dumps(items[0]).encode() if items else None
+        if 0 < int(id) <= len(items):
+            return json.dumps(items[int(id) - 1]).encode()
+        return None
+
+    def fault(self) -> tuple[bool, float]:
+        """Draw the fault of a request: whether it fails, and its extra latency."""
+        with self._lock:
+            self.requests += 1
+            fails = self.fail_next > 0 or self._random.random() < self.error_rate
+            self.fail_next = max(0, self.fail_next - 1)
+            self.errors += fails
+            slow = self._random.random() < self.slow_rate
+        return fails, self.latency + (self.slow_latency if slow else 0.0)
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                fails, latency = fake.fault()
+                time.sleep(latency)
+                body = fake.body(self.path.removeprefix('/api/').strip('/'))
+                status = 503 if fails else 200 if body is not None else 404
+                body = body if status == 200 else b''
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        return Handler
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    fixtures = FIXTURES if args and args[0] == 'fixtures' else None
+    rows = int(args[0]) if args and not fixtures else 1_000
+    port = int(args[1]) if len(args) > 1 else 8001
+    error_rate = float(args[2]) if len(args) > 2 else 0.0
+    slow_rate = float(args[3]) if len(args) > 3 else 0.0
+
+    with FakeSwapi(
+        rows, port=port, error_rate=error_rate, slow_rate=slow_rate, fixtures=fixtures
+    ) as fake:
+        print(f'Serving {"fixtures" if fixtures else f"{rows} rows"} on {fake.base_url}')
+        threading.Event().wait()
@@ -0,0 +1,152 @@
+"""
+End-to-end load test: the API (`api.main:app` under uvicorn, in a subprocess) against a
+local SWAPI stand-in, driven by concurrent clients over a mix of list, search, sort,
+filter and stats queries. Reports the throughput and latency percentiles.
+
+Usage: python -m benchmarks.load [requests] [concurrency] [rows]
+"""
+
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import httpx
+
+from benchmarks.bench_startup import free_port
+from benchmarks.fake_swapi import FakeSwapi
+
+# Settings of the API under test: quiet, and without datasets kept on disk between runs
+ENVIRONMENT = {'LOG_LEVEL': 'WARNING', 'SWAPI_SNAPSHOT_DIR': '', 'SWAPI_SHARED_DIR': ''}
+
+# Paths requested in turn by the clients
+QUERIES = [
+    '/people/?page=1',
+    '/people/?page=3&page_size=50&sort_by=height&order=desc',
+    '/people/?search=sky&sort_by=name',
+    '/planets/?filter=population>1000000,climate=arid&sort_by=diameter',
+    '/planets/?page=2&facets=climate',
+    '/starships/?sort_by=cost_in_credits&page_size=100',
+    '/people/stats?field=height&group_by=gender',
+]
+
+
+@contextmanager
+def serve_api(swapi_url: str, timeout: float = 60) -> Iterator[str]:
+    """Run the API in a subprocess until exit, yielding its base URL once it answers."""
+    port = free_port()
+    env = {**os.environ, **ENVIRONMENT, 'SWAPI_BASE_URL': swapi_url}
+    command = [
+        *(sys.executable, '-m', 'uvicorn', 'api.main:app', '--port', str(port)),
+        *('--log-level', 'warning', '--no-access-log'),
+    ]
+    server = subprocess.Popen(command, env=env, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{port}'
+
+    try:
+        started = time.perf_counter()
+        while True:
+            try:
+                if httpx.get(f'{base_url}/health', timeout=timeout).status_code == 200:
+                    break
+            except httpx.TransportError:
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError('The API did not start in time') from None
+                time.sleep(0.05)
+        yield base_url
+
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def percentile(ordered: list[float], share: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))] if ordered else 0.0
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict[str, Any]:
+    ordered = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p95_ms': percentile(ordered, 0.95) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+    }
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    requests: int,
+    concurrency: int,
+    queries: list[str] = QUERIES,
+) -> dict[str, Any]:
+    """
+    Send `requests` requests (cycling through `queries`) from `concurrency` clients.
+
+    Every query is sent once first, unmeasured, so the datasets and indexes are warm.
+
+    Args:
+        client (httpx.AsyncClient): Client of the API (its base URL set).
+        requests (int): Measured requests, in total.
+        concurrency (int): Requests in flight at once.
+        queries (list[str]): Paths (with query strings) to request.
+
+    Returns:
+        dict: Requests, errors (non-2xx or failed), requests per second and the p50, p95
+        and p99 latencies in milliseconds.
+    """
+    for query in queries:
+        await client.get(query)
+
+    paths = itertools.islice(itertools.cycle(queries), requests)
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker() -> None:
+        nonlocal errors
+        for path in paths:  # Shared: each path is taken by one worker
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                errors += not response.is_success
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def load_test(base_url: str, requests: int, concurrency: int) -> dict[str, Any]:
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        return await drive(client, requests, concurrency)
+
+
+def run(requests: int = 2_000, concurrency: int = 16, rows: int = 10_000) -> dict[str, Any]:
+    """Start a SWAPI stand-in of `rows` rows per resource and the API, and load it."""
+    with FakeSwapi(rows) as fake, serve_api(fake.base_url) as base_url:
+        return asyncio.run(load_test(base_url, requests, concurrency))
+
+
+def main(requests: int = 2_000, concurrency: int = 16, rows: int = 10_000) -> None:
+    result = run(requests, concurrency, rows)
+
+    print(f'{"requests":>9}{"errors":>8}{"rps":>9}{"p50 (ms)":>10}{"p95 (ms)":>10}{"p99 (ms)":>10}')
+    print(
+        f'{result["requests"]:>9}{result["errors"]:>8}{result["rps"]:>9.0f}'
+        f'{result["p50_ms"]:>10.2f}{result["p95_ms"]:>10.2f}{result["p99_ms"]:>10.2f}'
+    )
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,220 @@
+"""
+Benchmark suite, offline against a local SWAPI stand-in: micro-benchmarks of the request
+path (normalization, filtering and sorting, pages of a cached dataset) and a load test of
+the API. Results are written as JSON to `benchmarks/results/latest.json` and compared
+with the saved baseline: a metric worse than it by more than the tolerance is reported as
+a regression (exit status 1).
+
+Usage: python -m benchmarks.suite [--rows N] [--requests N] [--concurrency N]
+       [--tolerance SHARE] [--save-baseline]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks import load
+from benchmarks.fake_swapi import FakeSwapi
+from benchmarks.synthetic import generate
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+BASELINE = RESULTS_DIR / 'baseline.json'
+LATEST = RESULTS_DIR / 'latest.json'
+
+# Settings of the run that results can only be compared under
+COMPARABLE = ('rows', 'requests', 'concurrency')
+
+# Pages requested from the cached dataset, in turn
+PAGE_QUERIES = [
+    {'page': 1, 'page_size': 10, 'search': None, 'sort_by': None, 'order': 'asc'},
+    {'page': 50, 'page_size': 50, 'search': None, 'sort_by': 'height', 'order': 'desc'},
+    {'page': 1, 'page_size': 10, 'search': 'sky', 'sort_by': 'name', 'order': 'asc'},
+    {'page': 3, 'page_size': 100, 'search': None, 'sort_by': 'created', 'order': 'asc'},
+]
+
+Metrics = dict[str, dict[str, Any]]
+
+
+def metric(value: float, unit: str, better: str = 'lower') -> dict[str, Any]:
+    return {'value': round(value, 4), 'unit': unit, 'better': better}
+
+
+def best(function, runs: int) -> float:
+    """Fastest of `runs` calls, in seconds (the least disturbed by the machine)."""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def micro(rows: int, runs: int = 3) -> Metrics:
+    """Time the stages of a list request on `rows` synthetic people (API imported lazily)."""
+    from api.models import Person
+    from api.utils.filters import apply_filters_and_sorting, normalize_swapi_data
+    from api.utils.normalization import normalize_swapi_batch
+
+    items = generate('people', rows)
+    people = [Person.model_validate(row) for row in normalize_swapi_batch(Person, items)]
+
+    per_value = best(lambda: [normalize_swapi_data(item) for item in items], runs)
+    batch = best(lambda: normalize_swapi_batch(Person, items), runs)
+    search_sort = best(
+        lambda: apply_filters_and_sorting(Person, people, 'sky', 'height', 'desc'), runs
+    )
+    return {
+        'normalize_swapi_data': metric(per_value / rows * 1e6, 'µs/row'),
+        'normalize_swapi_batch': metric(batch / rows * 1e6, 'µs/row'),
+        'apply_filters_and_sorting': metric(search_sort * 1000, 'ms'),
+    }
+
+
+async def pages(calls: int) -> Metrics:
+    """Load the people from SWAPI (the stand-in), then time pages of the cached dataset."""
+    from api.models import Person
+    from api.utils.pagination import get_filtered_paginated_data
+
+    def fetch(query: dict[str, Any]):
+        return get_filtered_paginated_data(Person, 'people', **query)
+
+    started = time.perf_counter()
+    await fetch(PAGE_QUERIES[0])
+    cold = time.perf_counter() - started
+    for query in PAGE_QUERIES:  # Build the indexes
+        await fetch(query)
+
+    started = time.perf_counter()
+    for call in range(calls):
+        await fetch(PAGE_QUERIES[call % len(PAGE_QUERIES)])
+    warm = (time.perf_counter() - started) / calls
+
+    return {
+        'dataset_load': metric(cold * 1000, 'ms'),
+        'get_filtered_paginated_data': metric(warm * 1e6, 'µs'),
+    }
+
+
+def load_test(rows: int, requests: int, concurrency: int) -> Metrics:
+    result = load.run(requests, concurrency, rows)
+    return {
+        'load_rps': metric(result['rps'], 'req/s', better='higher'),
+        'load_p50': metric(result['p50_ms'], 'ms'),
+        'load_p95': metric(result['p95_ms'], 'ms'),
+        'load_p99': metric(result['p99_ms'], 'ms'),
+        'load_errors': metric(result['errors'], 'requests'),
+    }
+
+
+def commit() -> str | None:
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run(rows: int, requests: int, concurrency: int) -> dict[str, Any]:
+    """Run every benchmark, returning the settings of the run and the metrics."""
+    os.environ.update(load.ENVIRONMENT)
+
+    with FakeSwapi(rows) as fake:
+        os.environ['SWAPI_BASE_URL'] = fake.base_url
+        metrics = micro(rows) | asyncio.run(pages(calls=1_000))
+
+    metrics |= load_test(rows, requests, concurrency)
+    return {
+        'settings': {'rows': rows, 'requests': requests, 'concurrency': concurrency},
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'commit': commit(),
+            'time': datetime.now(UTC).isoformat(timespec='seconds'),
+        },
+        'metrics': metrics,
+    }
+
+
+def compare(baseline: Metrics, metrics: Metrics, tolerance: float) -> list[tuple[str, ...]]:
+    """
+    Compare metrics with a baseline.
+
+    Args:
+        baseline (Metrics): Metrics of the baseline run.
+        metrics (Metrics): Metrics of this run.
+        tolerance (float): Share a metric may be worse than its baseline by (e.g. 0.2).
+
+    Returns:
+        list[tuple[str, ...]]: Per metric of this run: its name, baseline and current values,
+        change, and status (`ok`, `improved`, `REGRESSED`, or `new` without a baseline).
+    """
+    rows = []
+    for name, current in metrics.items():
+        value = current['value']
+        if name not in baseline:
+            rows.append((name, '-', f'{value:g}', '-', 'new'))
+            continue
+
+        reference = baseline[name]['value']
+        # Positive when worse, as a share of the baseline
+        worse = (value - reference) if current['better'] == 'lower' else (reference - value)
+        share = worse / reference if reference else (1.0 if worse > 0 else 0.0)
+        status = 'REGRESSED' if share > tolerance else 'improved' if share < -tolerance else 'ok'
+        change = f'{(value - reference) / reference:+.1%}' if reference else '-'
+        rows.append((name, f'{reference:g}', f'{value:g}', change, status))
+    return rows
+
+
+def report(result: dict[str, Any], baseline: dict[str, Any] | None, tolerance: float) -> int:
+    """Print the metrics (against the baseline, if comparable), returning the regressions."""
+    settings = result['settings']
+    if baseline is not None and baseline['settings'] != settings:
+        print(f'Baseline not comparable (run with {baseline["settings"]}), skipping it.')
+        baseline = None
+
+    rows = compare(baseline['metrics'] if baseline else {}, result['metrics'], tolerance)
+    units = {name: metric['unit'] for name, metric in result['metrics'].items()}
+
+    print(f'{"metric":<30}{"unit":>9}{"baseline":>12}{"current":>12}{"change":>9}  status')
+    for name, reference, value, change, status in rows:
+        print(f'{name:<30}{units[name]:>9}{reference:>12}{value:>12}{change:>9}  {status}')
+
+    return sum(status == 'REGRESSED' for *_, status in rows)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().partition('\n\n')[0])
+    parser.add_argument('--rows', type=int, default=10_000, help='Rows per resource (≤1M)')
+    parser.add_argument('--requests', type=int, default=2_000, help='Load test requests')
+    parser.add_argument('--concurrency', type=int, default=16, help='Load test clients')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown share')
+    parser.add_argument('--save-baseline', action='store_true', help='Save as the baseline')
+    args = parser.parse_args()
+
+    result = run(args.rows, args.requests, args.concurrency)
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else None
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    LATEST.write_text(json.dumps(result, indent=2, ensure_ascii=False) + '\n')
+    regressions = report(result, None if args.save_baseline else baseline, args.tolerance)
+
+    if args.save_baseline:
+        BASELINE.write_text(LATEST.read_text())
+        print(f'Baseline saved to {BASELINE}')
+    elif regressions:
+        print(f'{regressions} metric(s) regressed by more than {args.tolerance:.0%}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+"""
+Synthetic SWAPI payloads, shaped like the upstream collections (raw strings, 'unknown'
+placeholders, URL lists), at any size.
+"""
+
+import random
+from datetime import UTC, datetime, timedelta
+
+BASE_URL = 'https://swapi.info/api'
+
+COLORS = ['blond', 'brown', 'black', 'white', 'grey', 'red', 'blue', 'yellow', 'n/a', 'none']
+GENDERS = ['male', 'female', 'n/a', 'hermaphrodite', 'none']
+CLIMATES = ['arid', 'temperate', 'tropical', 'frozen', 'murky', 'temperate, tropical']
+TERRAINS = ['desert', 'grasslands, mountains', 'jungle, rainforests', 'tundra, ice caves']
+SYLLABLES = ['lu', 'ke', 'sky', 'wal', 'ker', 'dar', 'th', 'va', 'der', 'le', 'ia', 'or', 'ga']
+
+
+def _name(rng: random.Random) -> str:
+    return ' '.join(
+        ''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).title()
+        for _ in range(rng.randint(1, 2))
+    )
+
+
+def _number(rng: random.Random, low: int, high: int) -> str:
+    return 'unknown' if rng.random() < 0.1 else f'{rng.randint(low, high):,}'
+
+
+def _timestamp(rng: random.Random) -> str:
+    moment = datetime(2014, 12, 9, tzinfo=UTC) + timedelta(seconds=rng.randint(0, 10**7))
+    return moment.isoformat(timespec='microseconds').replace('+00:00', 'Z')
+
+
+def _links(rng: random.Random, resource: str, high: int, k: int) -> list[str]:
+    return [f'{BASE_URL}/{resource}/{i}' for i in sorted(rng.sample(range(1, high), k))]
+
+
+def person(rng: random.Random, index: int) -> dict:
+    return {
+        'name': _name(rng),
+        'height': _number(rng, 60, 250),
+        'mass': _number(rng, 20, 1400),
+        'hair_color': rng.choice(COLORS),
+        'skin_color': rng.choice(COLORS),
+        'eye_color': rng.choice(COLORS),
+        'birth_year': rng.choice(['unknown', f'{rng.randint(8, 900)}BBY']),
+        'gender': rng.choice(GENDERS),
+        'homeworld': f'{BASE_URL}/planets/{rng.randint(1, 60)}',
+        'films': _links(rng, 'films', 7, rng.randint(1, 4)),
+        'species': _links(rng, 'species', 37, rng.randint(0, 1)),
+        'vehicles': _links(rng, 'vehicles', 39, rng.randint(0, 2)),
+        'starships': _links(rng, 'starships', 37, rng.randint(0, 2)),
+        'created': _timestamp(rng),
+        'edited': _timestamp(rng),
+        'url': f'{BASE_URL}/people/{index}',
+    }
+
+
+def planet(rng: random.Random, index: int) -> dict:
+    return {
+        'name': _name(rng),
+        'rotation_period': _number(rng, 10, 40),
+        'orbital_period': _number(rng, 200, 500),
+        'diameter': _number(rng, 1000, 20000),
+        'climate': rng.choice(CLIMATES),
+        'gravity': rng.choice(['1 standard', '0.9 standard', 'N/A', 'unknown']),
+        'terrain': rng.choice(TERRAINS),
+        'surface_water': _number(rng, 0, 100),
+        'population': _number(rng, 1000, 10**12),
+        'residents': _links(rng, 'people', 83, rng.randint(0, 5)),
+        'films': _links(rng, 'films', 7, rng.randint(0, 3)),
+        'created': _timestamp(rng),
+        'edited': _timestamp(rng),
+        'url': f'{BASE_URL}/planets/{index}',
+    }
+
+
+def film(rng: random.Random, index: int) -> dict:
+    release = datetime(1977, 5, 25) + timedelta(days=rng.randint(0, 20_000))
+    return {
+        'title': _name(rng),
+        'episode_id': index,
+        'opening_crawl': ' '.join(_name(rng) for _ in range(20)),
+        'director': _name(rng),
+        'producer': f'{_name(rng)}, {_name(rng)}',
+        'release_date': release.date().isoformat(),
+        'characters': _links(rng, 'people', 83, rng.randint(1, 20)),
+        'planets': _links(rng, 'planets', 61, rng.randint(1, 8)),
+        'starships': _links(rng, 'starships', 37, rng.randint(0, 8)),
+        'vehicles': _links(rng, 'vehicles', 39, rng.randint(0, 8)),
+        'species': _links(rng, 'species', 37, rng.randint(1, 8)),
+        'created': _timestamp(rng),
+        'edited': _timestamp(rng),
+        'url': f'{BASE_URL}/films/{index}',
+    }
+
+
+def species(rng: random.Random, index: int) -> dict:
+    return {
+        'name': _name(rng),
+        'classification': rng.choice(['mammal', 'reptile', 'artificial', 'amphibian', 'unknown']),
+        'designation': rng.choice(['sentient', 'reptilian']),
+        'average_height': _number(rng, 50, 300),
+        'skin_colors': rng.choice(COLORS),
+        'hair_colors': rng.choice(COLORS),
+        'eye_colors': rng.choice(COLORS),
+        'average_lifespan': rng.choice(['indefinite', _number(rng, 20, 1000)]),
+        'homeworld': rng.choice([None, f'{BASE_URL}/planets/{rng.randint(1, 60)}']),
+        'language': _name(rng),
+        'people': _links(rng, 'people', 83, rng.randint(0, 4)),
+        'films': _links(rng, 'films', 7, rng.randint(1, 3)),
+        'created': _timestamp(rng),
+        'edited': _timestamp(rng),
+        'url': f'{BASE_URL}/species/{index}',
+    }
+
+
+def _craft(rng: random.Random, resource: str, index: int) -> dict:
+    return {
+        'name': _name(rng),
+        'model': _name(rng),
+        'manufacturer': f'{_name(rng)} Corporation',
+        'cost_in_credits': _number(rng, 10_000, 10**9),
+        'length': f'{rng.uniform(3, 2000):.1f}',
+        'max_atmosphering_speed': rng.choice(['n/a', '1000km', _number(rng, 100, 1500)]),
+        'crew': rng.choice(['30-165', _number(rng, 1, 50_000)]),
+        'passengers': _number(rng, 0, 100_000),
+        'cargo_capacity': _number(rng, 0, 10**9),
+        'consumables': rng.choice(['0', '2 days', '2 months', '1 year', 'none', 'unknown']),
+        'pilots': _links(rng, 'people', 83, rng.randint(0, 3)),
+        'films': _links(rng, 'films', 7, rng.randint(1, 3)),
+        'created': _timestamp(rng),
+        'edited': _timestamp(rng),
+        'url': f'{BASE_URL}/{resource}/{index}',
+    }
+
+
+def vehicle(rng: random.Random, index: int) -> dict:
+    return {
+        **_craft(rng, 'vehicles', index),
+        'vehicle_class': rng.choice(['wheeled', 'repulsorcraft', 'airspeeder', 'walker']),
+    }
+
+
+def starship(rng: random.Random, index: int) -> dict:
+    return {
+        **_craft(rng, 'starships', index),
+        'hyperdrive_rating': rng.choice(['0.5', '1.0', '2.0', '4.0', 'unknown']),
+        'MGLT': _number(rng, 10, 120),
+        'starship_class': rng.choice(['Starfighter', 'corvette', 'Light freighter']),
+    }
+
+
+GENERATORS = {
+    'people': person,
+    'planets': planet,
+    'films': film,
+    'species': species,
+    'vehicles': vehicle,
+    'starships': starship,
+}
+
+
+def generate(resource: str, count: int, seed: int = 0) -> list[dict]:
+    """
+    Generate `count` raw SWAPI items for a resource.
+
+    Args:
+        resource (str): A SWAPI resource name (see `GENERATORS`).
+        count (int): Number of items.
+        seed (int): Random seed, so payloads are reproducible.
+
+    Returns:
+        list[dict]: Raw items, as returned by SWAPI.
+    """
+    rng = random.Random(seed)
+    return [GENERATORS[resource](rng, index) for index in range(1, count + 1)]
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from decouple import config as env
+
+# Where API responses are kept between runs (leave empty to disable the cache)
+CACHE_DIR = env('CLI_CACHE_DIR', default='~/.cache/starwars-cli')
+# Seconds a response is served without asking the API
+CACHE_TTL = env('CLI_CACHE_TTL', default=300, cast=float)
+# Size of the cache on disk, beyond which the least recently used responses are dropped
+CACHE_MAX_BYTES = env('CLI_CACHE_MAX_BYTES', default=20_000_000, cast=int)
+
+
+@dataclass
+class CachedResponse:
+    data: Any
+    etag: str | None
+    stored_at: float  # Unix time of the last response (200 or 304) from the API
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class ResponseCache:
+    """
+    API responses on disk, one file per request (URL, parameters and body format), so
+    repeated commands are answered without the API while fresh (`ttl`), and revalidated
+    with their ETag after.
+
+    Files are written next to their final path and renamed over it, so concurrent commands
+    always read complete entries. Reading an entry marks it as recently used (its mtime);
+    once the files exceed `max_bytes`, the least recently used ones are removed.
+    """
+
+    def __init__(self, directory: str | Path, ttl: float, max_bytes: int):
+        self.directory = Path(directory).expanduser()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def path(self, url: str, params: dict[str, Any], binary: bool = False) -> Path:
+        request = json.dumps([url, sorted(params.items()), binary], default=str)
+        return self.directory / f'{hashlib.sha256(request.encode()).hexdigest()[:32]}.json'
+
+    def get(self, url: str, params: dict[str, Any], binary: bool = False) -> CachedResponse | None:
+        """Return the cached response of a request (fresh or not), if any."""
+        path = self.path(url, params, binary)
+
+        try:
+            entry = json.loads(path.read_bytes())
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        return CachedResponse(entry['data'], entry.get('etag'), entry['stored_at'])
+
+    def put(
+        self, url: str, params: dict[str, Any], data: Any, etag: str | None, binary: bool = False
+    ) -> None:
+        """Store the response of a request, then evict entries beyond the size bound."""
+        path = self.path(url, params, binary)
+        body = json.dumps({'etag': etag, 'stored_at': time.time(), 'data': data}).encode()
+        temporary = None
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=path.parent, prefix='.', delete=False) as file:
+                temporary = Path(file.name)
+                file.write(body)
+            os.replace(temporary, path)
+        except OSError:
+            # A cache that cannot be written only costs requests
+            if temporary is not None:
+                temporary.unlink(missing_ok=True)
+            return
+
+        self.evict()
+
+    def touch(
+        self, url: str, params: dict[str, Any], cached: CachedResponse, binary: bool = False
+    ) -> None:
+        """Restart the freshness of an entry the API confirmed unchanged (a 304)."""
+        self.put(url, params, cached.data, cached.etag, binary)
+
+    def evict(self) -> None:
+        entries = []
+        for path in self.directory.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+response_cache = ResponseCache(CACHE_DIR, CACHE_TTL, CACHE_MAX_BYTES) if CACHE_DIR else None
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+
+import typer
+
+
+@dataclass(frozen=True)
+class CliResource:
+    """A resource listed by the CLI: `<name> list` shows `columns` of its items."""
+
+    name: str  # API endpoint (e.g., people)
+    description: str  # What the items are (e.g., Star Wars characters)
+    columns: tuple[str, ...]
+
+    @property
+    def title(self) -> str:
+        return self.name.title()
+
+
+RESOURCES = (
+    CliResource(
+        'people',
+        'Star Wars characters',
+        (
+            'name',
+            'height',
+            'mass',
+            'hair_color',
+            'skin_color',
+            'eye_color',
+            'birth_year',
+            'gender',
+        ),
+    ),
+    CliResource(
+        'planets',
+        'Star Wars planets',
+        (
+            'name',
+            'rotation_period',
+            'orbital_period',
+            'diameter',
+            'climate',
+            'gravity',
+            'terrain',
+            'surface_water',
+            'population',
+        ),
+    ),
+    CliResource(
+        'films',
+        'Star Wars films',
+        ('title', 'episode_id', 'director', 'producer', 'release_date'),
+    ),
+    CliResource(
+        'species',
+        'Star Wars species',
+        (
+            'name',
+            'classification',
+            'designation',
+            'average_height',
+            'average_lifespan',
+            'language',
+        ),
+    ),
+    CliResource(
+        'vehicles',
+        'Star Wars vehicles',
+        ('name', 'model', 'manufacturer', 'cost_in_credits', 'length', 'crew', 'vehicle_class'),
+    ),
+    CliResource(
+        'starships',
+        'Star Wars starships',
+        (
+            'name',
+            'model',
+            'manufacturer',
+            'cost_in_credits',
+            'length',
+            'crew',
+            'hyperdrive_rating',
+            'starship_class',
+        ),
+    ),
+)
+
+
+def resource_app(resource: CliResource) -> typer.Typer:
+    """
+    Build the commands of a resource (`list`).
+
+    Args:
+        resource (CliResource): The resource declaration.
+
+    Returns:
+        typer.Typer: The sub-application, to add under the resource name.
+    """
+    app = typer.Typer(rich_markup_mode=None)
+
+    @app.command('list', help=f'List {resource.description}.')
+    def list_resource(
+        page: int = typer.Option(1),
+        page_size: int = typer.Option(10),
+        search: str = typer.Option(None),
+        sort_by: str = typer.Option(None),
+        order: str = typer.Option('asc'),
+        offline: bool = typer.Option(False, help='Only show cached results.'),
+        refresh: bool = typer.Option(False, help='Ignore fresh cached results.'),
+        all_pages: bool = typer.Option(False, '--all', help='List every page.'),
+        format: str = typer.Option(
+            None, help='table (one page), json, ndjson (default with --all) or csv.'
+        ),
+    ):
+        from ..utils import list_entities  # Only commands that run pay for its imports
+
+        list_entities(
+            entity_name=resource.title,
+            endpoint=resource.name,
+            columns=list(resource.columns),
+            loading_message=f'Fetching {resource.name} from the API...',
+            page=page,
+            page_size=page_size,
+            search=search,
+            sort_by=sort_by,
+            order=order,
+            offline=offline,
+            refresh=refresh,
+            format=format,
+            all_pages=all_pages,
+        )
+
+    return app
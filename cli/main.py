@@ -1,12 +1,12 @@
 import typer
 
-from cli.commands.people import people_app
-from cli.commands.planets import planets_app
+from cli.commands.resources import RESOURCES, resource_app
 
-app = typer.Typer()
+# Plain help and errors: Rich only loads to render tables
+app = typer.Typer(rich_markup_mode=None)
 
-app.add_typer(people_app, name='people')
-app.add_typer(planets_app, name='planets')
+for resource in RESOURCES:
+    app.add_typer(resource_app(resource), name=resource.name)
 
 if __name__ == '__main__':
     app()
@@ -0,0 +1,55 @@
+"""
+Plain output of list results (no Rich), for pipelines: rows are written page by page as
+they arrive, so the memory used does not depend on how many there are.
+"""
+
+import csv
+import json
+from collections.abc import Callable, Iterable
+from typing import Any, TextIO
+
+Pages = Iterable[list[dict[str, Any]]]
+
+
+def write_json(pages: Pages, stream: TextIO) -> None:
+    """A JSON array of the rows, one per line."""
+    separator = '[\n'
+    for rows in pages:
+        for row in rows:
+            stream.write(separator + json.dumps(row, ensure_ascii=False))
+            separator = ',\n'
+        stream.flush()
+    stream.write('[]\n' if separator == '[\n' else '\n]\n')
+
+
+def write_ndjson(pages: Pages, stream: TextIO) -> None:
+    """One JSON object per line."""
+    for rows in pages:
+        stream.writelines(json.dumps(row, ensure_ascii=False) + '\n' for row in rows)
+        stream.flush()
+
+
+def write_csv(pages: Pages, stream: TextIO) -> None:
+    """
+    CSV with a header row of the fields of the first row, like the API exports: lists
+    (e.g. of film URLs) are joined with spaces, missing values are left empty.
+    """
+    writer, fields = csv.writer(stream, lineterminator='\n'), None
+
+    for rows in pages:
+        for row in rows:
+            if fields is None:
+                fields = list(row)
+                writer.writerow(fields)
+            writer.writerow(
+                ' '.join(map(str, value)) if isinstance(value, list) else value
+                for value in (row.get(field) for field in fields)
+            )
+        stream.flush()
+
+
+WRITERS: dict[str, Callable[[Pages, TextIO], None]] = {
+    'json': write_json,
+    'ndjson': write_ndjson,
+    'csv': write_csv,
+}
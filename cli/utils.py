@@ -1,17 +1,48 @@
+"""
+Helpers of the CLI commands. httpx, msgpack and Rich are imported by the functions that
+use them, so that starting the CLI (e.g. `--help`) does not pay for them.
+"""
+
+import atexit
 import json
+import math
+import sys
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Any
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
-import httpx
 import typer
 from decouple import config as env
-from rich.box import ROUNDED
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.text import Text
 
-console = Console()
+from cli.cache import response_cache
+from cli.output import WRITERS
+
+if TYPE_CHECKING:
+    import httpx
+    from rich.console import Console
+
+MSGPACK = 'application/msgpack'
+# Fetch lists as MessagePack instead of JSON
+BINARY_RESPONSES = env('CLI_BINARY_RESPONSES', default=False, cast=bool)
+
+# Pages requested at once when listing every page
+CONCURRENCY = env('CLI_CONCURRENCY', default=4, cast=int)
+# Largest page size the API serves (used to list every page)
+MAX_PAGE_SIZE = 100
+
+# Shared by the requests of the process (see `get_client`)
+_client: 'httpx.Client | None' = None
+
+
+@cache
+def get_console() -> 'Console':
+    """Return the Rich console of the CLI."""
+    from rich.console import Console
+
+    return Console()
 
 
 def render_table(title: str, data: list[dict], columns: list[str]) -> None:
@@ -28,6 +59,9 @@ def render_table(title: str, data: list[dict], columns: list[str]) -> None:
         """Render cell values, replacing None with '---'."""
         return str(value) if value is not None else '---'
 
+    from rich.box import ROUNDED
+    from rich.table import Table
+
     table = Table(title=title, show_lines=True, box=ROUNDED)
 
     for column in columns:
@@ -37,7 +71,7 @@ def render_table(title: str, data: list[dict], columns: list[str]) -> None:
         row = [display(item.get(col)) for col in columns]
         table.add_row(*row)
 
-    console.print(table)
+    get_console().print(table)
 
 
 @contextmanager
@@ -49,6 +83,7 @@ def clean_status(message: str, spinner: str = 'aesthetic'):
         message (str): Loading message.
         spinner (str): Spinner style (default: 'aesthetic').
     """
+    console = get_console()
     status = console.status(message, spinner=spinner)
     status.start()
     try:
@@ -66,6 +101,9 @@ def show_error(message: str, code: int) -> None:
         message (str): Error text.
         code (int): Exit code.
     """
+    from rich.panel import Panel
+    from rich.text import Text
+
     text = Text(message)
     panel = Panel(
         text,
@@ -73,11 +111,11 @@ def show_error(message: str, code: int) -> None:
         title_align='left',
         border_style='red',
     )
-    console.print(panel)
+    get_console().print(panel)
     raise typer.Exit(code=code)
 
 
-def handle_http_error(exc: httpx.HTTPStatusError, code: int) -> None:
+def handle_http_error(exc: 'httpx.HTTPStatusError', code: int) -> None:
     """
     Handle HTTP errors and show detailed API response if available.
 
@@ -94,26 +132,151 @@ def handle_http_error(exc: httpx.HTTPStatusError, code: int) -> None:
     show_error(message, code)
 
 
-def safe_get(url: str, params: dict[str, Any]) -> dict[str, Any] | None:
+def get_client() -> 'httpx.Client':
+    """Return the HTTP client shared by every request of the process (keeping connections)."""
+    import httpx
+
+    global _client
+
+    if _client is None:
+        _client = httpx.Client(timeout=5.0)
+        atexit.register(_client.close)
+    return _client
+
+
+def request(url: str, params: dict[str, Any], binary: bool = False, etag: str | None = None):
     """
-    Safely perform an HTTP GET request with error handling.
+    Perform an HTTP GET request with the shared client.
 
     Args:
         url (str): Full API URL.
         params (dict): Query parameters.
+        binary (bool): Ask for MessagePack instead of JSON.
+        etag (str | None): ETag of a cached response, to get a `304 Not Modified` if current.
 
     Returns:
-        dict | None: Response JSON or None on error.
+        httpx.Response: The response (successful, or a 304).
+
+    Raises:
+        httpx.RequestError: If the API cannot be reached.
+        httpx.HTTPStatusError: If the API answers with an error.
     """
-    try:
-        response = httpx.get(url, params=params, timeout=5.0)
+    headers = {'Accept': MSGPACK} if binary else {}
+    if etag:
+        headers['If-None-Match'] = etag
+
+    response = get_client().get(url, params=params, headers=headers)
+    if response.status_code != 304:
         response.raise_for_status()
-        return response.json()
+    return response
+
+
+def decode(response: 'httpx.Response') -> Any:
+    if response.headers.get('content-type', '').startswith(MSGPACK):
+        import msgpack
+
+        return msgpack.unpackb(response.content)
+    return response.json()
+
+
+def safe_get(
+    url: str,
+    params: dict[str, Any],
+    binary: bool = False,
+    offline: bool = False,
+    refresh: bool = False,
+) -> dict[str, Any] | None:
+    """
+    Safely perform an HTTP GET request with error handling, through the response cache:
+    fresh responses are served from disk, stale ones revalidated with their ETag.
+
+    Args:
+        url (str): Full API URL.
+        params (dict): Query parameters.
+        binary (bool): Ask for MessagePack instead of JSON (smaller, faster to decode).
+        offline (bool): Only serve cached responses (however old), never calling the API.
+        refresh (bool): Ask the API even if the cached response is fresh.
+
+    Returns:
+        dict | None: Response JSON (or MessagePack) or None on error.
+    """
+    cache = response_cache
+    cached = cache.get(url, params, binary) if cache else None
+
+    if cached is not None and (offline or (not refresh and cached.age <= cache.ttl)):
+        return cached.data
+    if offline:
+        show_error(f'No cached response for {url} (run the command online first)', code=1)
+
+    import httpx
+
+    try:
+        response = request(url, params, binary, etag=cached.etag if cached else None)
     except httpx.RequestError as e:
         show_error(f'Connection error: {e}', code=1)
     except httpx.HTTPStatusError as e:
         handle_http_error(e, 2)
 
+    if response.status_code == 304:
+        cache.touch(url, params, cached, binary)
+        return cached.data
+
+    data = decode(response)
+    if cache:
+        cache.put(url, params, data, response.headers.get('etag'), binary)
+    return data
+
+
+def iter_pages(
+    url: str, params: dict[str, Any], concurrency: int = CONCURRENCY, **options: Any
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield every page of a list, in order. After the first one (which tells how many there
+    are), up to `concurrency` pages are requested at once, and no more are held: memory
+    stays flat whatever the size of the collection.
+
+    Args:
+        url (str): Full API URL of the list.
+        params (dict): Query parameters, with the `page_size`.
+        concurrency (int): Pages requested at once.
+        **options: Options of `safe_get` (e.g. `offline`).
+
+    Yields:
+        dict: The pages, as returned by the API.
+    """
+    first = safe_get(url, {**params, 'page': 1}, **options)
+    if not first:
+        return
+    yield first
+
+    pages = math.ceil(first['count'] / params['page_size'])
+    pending: deque[Future] = deque()
+
+    with ThreadPoolExecutor(max(1, concurrency)) as pool:
+        try:
+            for page in range(2, pages + 1):
+                pending.append(pool.submit(safe_get, url, {**params, 'page': page}, **options))
+                if len(pending) >= concurrency:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def stream_entities(
+    url: str, params: dict[str, Any], format: str, all_pages: bool, **options: Any
+) -> None:
+    """Write the rows of a list page (or of every page) to stdout, without Rich."""
+    if all_pages:
+        pages = iter_pages(url, {**params, 'page_size': MAX_PAGE_SIZE}, **options)
+    else:
+        data = safe_get(url, params, **options)
+        pages = [data] if data else []
+
+    WRITERS[format]((page['results'] for page in pages), sys.stdout)
+
 
 def list_entities(
     entity_name: str,
@@ -125,6 +288,10 @@ def list_entities(
     search: str | None,
     sort_by: str | None,
     order: str,
+    offline: bool = False,
+    refresh: bool = False,
+    format: str | None = None,
+    all_pages: bool = False,
 ):
     """
     Generic CLI handler to list SWAPI resources.
@@ -139,7 +306,17 @@ def list_entities(
         search (str): optional name-based filter.
         sort_by (str): optional attribute to sort by.
         order (str): asc or desc (default asc).
+        offline (bool): only show cached results, without calling the API.
+        refresh (bool): call the API even if cached results are fresh.
+        format (str): table (default for a page), or json, ndjson (default with
+            `all_pages`) or csv, streamed to stdout without Rich.
+        all_pages (bool): list every page (in pages of the largest size, fetched
+            concurrently) instead of `page`.
     """
+    format = format or ('ndjson' if all_pages else 'table')
+    if format not in ('table', *WRITERS) or (all_pages and format == 'table'):
+        show_error(f"Invalid format '{format}': use table (one page), json, ndjson or csv", 2)
+
     params = {
         'page': page,
         'page_size': page_size,
@@ -149,9 +326,15 @@ def list_entities(
     }
 
     params = {k: v for k, v in params.items() if v is not None}
+    url = f'{env("INTERNAL_API_BASE_URL")}/{endpoint}/'
+    options = {'binary': BINARY_RESPONSES, 'offline': offline, 'refresh': refresh}
+
+    if format != 'table':
+        stream_entities(url, params, format, all_pages, **options)
+        return
 
     with clean_status(loading_message):
-        data = safe_get(f'{env("INTERNAL_API_BASE_URL")}/{endpoint}/', params)
+        data = safe_get(url, params, **options)
 
     if data:
         render_table(entity_name, data['results'], columns)
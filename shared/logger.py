@@ -1,29 +1,145 @@
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from decouple import Csv
 from decouple import config as env
 
 LOG_DIR = Path(__file__).resolve().parent.parent / 'logs'
 LOG_DIR.mkdir(exist_ok=True)
 
+# Write logs from a background thread, so callers (e.g. the event loop) never wait on I/O
+LOG_QUEUE = env('LOG_QUEUE', default=True, cast=bool)
+# Log lines as text, or as JSON objects (one per line)
+LOG_FORMAT = env('LOG_FORMAT', default='text')
+# Share of the records below WARNING kept per logger, e.g. `api.requests=0.1`
+LOG_SAMPLING = {
+    name.strip(): float(rate)
+    for name, _, rate in (
+        pair.partition('=') for pair in env('LOG_SAMPLING', default='', cast=Csv())
+    )
+}
 
-def get_logger(name: str) -> logging.Logger:
-    LOG_FILE = LOG_DIR / f'{name}.log'
-    logger = logging.getLogger(name)
+TEXT_FORMAT = '%(asctime)s|%(levelname)s|%(name)s => %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as JSON objects: time, level, logger and message (and exception)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created, UTC).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep a share (`rate`) of the records below WARNING, evenly spread (e.g. one in ten),
+    for messages logged on hot paths. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+        self.credit = 1.0 - rate  # The first record is kept
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        self.credit += self.rate
+        if self.credit < 1:
+            return False
+        self.credit -= 1
+        return True
+
+
+class LocalQueueHandler(QueueHandler):
+    """
+    Hand records to a queue as they are: unlike `QueueHandler`, the message is not
+    formatted by the caller (the queue never leaves the process), but by the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def close(self) -> None:
+        """Stop the listener once it wrote the queued records (at exit, by `logging`)."""
+        listener, self.listener = getattr(self, 'listener', None), None
+        if listener is not None:
+            listener.stop()
+        super().close()
 
-    logger.setLevel(env('LOG_LEVEL').upper())
-    logger.propagate = False  # Avoid duplicate logging in console
 
-    if not logger.handlers:
-        formatter = logging.Formatter('%(asctime)s|%(levelname)s|%(name)s => %(message)s')
+def create_handlers(name: str, format: str = LOG_FORMAT) -> list[logging.Handler]:
+    """Build the handlers writing a logger's records: its rotating file and the console."""
+    formatter = JsonFormatter() if format == 'json' else logging.Formatter(TEXT_FORMAT)
+
+    file_handler = RotatingFileHandler(LOG_DIR / f'{name}.log', maxBytes=5_000_000, backupCount=3)
+    console_handler = logging.StreamHandler()
+
+    for handler in (file_handler, console_handler):
+        handler.setFormatter(formatter)
+    return [file_handler, console_handler]
+
+
+def configure_logger(
+    logger: logging.Logger, queued: bool = LOG_QUEUE, format: str = LOG_FORMAT
+) -> QueueListener | None:
+    """
+    Replace the handlers of a logger: written directly, or through a queue by a background
+    thread (stopped, after writing what is left, when the handler is closed: at exit).
+
+    Returns:
+        QueueListener | None: The listener of the queue, if any.
+    """
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+
+    handlers = create_handlers(logger.name, format)
+    if not queued:
+        for handler in handlers:
+            logger.addHandler(handler)
+        return None
+
+    handler = LocalQueueHandler(queue.SimpleQueue())
+    handler.listener = QueueListener(handler.queue, *handlers, respect_handler_level=True)
+    handler.listener.start()
+
+    logger.addHandler(handler)
+    return handler.listener
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Return a logger of the application, writing to `logs/<name>.log` and the console.
+
+    Dotted names (e.g. `api.requests`) are children of the logger before the dot: their
+    records go to its handlers. Give them to hot-path messages, so that they can be sampled
+    (see `LOG_SAMPLING`) without affecting the others.
+    """
+    logger = logging.getLogger(name)
+    parent, _, _ = name.partition('.')
 
-        file_handler = RotatingFileHandler(LOG_FILE, maxBytes=5_000_000, backupCount=3)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+    if parent != name:
+        get_logger(parent)
+    else:
+        logger.setLevel(env('LOG_LEVEL').upper())
+        logger.propagate = False  # Avoid duplicate logging in console
+        if not logger.handlers:
+            configure_logger(logger)
 
-        console_handler = logging.StreamHandler()
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+    if name in LOG_SAMPLING and not logger.filters:
+        logger.addFilter(SamplingFilter(LOG_SAMPLING[name]))
 
     return logger
@@ -0,0 +1,107 @@
+import json
+from collections.abc import Callable
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services import swapi_proxy
+from api.services.dataset_cache import dataset_cache
+from api.services.resilience import swapi_resilience
+from api.utils import pagination
+from benchmarks.synthetic import GENERATORS, generate
+from cli import utils as cli_utils
+
+# Recorded SWAPI payloads: a subset of each collection (17 people, 14 planets, 4 of the
+# others), kept small so the suite stays fast and offline. It was picked to keep the
+# real edge cases: 'unknown', 'n/a' and 'none' placeholders, comma-grouped numbers,
+# decimals, and an item named 'unknown' (planets/28, dropped). Synthetic payloads
+# (`benchmarks.synthetic`) cover the same at scale.
+FIXTURES = Path(__file__).parent / 'fixtures' / 'swapi'
+
+
+@pytest.fixture(autouse=True)
+def clear_dataset_cache():
+    dataset_cache.clear()
+    yield
+    dataset_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_resilience():
+    swapi_resilience.reset()
+    yield
+    swapi_resilience.reset()
+
+
+@pytest.fixture(autouse=True)
+def disable_disk_datasets(monkeypatch):
+    monkeypatch.setattr(pagination, 'SNAPSHOT_DIR', '')
+    monkeypatch.setattr(pagination, 'shared_datasets', None)
+
+
+@pytest.fixture(autouse=True)
+def disable_cli_cache(monkeypatch):
+    monkeypatch.setattr(cli_utils, 'response_cache', None)
+
+
+def serve_swapi(monkeypatch, collection: Callable[[str], list[dict] | None]) -> list[str]:
+    """
+    Serve SWAPI offline (`/<resource>` and `/<resource>/<id>`) from `collection`, which
+    gives the items of a resource (None if unknown), recording the requested paths (e.g.
+    `people`, `films/1`). Responses go through the production fetch and normalization.
+    """
+    requests: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip('/').split('/')
+        resource, id = (parts[-2], parts[-1]) if parts[-1].isdigit() else (parts[-1], '')
+        requests.append(f'{resource}/{id}'.rstrip('/'))
+
+        items = collection(resource)
+        if items is None:
+            return httpx.Response(404)
+        if not id:
+            return httpx.Response(200, json=items)
+
+        found = [item for item in items if item['url'].rstrip('/').endswith(f'/{resource}/{id}')]
+        return httpx.Response(200, json=found[0]) if found else httpx.Response(404)
+
+    monkeypatch.setattr(
+        swapi_proxy,
+        'create_swapi_client',
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    return requests
+
+
+@pytest.fixture
+def swapi_stand_in(monkeypatch):
+    """Serve SWAPI offline from `tests/fixtures/swapi` (see `serve_swapi`)."""
+
+    def collection(resource: str) -> list[dict] | None:
+        path = FIXTURES / f'{resource}.json'
+        return json.loads(path.read_text()) if path.exists() else None
+
+    return serve_swapi(monkeypatch, collection)
+
+
+@pytest.fixture
+def synthetic_rows():
+    """Items per resource of `synthetic_swapi` (override it in a module to change it)."""
+    return 150
+
+
+@pytest.fixture
+def synthetic_swapi(monkeypatch, synthetic_rows):
+    """Serve SWAPI offline with `synthetic_rows` synthetic items per resource."""
+    payloads = {resource: generate(resource, synthetic_rows) for resource in GENERATORS}
+    return serve_swapi(monkeypatch, payloads.get)
+
+
+@pytest.fixture
+def client(synthetic_swapi):
+    """Test client of the API, against `synthetic_swapi`."""
+    return TestClient(app)
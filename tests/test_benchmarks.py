@@ -0,0 +1,54 @@
+import json
+
+import httpx
+import pytest
+
+from api.main import app
+from benchmarks import load
+from benchmarks.fake_swapi import FIXTURES, FakeSwapi
+from benchmarks.suite import compare
+
+
+def test_fake_swapi_serves_recorded_fixtures():
+    expected = json.loads((FIXTURES / 'people.json').read_text())
+
+    with FakeSwapi(fixtures=FIXTURES) as fake:
+        assert httpx.get(f'{fake.base_url}/people').json() == expected
+        assert httpx.get(f'{fake.base_url}/people/1').json()['name'] == 'Luke Skywalker'
+        assert httpx.get(f'{fake.base_url}/unknown').status_code == 404
+
+
+def test_fake_swapi_generates_synthetic_rows():
+    with FakeSwapi(rows=250) as fake:
+        assert len(httpx.get(f'{fake.base_url}/planets').json()) == 250
+
+
+@pytest.mark.asyncio
+async def test_load_driver_reports_latency_percentiles(swapi_stand_in):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        result = await load.drive(client, requests=40, concurrency=4)
+
+    assert result['requests'] == 40
+    assert result['errors'] == 0
+    assert 0 < result['p50_ms'] <= result['p95_ms'] <= result['p99_ms']
+
+
+def test_compare_flags_metrics_worse_than_the_tolerance():
+    baseline = {
+        'latency': {'value': 10.0, 'unit': 'ms', 'better': 'lower'},
+        'rps': {'value': 100.0, 'unit': 'req/s', 'better': 'higher'},
+        'errors': {'value': 0, 'unit': 'requests', 'better': 'lower'},
+    }
+    metrics = {
+        'latency': {'value': 12.5, 'unit': 'ms', 'better': 'lower'},
+        'rps': {'value': 130.0, 'unit': 'req/s', 'better': 'higher'},
+        'errors': {'value': 0, 'unit': 'requests', 'better': 'lower'},
+        'added': {'value': 1.0, 'unit': 'ms', 'better': 'lower'},
+    }
+
+    statuses = {row[0]: row[-1] for row in compare(baseline, metrics, tolerance=0.2)}
+
+    assert statuses == {'latency': 'REGRESSED', 'rps': 'improved', 'errors': 'ok', 'added': 'new'}
+    metrics['errors']['value'] = 1
+    assert compare(baseline, metrics, tolerance=0.2)[2][-1] == 'REGRESSED'
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from api.services.dataset import Dataset
+from api.services.dataset_cache import DatasetCache
+
+
+class DummyPerson(BaseModel):
+    name: str
+
+
+def make_fetch(calls: list[str], delay: float = 0.0):
+    async def fetch(model_class, resource, previous):
+        calls.append(resource)
+        await asyncio.sleep(delay)
+        return Dataset.from_records(resource, model_class, [{'name': f'{resource}-{len(calls)}'}])
+
+    return fetch
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_after_miss():
+    cache = DatasetCache(ttl=60, stale_ttl=60)
+    calls = []
+    fetch = make_fetch(calls)
+
+    first = await cache.get(DummyPerson, 'people', fetch)
+    second = await cache.get(DummyPerson, 'people', fetch)
+
+    assert first is second
+    assert calls == ['people']
+    assert (cache.stats.misses, cache.stats.hits, cache.stats.refreshes) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_coalesce():
+    cache = DatasetCache(ttl=60, stale_ttl=60)
+    calls = []
+    fetch = make_fetch(calls, delay=0.01)
+
+    results = await asyncio.gather(*(cache.get(DummyPerson, 'people', fetch) for _ in range(5)))
+
+    assert calls == ['people']
+    assert all(result is results[0] for result in results)
+    assert cache.stats.misses == 5
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing():
+    cache = DatasetCache(ttl=0, stale_ttl=60)
+    calls = []
+    fetch = make_fetch(calls, delay=0.01)
+
+    first = await cache.get(DummyPerson, 'people', fetch)
+    stale = await cache.get(DummyPerson, 'people', fetch)
+    await cache.get(DummyPerson, 'people', fetch)  # joins the running refresh
+
+    assert stale is first
+    assert cache.stats.stale_hits == 2
+
+    await asyncio.sleep(0.05)
+    refreshed = await cache.get(DummyPerson, 'people', fetch)
+
+    assert calls == ['people', 'people']
+    assert refreshed.version > first.version
+    assert refreshed.rows([0])[0].name == 'people-2'
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_stale_entry():
+    cache = DatasetCache(ttl=0, stale_ttl=60)
+    first = await cache.get(DummyPerson, 'people', make_fetch([]))
+
+    async def failing_fetch(model_class, resource, previous):
+        raise RuntimeError('upstream down')
+
+    assert await cache.get(DummyPerson, 'people', failing_fetch) is first
+    await asyncio.sleep(0.01)
+
+    assert cache.stats.refresh_errors == 1
+    assert await cache.get(DummyPerson, 'people', failing_fetch) is first
+    await asyncio.sleep(0.01)
+
+    assert cache.stats.refresh_errors == 2
+    await asyncio.sleep(0.01)
+
+    assert cache.stats.refresh_errors == 2
+
+
+@pytest.mark.asyncio
+async def test_unchanged_refresh_keeps_version():
+    cache = DatasetCache(ttl=0, stale_ttl=60)
+    first = await cache.get(DummyPerson, 'people', make_fetch([]))
+
+    async def unchanged(model_class, resource, previous):
+        return previous
+
+    await cache.get(DummyPerson, 'people', unchanged)
+    await asyncio.sleep(0.01)
+    refreshed = await cache.get(DummyPerson, 'people', unchanged)
+
+    assert refreshed.version == first.version
+    assert refreshed.fetched_at > first.fetched_at
+    assert cache.stats.rows_changed == 1  # Only the first load
+    assert cache.stats.last_rows_changed == {'people': 0}
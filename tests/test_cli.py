@@ -1,11 +1,110 @@
+import os
+import time
+
+import httpx
+import msgpack
+import pytest
+import typer
 from typer.testing import CliRunner
 
+from cli import utils
+from cli.cache import ResponseCache
 from cli.main import app
+from cli.utils import MSGPACK, safe_get
 
 runner = CliRunner()
 
+PAGE = {'count': 1, 'results': [{'name': 'Luke Skywalker'}]}
+URL = 'http://api/people/'
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Serve `PAGE` with an ETag through the shared client, recording the request headers."""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request.headers)
+        if request.headers.get('If-None-Match') == '"v1"':
+            return httpx.Response(304, headers={'ETag': '"v1"'})
+        if request.headers.get('Accept') == MSGPACK:
+            return httpx.Response(
+                200, content=msgpack.packb(PAGE), headers={'Content-Type': MSGPACK}
+            )
+        return httpx.Response(200, json=PAGE, headers={'ETag': '"v1"'})
+
+    monkeypatch.setattr(utils, '_client', httpx.Client(transport=httpx.MockTransport(handler)))
+    return requests
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = ResponseCache(tmp_path, ttl=60, max_bytes=1_000_000)
+    monkeypatch.setattr(utils, 'response_cache', cache)
+    return cache
+
 
 def test_cli_help():
     result = runner.invoke(app, ['--help'])
     assert result.exit_code == 0
     assert 'Usage:' in result.output
+
+
+def test_safe_get_binary(api):
+    assert safe_get(URL, {}, binary=True) == PAGE
+    assert safe_get(URL, {}) == PAGE
+    assert [headers.get('Accept') for headers in api] == [MSGPACK, '*/*']
+
+
+def test_fresh_responses_are_served_from_disk(api, cache):
+    assert safe_get(URL, {'page': 1}) == PAGE
+    assert safe_get(URL, {'page': 1}) == PAGE
+    assert len(api) == 1
+
+    assert safe_get(URL, {'page': 2}) == PAGE  # Another request
+    assert safe_get(URL, {'page': 1}, refresh=True) == PAGE
+    assert len(api) == 3
+
+
+def test_stale_responses_are_revalidated(api, cache):
+    safe_get(URL, {})
+    cache.ttl = 0.5
+    time.sleep(0.6)
+
+    assert safe_get(URL, {}) == PAGE
+    assert api[-1]['If-None-Match'] == '"v1"'
+    assert cache.get(URL, {}).age < 0.5  # Fresh again
+
+
+def test_offline_mode(api, cache):
+    with pytest.raises(typer.Exit):
+        safe_get(URL, {}, offline=True)
+
+    safe_get(URL, {})
+    cache.ttl = 0
+    assert safe_get(URL, {}, offline=True) == PAGE
+    assert len(api) == 1
+
+
+def test_least_recently_used_responses_are_evicted(tmp_path):
+    cache = ResponseCache(tmp_path, ttl=60, max_bytes=350)
+    for page in range(3):
+        cache.put(URL, {'page': page}, PAGE, None)
+        used = time.time() - 10 + page
+        os.utime(cache.path(URL, {'page': page}), (used, used))
+    cache.get(URL, {'page': 0})  # Used again
+    cache.put(URL, {'page': 3}, PAGE, None)
+
+    kept = [page for page in range(4) if cache.get(URL, {'page': page})]
+    assert kept == [0, 2, 3]
+    assert sum(path.stat().st_size for path in tmp_path.glob('*.json')) <= 350
+
+
+def test_list_command_uses_the_cache(api, cache, monkeypatch):
+    monkeypatch.setenv('INTERNAL_API_BASE_URL', 'http://api')
+
+    for flags in ([], [], ['--offline']):
+        result = runner.invoke(app, ['people', 'list', *flags])
+        assert result.exit_code == 0, result.output
+        assert 'Luke' in result.output
+    assert len(api) == 1
@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+import threading
+import time
+
+import httpx
+import pytest
+from typer.testing import CliRunner
+
+from cli import utils
+from cli.main import app
+from cli.output import WRITERS
+from cli.utils import iter_pages
+
+runner = CliRunner()
+
+ROWS = [{'name': f'Person {i}', 'height': i, 'films': [f'f{i}', 'f0']} for i in range(1, 251)]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """Serve `ROWS` in pages (later pages answer first), recording the peak concurrency."""
+    state = {'active': 0, 'peak': 0, 'pages': []}
+    lock = threading.Lock()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page, size = int(request.url.params['page']), int(request.url.params['page_size'])
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            state['pages'].append(page)
+        time.sleep(0.02 / page)
+        with lock:
+            state['active'] -= 1
+        results = ROWS[(page - 1) * size : page * size]
+        return httpx.Response(200, json={'count': len(ROWS), 'results': results})
+
+    monkeypatch.setattr(utils, '_client', httpx.Client(transport=httpx.MockTransport(handler)))
+    monkeypatch.setenv('INTERNAL_API_BASE_URL', 'http://api')
+    return state
+
+
+@pytest.mark.parametrize('concurrency', [1, 3])
+def test_pages_are_prefetched_in_order(api, concurrency):
+    params = {'page_size': 20}
+    pages = list(iter_pages('http://api/people/', params, concurrency=concurrency))
+
+    assert [row for page in pages for row in page['results']] == ROWS
+    assert sorted(api['pages']) == list(range(1, 14))
+    assert api['peak'] <= concurrency
+
+
+def test_prefetch_is_bounded_by_the_consumer(api):
+    pages = iter_pages('http://api/people/', {'page_size': 10}, concurrency=2)
+    next(pages), next(pages)
+    time.sleep(0.05)
+
+    assert len(api['pages']) <= 1 + 2 + 1  # The first page, those held and one in flight
+    pages.close()
+
+
+def test_writers():
+    pages = [ROWS[:2], [], ROWS[2:3]]
+
+    for name, parse in (
+        ('json', json.loads),
+        ('ndjson', lambda text: [json.loads(line) for line in text.splitlines()]),
+    ):
+        stream = io.StringIO()
+        WRITERS[name](iter(pages), stream)
+        assert parse(stream.getvalue()) == ROWS[:3], name
+
+    stream = io.StringIO()
+    WRITERS['csv'](iter(pages), stream)
+    rows = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert [row['name'] for row in rows] == ['Person 1', 'Person 2', 'Person 3']
+    assert rows[0]['films'] == 'f1 f0'
+
+    stream = io.StringIO()
+    WRITERS['json'](iter([]), stream)
+    assert json.loads(stream.getvalue()) == []
+
+
+def test_list_all_streams_every_row(api):
+    result = runner.invoke(app, ['people', 'list', '--all'])
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+    assert sorted(api['pages']) == [1, 2, 3]  # Pages of the largest size
+
+
+def test_list_page_as_csv(api):
+    result = runner.invoke(app, ['planets', 'list', '--page', '2', '--format', 'csv'])
+
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[1].startswith('Person 11,11,')
+
+
+def test_list_all_needs_a_streamed_format(api):
+    result = runner.invoke(app, ['people', 'list', '--all', '--format', 'table'])
+    assert result.exit_code == 2
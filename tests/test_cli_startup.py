@@ -0,0 +1,13 @@
+from benchmarks.bench_cli_startup import HEAVY_MODULES, IMPORT_BUDGET, import_time, import_times
+
+
+def test_help_does_not_import_heavy_dependencies():
+    imported = import_times('-m', 'cli.main', 'people', 'list', '--help')
+
+    assert 'cli.commands.resources' in imported
+    assert [module for module in HEAVY_MODULES if module in imported] == []
+    assert 'cli.utils' not in imported
+
+
+def test_cli_import_time_is_within_budget():
+    assert import_time(runs=3) <= IMPORT_BUDGET
@@ -0,0 +1,36 @@
+import pytest
+from pydantic import ValidationError
+
+from api.models import Person, Planet
+from api.utils.columnar import ColumnStore, DatetimeColumn, NumberColumn, StringListColumn
+from api.utils.filters import normalize_swapi_data
+from benchmarks.synthetic import generate
+
+
+@pytest.mark.parametrize('model_class, resource', [(Person, 'people'), (Planet, 'planets')])
+def test_rows_match_validated_models(model_class, resource):
+    records = list(filter(None, map(normalize_swapi_data, generate(resource, 200))))
+    store = ColumnStore.from_records(model_class, records)
+
+    assert len(store) == len(records)
+    assert [store.row(i) for i in range(len(store))] == [model_class(**r) for r in records]
+
+
+def test_columns_are_compact():
+    records = list(filter(None, map(normalize_swapi_data, generate('people', 50))))
+    store = ColumnStore.from_records(Person, records)
+
+    assert isinstance(store.columns['height'], NumberColumn)
+    assert isinstance(store.columns['created'], DatetimeColumn)
+    assert isinstance(store.columns['films'], StringListColumn)
+    # Every URL column shares a single table
+    assert store.columns['films'].table is store.columns['homeworld'].table
+
+
+def test_store_from_models_and_invalid_values():
+    models = [Planet(**normalize_swapi_data(item)) for item in generate('planets', 5)]
+    assert ColumnStore.from_records(Planet, models).row(3) == models[3]
+
+    bad = normalize_swapi_data(generate('planets', 1)[0]) | {'diameter': 'huge'}
+    with pytest.raises(ValidationError):
+        ColumnStore.from_records(Planet, [bad])
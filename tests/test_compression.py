@@ -0,0 +1,88 @@
+import gzip
+
+import brotli
+import msgpack
+import pytest
+
+from api.utils.compression import choose_coding
+from api.utils.serialization import wants_msgpack
+
+PARAMS = {'page_size': 100, 'sort_by': 'name'}
+
+
+def raw_get(client, path, params, **headers):
+    """GET without decoding the body (the test client decompresses responses)."""
+    with client.stream('GET', path, params=params, headers=headers) as response:
+        return response, b''.join(response.iter_raw())
+
+
+@pytest.mark.parametrize(
+    'accept_encoding, coding',
+    [
+        ('gzip, deflate, br', 'br'),
+        ('gzip', 'gzip'),
+        ('br;q=0.5, gzip', 'gzip'),
+        ('*', 'br'),
+        ('identity', None),
+        ('br;q=0, gzip;q=0', None),
+        ('', None),
+    ],
+)
+def test_choose_coding(accept_encoding, coding):
+    assert choose_coding(accept_encoding) == coding
+
+
+@pytest.mark.parametrize(
+    'accept, binary',
+    [
+        ('application/msgpack', True),
+        ('application/x-msgpack', True),
+        ('application/msgpack, application/json;q=0.5', True),
+        ('application/json, application/msgpack;q=0.5', False),
+        ('*/*', False),
+        (None, False),
+    ],
+)
+def test_wants_msgpack(accept, binary):
+    assert wants_msgpack(accept) is binary
+
+
+@pytest.mark.parametrize(
+    'coding, decompress', [('gzip', gzip.decompress), ('br', brotli.decompress)]
+)
+def test_large_lists_are_compressed(client, coding, decompress):
+    plain, body = raw_get(client, '/people/', PARAMS, **{'Accept-Encoding': 'identity'})
+    response, compressed = raw_get(client, '/people/', PARAMS, **{'Accept-Encoding': coding})
+
+    assert response.headers['content-encoding'] == coding
+    assert 'Accept-Encoding' in response.headers['vary']
+    assert len(compressed) < len(body) / 3
+    assert decompress(compressed) == body
+    assert response.headers['etag'] == plain.headers['etag'][:-1] + f'-{coding}"'
+
+    # Either tag revalidates the list
+    for etag in (response.headers['etag'], plain.headers['etag']):
+        again, _ = raw_get(client, '/people/', PARAMS, **{'If-None-Match': etag})
+        assert again.status_code == 304
+
+
+def test_small_responses_and_streams_are_not_compressed(client):
+    response, _ = raw_get(client, '/people/', {'page_size': 1}, **{'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in response.headers
+
+    export, _ = raw_get(client, '/people/export', {}, **{'Accept-Encoding': 'gzip'})
+    assert 'content-encoding' not in export.headers
+
+
+def test_msgpack_lists(client):
+    params = {**PARAMS, 'facets': 'gender'}
+    json_body = client.get('/people/', params=params).json()
+    response = client.get('/people/', params=params, headers={'Accept': 'application/msgpack'})
+
+    assert response.headers['content-type'] == 'application/msgpack'
+    assert msgpack.unpackb(response.content) == json_body
+
+    plain = client.get('/planets/', params=PARAMS)
+    binary = client.get('/planets/', params=PARAMS, headers={'Accept': 'application/msgpack'})
+    assert msgpack.unpackb(binary.content) == plain.json()
+    assert binary.headers['etag'] != plain.headers['etag']
@@ -0,0 +1,74 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.dataset_cache import dataset_cache
+from api.utils import conditional
+
+
+@pytest.fixture
+def client(synthetic_swapi):
+    """
+    The shared client, but asking for uncompressed bodies: compressed representations
+    have their own entity tags (e.g. `"people-3-ab12-br"`, see test_compression), and
+    these tests compare the tags of the uncompressed ones.
+    """
+    return TestClient(app, headers={'Accept-Encoding': 'identity'})
+
+
+def test_list_has_validators(client):
+    response = client.get('/people/', params={'search': 'a'})
+
+    assert response.status_code == 200
+    assert response.headers['etag'].startswith('"people-')
+    # Fresh until the dataset is refreshed
+    directives, max_age = response.headers['cache-control'].split(', max-age=')
+    assert directives == 'public'
+    assert dataset_cache.ttl - 5 <= int(max_age) <= dataset_cache.ttl
+
+
+def test_etag_follows_the_normalized_query(client):
+    etag = client.get('/people/').headers['etag']
+
+    assert client.get('/people/', params={'page': 1, 'order': 'asc'}).headers['etag'] == etag
+    assert client.get('/people/', params={'page': 2}).headers['etag'] != etag
+    assert client.get('/people/', params={'filter': 'mass>50'}).headers['etag'] != etag
+    assert client.get('/planets/').headers['etag'] != etag
+
+
+def test_not_modified_skips_the_page(client, monkeypatch):
+    etag = client.get('/planets/', params={'sort_by': 'diameter'}).headers['etag']
+
+    def fail(*args, **kwargs):
+        raise AssertionError('The page should not be built')
+
+    monkeypatch.setattr('api.routers.resources.get_page', fail)
+
+    for header in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+        response = client.get(
+            '/planets/', params={'sort_by': 'diameter'}, headers={'If-None-Match': header}
+        )
+        assert response.status_code == 304
+        assert response.content == b''
+        assert response.headers['etag'] == etag
+
+
+def test_stale_etag_gets_the_body(client, synthetic_swapi):
+    etag = client.get('/people/').headers['etag']
+    dataset_cache.clear()  # The next request loads a new version
+
+    response = client.get('/people/', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.json()['results']
+    assert response.headers['etag'] != etag
+    assert synthetic_swapi == ['people', 'people']
+
+
+def test_configured_cache_control(client, monkeypatch):
+    monkeypatch.setattr(conditional, 'HTTP_CACHE_CONTROL', 'private')
+    monkeypatch.setattr(conditional, 'HTTP_MAX_AGE', 60)
+    assert client.get('/films/').headers['cache-control'] == 'private, max-age=60'
+
+    monkeypatch.setattr(conditional, 'HTTP_CACHE_CONTROL', '')
+    assert 'cache-control' not in client.get('/films/').headers
@@ -0,0 +1,172 @@
+from datetime import UTC, datetime
+from itertools import product
+
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from api.models import Person
+from api.services.dataset_cache import dataset_cache
+from api.utils import pagination
+from api.utils.cursor import Cursor
+from api.utils.filters import apply_filters_and_sorting
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.pagination import get_page, load_dataset
+from benchmarks.synthetic import generate
+
+ITEMS = generate('people', 230, seed=3)
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Serve normalized synthetic people, replaceable through the returned list."""
+    payload = [ITEMS]
+
+    async def fetch(model_class, resource, validate=True):
+        return normalize_swapi_batch(model_class, payload[0])
+
+    monkeypatch.setattr(pagination, 'fetch_swapi_data', fetch)
+    monkeypatch.setattr(pagination, 'INCREMENTAL_REFRESH', False)
+    return payload
+
+
+async def walk(page_size=17, search=None, sort_by=None, order='asc', pages=None):
+    """Follow next_cursor from the first page, returning the names of every page."""
+    result = await get_page(Person, 'people', 1, page_size, search, sort_by, order)
+    names = [[row.name for row in result.dataset.rows(result.positions)]]
+
+    while result.next_cursor and (pages is None or len(names) < pages):
+        result = await get_page(
+            Person, 'people', 99, page_size, 'x', 'mass', 'asc', cursor=result.next_cursor
+        )
+        names.append([row.name for row in result.dataset.rows(result.positions)])
+
+    return names, result
+
+
+def test_cursor_round_trip():
+    cursor = Cursor(7, 3, 'sky', 'edited', 'desc', datetime(2014, 12, 9, tzinfo=UTC), 12)
+    assert Cursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize(
+    'token', ['', 'not-a-cursor', 'e30', Cursor(1, 2, None, None, 'up', None, 0).encode()]
+)
+def test_invalid_cursors_are_rejected(token):
+    with pytest.raises(ValueError):
+        Cursor.decode(token)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    'search, sort_by, order',
+    list(product([None, 'ka'], [None, 'name', 'height', 'edited'], ['asc', 'desc'])),
+)
+async def test_cursor_walk_matches_offset_pages(upstream, search, sort_by, order):
+    names, last = await walk(search=search, sort_by=sort_by, order=order)
+    models = [Person(**item) for item in normalize_swapi_batch(Person, ITEMS)]
+    expected = [p.name for p in apply_filters_and_sorting(Person, models, search, sort_by, order)]
+
+    assert [name for page in names for name in page] == expected
+    assert all(len(page) == 17 for page in names[:-1])
+    assert last.next_cursor is None
+    assert last.page == len(names)
+
+    page = min(3, len(names))
+    offset = await get_page(Person, 'people', page, 17, search, sort_by, order)
+    assert [row.name for row in offset.dataset.rows(offset.positions)] == names[page - 1]
+
+
+async def walk_from(cursor):
+    names = []
+    while cursor:
+        result = await get_page(Person, 'people', 1, 17, None, None, None, cursor=cursor)
+        names.append([row.name for row in result.dataset.rows(result.positions)])
+        cursor = result.next_cursor
+    return names
+
+
+@pytest.mark.asyncio
+async def test_walk_stays_on_its_version_during_a_refresh(upstream):
+    expected, _ = await walk(sort_by='name')
+    first, result = await walk(sort_by='name', pages=2)
+
+    upstream[0] = generate('people', 50, seed=4)
+    refreshed = await dataset_cache.refresh(Person, 'people', load_dataset)
+    assert len(refreshed) == 50
+
+    assert first + await walk_from(result.next_cursor) == expected
+
+
+@pytest.mark.asyncio
+async def test_expired_version_resumes_by_key_on_the_current_one(upstream):
+    _, result = await walk(sort_by='height', pages=1)
+    cursor = Cursor.decode(result.next_cursor)
+
+    dataset_cache.keep_versions = 1
+    try:
+        await dataset_cache.refresh(Person, 'people', load_dataset)
+    finally:
+        dataset_cache.keep_versions = 3
+
+    resumed = await get_page(Person, 'people', 1, 5, None, None, None, cursor=result.next_cursor)
+    heights = resumed.dataset.store.columns['height']
+
+    assert resumed.dataset.version > cursor.version
+    assert all(
+        (heights[p] is None, heights[p] or 0, p)
+        > (cursor.key is None, cursor.key or 0, cursor.position)
+        for p in resumed.positions
+    )
+
+
+class Ranked(BaseModel):
+    name: str
+    grade: int | str | None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('order', ['asc', 'desc'])
+async def test_cursor_resumes_by_key_when_its_row_is_deleted(monkeypatch, order):
+    # Grades mix numbers and words: only the rows matching 'a' (numbers) are comparable
+    items = [
+        {'name': f'a{i:02d}', 'grade': 'unknown' if i % 9 == 0 else str(i * 7 % 30)}
+        for i in range(40)
+    ]
+    items += [{'name': f'z{i}', 'grade': f'g{i}'} for i in range(10)]
+    payload = [items]
+
+    async def fetch(model_class, resource, validate=True):
+        return normalize_swapi_batch(model_class, payload[0])
+
+    monkeypatch.setattr(pagination, 'fetch_swapi_data', fetch)
+    monkeypatch.setattr(pagination, 'INCREMENTAL_REFRESH', False)
+
+    models = [Ranked(**row) for row in normalize_swapi_batch(Ranked, items)]
+    expected = [row.name for row in apply_filters_and_sorting(Ranked, models, 'a', 'grade', order)]
+
+    result = await get_page(Ranked, 'ranked', 1, 7, 'a', 'grade', order)
+    names = [row.name for row in result.dataset.rows(result.positions)]
+
+    # The last row of the page disappears, with the version the cursor walks on
+    payload[0] = [item for item in items if item['name'] != names[-1]]
+    monkeypatch.setattr(dataset_cache, 'keep_versions', 1)
+    await dataset_cache.refresh(Ranked, 'ranked', load_dataset)
+
+    while result.next_cursor:
+        result = await get_page(Ranked, 'ranked', 1, 7, None, None, None, result.next_cursor)
+        names += [row.name for row in result.dataset.rows(result.positions)]
+
+    assert names == expected
+
+
+@pytest.mark.asyncio
+async def test_cursor_errors_are_bad_requests(upstream):
+    with pytest.raises(HTTPException) as error:
+        await get_page(Person, 'people', 1, 5, None, None, None, cursor='garbage')
+    assert error.value.status_code == 400
+
+    bad = Cursor(1, 2, None, 'films', 'asc', None, 0).encode()
+    with pytest.raises(HTTPException) as error:
+        await get_page(Person, 'people', 1, 5, None, None, None, cursor=bad)
+    assert error.value.status_code == 400
@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.models import Person, Planet
+from api.utils import expand
+from api.utils.filters import normalize_swapi_data
+from benchmarks.synthetic import generate
+
+DATA = {resource: generate(resource, 150) for resource in ('people', 'planets')}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Stub SWAPI, recording single item fetches and the most ever in flight."""
+    calls = {'items': [], 'in_flight': 0, 'max_in_flight': 0}
+
+    async def mock_fetch(model_class, resource, **kwargs):
+        return list(filter(None, map(normalize_swapi_data, DATA[resource])))
+
+    async def mock_fetch_item(resource, id):
+        calls['items'].append(f'{resource}/{id}')
+        calls['in_flight'] += 1
+        calls['max_in_flight'] = max(calls['max_in_flight'], calls['in_flight'])
+        await asyncio.sleep(0.001)
+        calls['in_flight'] -= 1
+
+        if id == '3':
+            raise httpx.HTTPStatusError('Not found', request=None, response=None)
+        return {'title': f'{resource} {id}'}
+
+    monkeypatch.setattr('api.utils.pagination.fetch_swapi_data', mock_fetch)
+    monkeypatch.setattr(expand, 'fetch_swapi_item', mock_fetch_item)
+    return calls
+
+
+@pytest.fixture
+def client(upstream):
+    return TestClient(app)
+
+
+def test_expand_from_cached_collection(client, upstream):
+    plain = client.get('/people/?page_size=100').json()
+    expanded = client.get('/people/?page_size=100&expand=homeworld').json()
+
+    planets = {
+        planet['url']: planet for planet in client.get('/planets/?page_size=100').json()['results']
+    }
+    planets.update(
+        {
+            planet['url']: planet
+            for planet in client.get('/planets/?page=2&page_size=100').json()['results']
+        }
+    )
+
+    assert upstream['items'] == []
+    assert len(expanded['results']) == 100
+    for row, person in zip(plain['results'], expanded['results'], strict=True):
+        assert person['homeworld'] == planets[row['homeworld']]
+        assert {**person, 'homeworld': row['homeworld']} == row
+
+
+def test_expand_fetches_each_link_once(client, upstream, monkeypatch):
+    monkeypatch.setattr(expand, 'EXPAND_CONCURRENCY', 2)
+    # Resolve films and species one by one, as if they had no cached collection
+    monkeypatch.setattr(expand, 'COLLECTIONS', {'people': Person, 'planets': Planet})
+
+    response = client.get('/people/?page_size=100&expand=films,species')
+    results = response.json()['results']
+
+    links = {
+        url for row in results for url in (*row['films'], *row['species']) if isinstance(url, str)
+    }
+    embedded = [item for row in results for item in row['films'] if isinstance(item, dict)]
+
+    assert response.status_code == 200
+    assert len(upstream['items']) == len(set(upstream['items']))
+    assert 1 <= upstream['max_in_flight'] <= 2
+    assert all(url.endswith('/3') for url in links)  # Failed fetches stay links
+    assert {'title': 'films 1'} in embedded
+
+
+def test_expand_planet_residents(client, upstream):
+    results = client.get('/planets/?page_size=20&expand=residents').json()['results']
+    residents = [resident for row in results for resident in row['residents']]
+
+    assert residents
+    assert all(isinstance(resident, dict) and 'height' in resident for resident in residents)
+
+
+def test_expand_leaves_links_when_collection_fails(client, monkeypatch):
+    async def mock_fetch(model_class, resource, **kwargs):
+        if resource == 'planets':
+            raise httpx.HTTPStatusError('Not found', request=None, response=None)
+        return list(filter(None, map(normalize_swapi_data, DATA[resource])))
+
+    monkeypatch.setattr('api.utils.pagination.fetch_swapi_data', mock_fetch)
+
+    plain = client.get('/people/?page_size=20').json()
+    response = client.get('/people/?page_size=20&expand=homeworld')
+
+    assert response.status_code == 200
+    assert response.json()['results'] == plain['results']
+
+
+@pytest.mark.parametrize('value', ['name', 'homeworld,url', 'residents'])
+def test_invalid_expand(client, value):
+    response = client.get('/people/', params={'expand': value})
+    assert response.status_code == 400
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+
+import pytest
+
+from api.models import Person, Planet
+from api.services.dataset_cache import dataset_cache
+from api.utils import export
+from api.utils.filters import apply_filters_and_sorting
+
+
+@pytest.mark.parametrize(
+    'model_class, resource, query',
+    [
+        (Person, 'people', {}),
+        (Person, 'people', {'search': 'sky', 'sort_by': 'height', 'order': 'desc'}),
+        (Planet, 'planets', {'sort_by': 'population'}),
+        (Planet, 'planets', {'search': 'no such name'}),
+    ],
+)
+def test_ndjson_export_matches_filtering(client, model_class, resource, query):
+    response = client.get(f'/{resource}/export', params=query)
+
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/x-ndjson'
+    assert f'filename="{resource}.ndjson"' in response.headers['content-disposition']
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    expected = apply_filters_and_sorting(
+        model_class,
+        dataset_cache.peek(resource).rows(range(len(dataset_cache.peek(resource)))),
+        query.get('search'),
+        query.get('sort_by'),
+        query.get('order', 'asc'),
+    )
+    assert rows == [row.model_dump(mode='json') for row in expected]
+
+
+def test_csv_export(client):
+    response = client.get('/planets/export', params={'format': 'csv', 'sort_by': 'name'})
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/csv')
+
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == list(Planet.model_fields)
+    assert len(rows) == 1 + len(dataset_cache.peek('planets'))
+    assert [row[0] for row in rows[1:]] == sorted(row[0] for row in rows[1:])
+
+
+def test_empty_csv_export_has_header(client):
+    response = client.get('/people/export', params={'format': 'csv', 'search': 'no such name'})
+    assert response.text.splitlines() == [','.join(Person.model_fields)]
+
+
+def test_export_is_chunked(client):
+    client.get('/people/export')  # Warm the cache
+    dataset = dataset_cache.peek('people')
+
+    chunks = list(export.ndjson_chunks(dataset, range(len(dataset)), 40))
+
+    assert len(chunks) == 4
+    assert [chunk.count(b'\n') for chunk in chunks] == [40, 40, 40, 30]
+
+
+@pytest.mark.parametrize('query', [{'sort_by': 'films'}, {'format': 'xml'}, {'order': 'up'}])
+def test_invalid_export_queries(client, query):
+    assert client.get('/people/export', params=query).status_code in (400, 422)
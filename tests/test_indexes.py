@@ -0,0 +1,48 @@
+from itertools import product
+
+from pydantic import BaseModel
+
+from api.services.dataset import Dataset
+from api.utils.filters import apply_filters_and_sorting
+from api.utils.indexes import get_sort_index, select_page
+
+
+class DummyPerson(BaseModel):
+    name: str
+    height: int | None
+    gender: str | None
+
+
+DATA = [
+    DummyPerson(name='Luke', height=172, gender='male'),
+    DummyPerson(name='Leia', height=150, gender='female'),
+    DummyPerson(name='R2-D2', height=None, gender=None),
+    DummyPerson(name='Han', height=180, gender='male'),
+    DummyPerson(name='Yoda', height=66, gender='male'),
+    DummyPerson(name='C-3PO', height=None, gender=None),
+    DummyPerson(name='Padme', height=165, gender='female'),
+]
+
+
+def test_sort_index_matches_apply_filters_and_sorting():
+    dataset = Dataset.from_records('people', DummyPerson, DATA, version=1)
+
+    for field, order in product(['name', 'height', 'gender'], ['asc', 'desc']):
+        expected = apply_filters_and_sorting(DummyPerson, DATA, sort_by=field, order=order)
+        index = get_sort_index(dataset, field)
+
+        assert dataset.rows(index.order(order)) == expected, (field, order)
+
+
+def test_sort_index_is_built_once_per_dataset():
+    dataset = Dataset.from_records('people', DummyPerson, DATA, version=1)
+
+    assert get_sort_index(dataset, 'height') is get_sort_index(dataset, 'height')
+
+
+def test_select_page_with_matches():
+    order = [4, 1, 6, 0, 3, 2, 5]
+
+    assert select_page(order, None, 2, 4) == [6, 0]
+    assert select_page(order, {0, 1, 3, 5}, 1, 3) == [0, 3]
+    assert select_page(order, {0, 1}, 5, 10) == []
@@ -0,0 +1,108 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from shared import logger as logger_module
+from shared.logger import SamplingFilter, configure_logger, get_logger
+
+
+class Recorder(logging.Handler):
+    """Records the formatted messages, and the threads that wrote them."""
+
+    def __init__(self):
+        super().__init__()
+        self.messages, self.threads = [], set()
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+        self.threads.add(threading.current_thread())
+
+
+class Counted:
+    def __init__(self):
+        self.threads = []
+
+    def __str__(self):
+        self.threads.append(threading.current_thread())
+        return 'counted'
+
+
+@pytest.fixture
+def recorder(monkeypatch, tmp_path):
+    recorder = Recorder()
+    monkeypatch.setattr(logger_module, 'LOG_DIR', tmp_path)
+    monkeypatch.setattr(logger_module, 'create_handlers', lambda name, format: [recorder])
+    return recorder
+
+
+def test_queued_records_are_formatted_and_written_in_the_background(recorder):
+    logger = logging.getLogger('test_queued')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    assert configure_logger(logger, queued=True) is not None
+    value = Counted()
+
+    logger.debug('skipped %s', value)
+    logger.info('page=%s value=%s', 2, value)
+    logger.handlers[0].close()
+
+    assert recorder.messages == ['page=2 value=counted']
+    assert threading.current_thread() not in recorder.threads
+    assert value.threads == list(recorder.threads)  # Formatted by the listener
+
+
+def test_direct_records_are_written_by_the_caller(recorder):
+    logger = logging.getLogger('test_direct')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    assert configure_logger(logger, queued=False) is None
+
+    logger.info('page=%s', 3)
+    assert recorder.messages == ['page=3']
+    assert recorder.threads == {threading.current_thread()}
+
+
+def test_json_lines(monkeypatch, tmp_path):
+    monkeypatch.setattr(logger_module, 'LOG_DIR', tmp_path)
+    logger = logging.getLogger('test_json')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    configure_logger(logger, queued=False, format='json')
+
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        logger.exception('failed %s', 'twice')
+    for handler in logger.handlers:
+        handler.close()
+
+    entry = json.loads((tmp_path / 'test_json.log').read_text())
+    assert entry['level'] == 'ERROR' and entry['logger'] == 'test_json'
+    assert entry['message'] == 'failed twice'
+    assert 'ValueError: boom' in entry['exception']
+
+
+def test_sampling_keeps_a_share_of_the_records():
+    sampling = SamplingFilter(0.25)
+    info = logging.LogRecord('api', logging.INFO, '', 0, 'hot', (), None)
+    warning = logging.LogRecord('api', logging.WARNING, '', 0, 'hot', (), None)
+
+    assert sum(sampling.filter(info) for _ in range(100)) == 25
+    assert all(sampling.filter(warning) for _ in range(10))
+
+
+def test_child_loggers_are_sampled_into_their_parent(recorder, monkeypatch):
+    monkeypatch.setattr(logger_module, 'LOG_SAMPLING', {'test_parent.hot': 0.5})
+
+    hot = get_logger('test_parent.hot')
+    parent = logging.getLogger('test_parent')
+    parent.setLevel(logging.INFO)
+    for page in range(4):
+        hot.info('page=%s', page)
+    parent.info('cold')
+    for handler in parent.handlers:
+        handler.close()
+
+    assert recorder.messages == ['page=0', 'page=2', 'cold']
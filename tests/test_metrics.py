@@ -0,0 +1,133 @@
+import asyncio
+import copy
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.models import Person
+from api.services.dataset_cache import dataset_cache
+from api.services.resilience import swapi_resilience
+from api.utils import metrics
+from api.utils.metrics import REQUEST_SECONDS, STAGE_SECONDS, Histogram, family, timed
+from api.utils.pagination import load_dataset
+from benchmarks.fake_swapi import FakeSwapi
+from benchmarks.synthetic import generate
+from tests.conftest import serve_swapi
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics():
+    STAGE_SECONDS.clear()
+    REQUEST_SECONDS.clear()
+
+
+def values(text: str) -> dict[str, float]:
+    """Parse the samples of a Prometheus exposition (comments skipped)."""
+    samples = re.findall(r'^([^#\s][^ ]*) (\S+)$', text, re.MULTILINE)
+    return {name: float(value) for name, value in samples}
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('latency_seconds', 'Latency.', ('stage',), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, 'fetch')
+
+    samples = values('\n'.join(histogram.render()))
+    assert samples['latency_seconds_bucket{stage="fetch",le="0.1"}'] == 2
+    assert samples['latency_seconds_bucket{stage="fetch",le="1.0"}'] == 3
+    assert samples['latency_seconds_bucket{stage="fetch",le="+Inf"}'] == 4
+    assert samples['latency_seconds_sum{stage="fetch"}'] == pytest.approx(3.65)
+    assert samples['latency_seconds_count{stage="fetch"}'] == 4
+
+
+def test_labels_are_escaped():
+    lines = list(family('info', 'Info.', [({'name': 'a "b"\\c'}, 1)]))
+    assert lines[-1] == 'info{name="a \\"b\\"\\\\c"} 1'
+
+
+def test_timed_measures_blocks_and_functions():
+    @timed('sync')
+    def double(value):
+        return value * 2
+
+    @timed('async')
+    async def triple(value):
+        return value * 3
+
+    with timed('block'):
+        pass
+
+    assert double(2) == 4
+    assert asyncio.run(triple(2)) == 6
+    assert double.__name__ == 'double'
+    assert [STAGE_SECONDS.count(stage) for stage in ('block', 'sync', 'async')] == [1, 1, 1]
+
+
+def test_timed_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(metrics, 'METRICS', False)
+    with timed('off'):
+        pass
+    assert STAGE_SECONDS.count('off') == 0
+
+
+def test_metrics_cover_the_request_path(swapi_stand_in):
+    client = TestClient(app)
+    assert client.get('/people/', params={'sort_by': 'name', 'search': 'sky'}).status_code == 200
+    assert client.get('/people/', params={'sort_by': 'height'}).status_code == 200
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+
+    samples = values(response.text)
+    for stage in ('fetch', 'normalize', 'filter', 'sort', 'paginate', 'validate', 'serialize'):
+        assert samples[f'api_stage_duration_seconds_count{{stage="{stage}"}}'] >= 1, stage
+    assert samples['api_stage_duration_seconds_count{stage="fetch"}'] == 1
+    assert samples['api_stage_duration_seconds_count{stage="serialize"}'] == 2
+
+    route = 'method="GET",route="/people/",status="200"'
+    assert samples[f'api_request_duration_seconds_count{{{route}}}'] == 2
+
+    assert samples['api_dataset_cache_lookups_total{result="miss"}'] == 1
+    assert samples['api_dataset_cache_lookups_total{result="hit"}'] == 1
+    assert samples['api_dataset_cache_hit_ratio{}'] == 0.5
+    assert samples['api_dataset_rows{resource="people"}'] > 0
+    assert samples['api_upstream_events_total{event="attempts"}'] == 1
+    assert samples['api_upstream_breaker_state{state="closed"}'] == 1
+
+
+def test_metrics_count_upstream_errors(monkeypatch):
+    with FakeSwapi(rows=10) as fake:
+        monkeypatch.setenv('SWAPI_BASE_URL', fake.base_url)
+        monkeypatch.setattr(swapi_resilience, 'backoff', 0.001)
+        fake.fail_next = 2
+
+        client = TestClient(app)
+        assert client.get('/planets/').status_code == 200
+        assert client.get('/unknown/').status_code == 404
+
+    samples = values(client.get('/metrics').text)
+    assert samples['api_upstream_errors_total{error="503"}'] == 2
+    assert samples['api_upstream_events_total{event="retries"}'] == 2
+    unmatched = 'method="GET",route="unmatched",status="404"'
+    assert samples[f'api_request_duration_seconds_count{{{unmatched}}}'] == 1
+
+
+def test_metrics_count_rows_changed_by_refreshes(monkeypatch):
+    items = generate('people', 20)
+    serve_swapi(monkeypatch, lambda resource: items if resource == 'people' else None)
+    client = TestClient(app)
+    assert client.get('/people/').status_code == 200
+
+    items = copy.deepcopy(items)
+    for item in items[:3]:
+        item['name'] += ' II'
+        item['edited'] = '2030-01-01T00:00:00.000000Z'
+    refreshed = asyncio.run(dataset_cache.refresh(Person, 'people', load_dataset))
+
+    samples = values(client.get('/metrics').text)
+    assert refreshed.rows_changed == 3
+    assert samples['api_dataset_rows_changed_total{resource="people"}'] == 23
+    assert samples['api_dataset_last_refresh_rows_changed{resource="people"}'] == 3
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from api.resources import RESOURCES
+from api.utils.filters import normalize_swapi_data, normalize_value
+from api.utils.normalization import CONVERTERS, normalize_swapi_batch
+from benchmarks.synthetic import generate
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'swapi'  # A subset (see conftest)
+
+TRICKY_VALUES = [
+    '',
+    '  ',
+    'unknown',
+    ' N/A ',
+    'None',
+    '172',
+    ' -5 ',
+    '+3.5',
+    '1,358',
+    '1_000',
+    '1e5',
+    '.5',
+    '5.',
+    'inf',
+    '-Infinity',
+    'nan',
+    '١٢',
+    '0x10',
+    '19BBY',
+    '41.9BBY',
+    '1 standard',
+    'white, blue',
+    '20141209',
+    '2014-12-09',
+    '2014-12-09T13:50:51.644000Z',
+    '2014-12-09T13:50:51Z',
+    '2014-12-09T13:50:51.644+02:00',
+    '2014-02-30T10:00:00Z',
+    '2014-12-09T24:00:00Z',
+    'https://swapi.info/api/planets/1',
+    ' https://swapi.info/api/planets/1 ',
+    None,
+    42,
+    ['https://swapi.info/api/films/1'],
+]
+
+
+@pytest.mark.parametrize('kind', sorted(CONVERTERS))
+def test_converters_match_normalize_value(kind):
+    convert = CONVERTERS[kind]
+
+    for value in TRICKY_VALUES:
+        # Compare type and repr: tells 5 from 5.0 and lets nan equal itself
+        result, expected = convert(value), normalize_value(value)
+        assert (type(result), repr(result)) == (type(expected), repr(expected)), (kind, value)
+
+
+@pytest.mark.parametrize('resource', RESOURCES.values(), ids=list(RESOURCES))
+def test_batch_matches_normalize_swapi_data(resource):
+    payloads = [
+        json.loads((FIXTURES / f'{resource.name}.json').read_text()),
+        generate(resource.name, 500),
+    ]
+
+    for items in payloads:
+        expected = [
+            row for row in (normalize_swapi_data(item, resource.model) for item in items) if row
+        ]
+        assert expected
+        assert normalize_swapi_batch(resource.model, items) == expected
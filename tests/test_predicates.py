@@ -0,0 +1,139 @@
+import operator
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.models import Person, Planet
+from api.services.dataset import Dataset
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.predicates import filter_rows, parse_filter
+from benchmarks.synthetic import generate
+
+PEOPLE = Dataset.from_records(
+    'people', Person, normalize_swapi_batch(Person, generate('people', 500))
+)
+PLANETS = Dataset.from_records(
+    'planets', Planet, normalize_swapi_batch(Planet, generate('planets', 500))
+)
+
+
+def fold(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+def reference(dataset, field, check):
+    """Positions of the rows whose value passes `check`, by scanning the models."""
+    rows = dataset.rows(range(len(dataset)))
+    return {i for i, row in enumerate(rows) if check(getattr(row, field))}
+
+
+def present(compare, bound):
+    return lambda value: value is not None and compare(value, bound)
+
+
+@pytest.mark.parametrize(
+    'dataset, expression, field, check',
+    [
+        (PLANETS, 'population>1000000000', 'population', present(operator.gt, 10**9)),
+        (PLANETS, 'population >= 5000', 'population', present(operator.ge, 5000)),
+        (PLANETS, 'diameter<5000', 'diameter', present(operator.lt, 5000)),
+        (PLANETS, 'surface_water<=10.5', 'surface_water', present(operator.le, 10.5)),
+        (PLANETS, 'climate=ARID', 'climate', lambda value: value == 'arid'),
+        (PEOPLE, 'height=150..190', 'height', lambda v: v is not None and 150 <= v <= 190),
+        (PEOPLE, 'gender=male|female', 'gender', lambda value: value in ('male', 'female')),
+        (PEOPLE, 'hair_color=none', 'hair_color', lambda value: value is None),
+        (PEOPLE, 'hair_color!=none', 'hair_color', lambda value: value is not None),
+        (PEOPLE, 'eye_color!=blue', 'eye_color', lambda value: value not in (None, 'blue')),
+        (PEOPLE, 'mass=77', 'mass', lambda value: value == 77),
+        (
+            PEOPLE,
+            'created>2015-01-01T00:00:00Z',
+            'created',
+            lambda value: value.isoformat() > '2015-01-01T00:00:00+00:00',
+        ),
+        (
+            PEOPLE,
+            'created<2015-01-01',  # A date, taken as UTC
+            'created',
+            lambda value: value.isoformat() < '2015-01-01T00:00:00+00:00',
+        ),
+        (PLANETS, 'climate>m', 'climate', present(operator.gt, 'm')),  # Ordered as sorted
+    ],
+)
+def test_filter_matches_scan(dataset, expression, field, check):
+    predicates = parse_filter(dataset.model_class, expression)
+    assert filter_rows(dataset, predicates) == reference(dataset, field, lambda v: check(fold(v)))
+
+
+def test_clauses_are_combined():
+    predicates = parse_filter(Person, 'height>150, gender=male, mass<=100')
+    rows = PEOPLE.rows(sorted(filter_rows(PEOPLE, predicates)))
+
+    assert rows
+    assert all(row.height > 150 and row.gender == 'male' and row.mass <= 100 for row in rows)
+
+
+@pytest.mark.parametrize(
+    'expression',
+    [
+        'films=https://swapi.info/api/films/1',  # Not a scalar field
+        'weight>3',  # Not a field
+        'height>tall',  # Not a number
+        'height>unknown',  # No bound
+        'height',  # No operator
+        'gravity>1',  # Values of mixed types
+    ],
+)
+def test_invalid_filters(expression):
+    model_class = Planet if expression.startswith('gravity') else Person
+    dataset = PLANETS if model_class is Planet else PEOPLE
+
+    with pytest.raises(HTTPException) as error:
+        filter_rows(dataset, parse_filter(model_class, expression))
+    assert error.value.status_code == 400
+
+
+def test_filtered_cursor_walk(client):
+    params = {'filter': 'height=150..190', 'sort_by': 'mass', 'page_size': 7}
+    response = client.get('/people/', params=params).json()
+    count, heights = response['count'], [row['height'] for row in response['results']]
+
+    while response['next_cursor']:
+        response = client.get('/people/', params={'cursor': response['next_cursor']}).json()
+        heights += [row['height'] for row in response['results']]
+
+    assert len(heights) == count
+    assert all(150 <= height <= 190 for height in heights)
+
+
+def test_filter_errors_are_400(client):
+    response = client.get('/planets/', params={'filter': 'residents=x'})
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Cannot filter by 'residents'"
+
+    response = client.get('/planets/', params={'filter': 'gravity>1'})
+    assert response.status_code == 400
+    assert response.json()['detail'] == "Cannot compare 'gravity' values to this bound"
+
+    export = client.get('/planets/export', params={'filter': 'population>1e6', 'format': 'csv'})
+    assert export.status_code == 200
+
+
+@pytest.mark.parametrize(
+    'expression, titles',
+    [
+        ('release_date=1977-05-25', ['A New Hope']),
+        (
+            'release_date>1980-01-01',
+            ['The Empire Strikes Back', 'Return of the Jedi', 'The Phantom Menace'],
+        ),
+        ('release_date=1980-01-01..1990-01-01', ['The Empire Strikes Back', 'Return of the Jedi']),
+    ],
+)
+def test_filter_by_date(swapi_stand_in, expression, titles):
+    response = TestClient(app).get('/films/', params={'filter': expression})
+
+    assert response.status_code == 200
+    assert [film['title'] for film in response.json()['results']] == titles
@@ -0,0 +1,144 @@
+import copy
+import random
+from itertools import product
+
+import pytest
+
+from api.models import Person, Planet
+from api.services.dataset import Dataset, refresh_dataset
+from api.utils.indexes import get_search_index, get_sort_index
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.serialization import get_json_fragments
+from benchmarks.synthetic import generate
+
+SORT_FIELDS = {
+    Person: ['name', 'height', 'mass', 'birth_year', 'edited'],
+    Planet: ['name', 'diameter', 'population', 'climate'],
+}
+QUERIES = ['', 'a', 'sk', 'oo', 'ind', 'tatoo', 'zzz']
+
+
+def build(model_class, items):
+    return Dataset.from_records('rows', model_class, normalize_swapi_batch(model_class, items))
+
+
+def warm(dataset):
+    """Build every derived structure, so that refreshes patch them."""
+    for field in SORT_FIELDS[dataset.model_class]:
+        get_sort_index(dataset, field)
+    get_search_index(dataset)
+    fragments = get_json_fragments(dataset)
+    for position in range(len(dataset)):
+        fragments[position]
+
+
+def edit(items, rng, count):
+    """Modify some items in place, bumping their `edited` timestamp."""
+    for item in rng.sample(items, count):
+        item['name'] = rng.choice(['Tatooine', 'Skywalker', item['name'][::-1]])
+        for key in ('height', 'mass', 'diameter', 'population'):
+            if key in item:
+                item[key] = rng.choice(['unknown', '0', str(rng.randint(1, 10**6)), '1,000'])
+        item['edited'] = f'2030-01-{rng.randint(1, 28):02d}T00:00:00.000000Z'
+
+
+def assert_same(refreshed, rebuilt):
+    assert len(refreshed) == len(rebuilt)
+    assert [refreshed.store.record(i) for i in range(len(refreshed))] == [
+        rebuilt.store.record(i) for i in range(len(rebuilt))
+    ]
+
+    for field, order in product(SORT_FIELDS[refreshed.model_class], ['asc', 'desc']):
+        patched = get_sort_index(refreshed, field).order(order)
+        assert patched == get_sort_index(rebuilt, field).order(order), (field, order)
+
+    for query in QUERIES:
+        assert get_search_index(refreshed).search(query) == get_search_index(rebuilt).search(query)
+
+    patched, fresh = get_json_fragments(refreshed), get_json_fragments(rebuilt)
+    assert [patched[i] for i in range(len(refreshed))] == [fresh[i] for i in range(len(rebuilt))]
+
+
+@pytest.mark.parametrize('resource, model_class', [('people', Person), ('planets', Planet)])
+@pytest.mark.parametrize('seed', range(5))
+def test_incremental_refresh_matches_full_rebuild(resource, model_class, seed):
+    rng = random.Random(seed)
+    items = generate(resource, 1000, seed=seed)
+    previous = build(model_class, items)
+    warm(previous)
+
+    items = copy.deepcopy(items)
+    edit(items, rng, 15)
+    items += generate(resource, 1015, seed=seed + 100)[1000:]
+
+    refreshed = refresh_dataset(previous, items)
+
+    assert refreshed is not previous
+    assert refreshed.version > previous.version
+    assert refreshed.rows_changed == 30
+    assert {'row_keys', 'json', ('search', False), ('sort', 'name')} <= refreshed._derived.keys()
+    assert_same(refreshed, build(model_class, items))
+
+
+def test_unchanged_payload_keeps_dataset():
+    items = generate('people', 50)
+    previous = build(Person, items)
+
+    assert refresh_dataset(previous, copy.deepcopy(items)) is previous
+
+
+def test_changed_row_without_new_timestamp_is_ignored():
+    items = generate('people', 50)
+    previous = build(Person, items)
+    items = copy.deepcopy(items)
+    items[3]['name'] = 'Renamed'
+
+    # Rows are only compared by `edited`, like SWAPI marks its own changes
+    assert refresh_dataset(previous, items) is previous
+
+
+@pytest.mark.parametrize(
+    'change',
+    [
+        lambda items: items[:10] + items[11:],  # Removed
+        lambda items: items[1:] + items[:1],  # Reordered
+        lambda items: items[:5] + generate('people', 51)[50:] + items[5:],  # Inserted
+    ],
+)
+def test_structural_changes_fall_back_to_full_rebuild(change):
+    items = generate('people', 50)
+    previous = build(Person, items)
+    warm(previous)
+    items = change(copy.deepcopy(items))
+
+    refreshed = refresh_dataset(previous, items)
+
+    assert refreshed.rows_changed == len(refreshed)
+    assert 'row_keys' not in refreshed._derived
+    assert_same(refreshed, build(Person, items))
+
+
+def test_row_becoming_invalid_falls_back_to_full_rebuild():
+    items = generate('people', 50)
+    previous = build(Person, items)
+    items = copy.deepcopy(items)
+    items[7]['name'] = 'unknown'
+    items[7]['edited'] = '2030-01-01T00:00:00.000000Z'
+
+    refreshed = refresh_dataset(previous, items)
+
+    assert len(refreshed) == 49
+    assert_same(refreshed, build(Person, items))
+
+
+def test_large_churn_rebuilds_sort_indexes():
+    items = generate('people', 100)
+    previous = build(Person, items)
+    warm(previous)
+    items = copy.deepcopy(items)
+    edit(items, random.Random(0), 50)
+
+    refreshed = refresh_dataset(previous, items)
+
+    assert ('sort', 'name') not in refreshed._derived  # Rebuilt lazily, with a single sort
+    assert_same(refreshed, build(Person, items))
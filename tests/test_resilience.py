@@ -0,0 +1,186 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services.dataset_cache import dataset_cache
+from api.services.resilience import CircuitBreaker, CircuitOpenError, Resilience
+from api.services.resilience import swapi_resilience as swapi
+from benchmarks.fake_swapi import FakeSwapi
+
+REQUEST = httpx.Request('GET', 'http://swapi/api/people')
+
+
+def flaky(*outcomes):
+    """A request failing or succeeding as scripted (exceptions, statuses or seconds to wait)."""
+    calls = []
+
+    async def request():
+        outcome = outcomes[min(len(calls), len(outcomes) - 1)]
+        calls.append(outcome)
+        if isinstance(outcome, Exception):
+            raise outcome
+        if isinstance(outcome, float):
+            await asyncio.sleep(outcome)
+            return 'slow'
+        if outcome != 200:
+            response = httpx.Response(outcome, request=REQUEST)
+            raise httpx.HTTPStatusError('error', request=REQUEST, response=response)
+        return 'ok'
+
+    request.calls = calls
+    return request
+
+
+def resilience(**options):
+    return Resilience('test', **{'backoff': 0.001, **options})
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried():
+    upstream = resilience(attempts=3)
+    request = flaky(httpx.ConnectError('refused'), 503, 200)
+
+    assert await upstream.call(request) == 'ok'
+    assert len(request.calls) == 3
+    assert upstream.stats.retries == 2
+    assert upstream.breaker.state == 'closed'
+
+
+@pytest.mark.asyncio
+async def test_retries_are_bounded():
+    upstream = resilience(attempts=3)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await upstream.call(flaky(502))
+    assert upstream.stats.attempts == 3
+    assert upstream.stats.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    upstream = resilience(attempts=3, breaker_threshold=1)
+    request = flaky(404)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await upstream.call(request)
+    assert len(request.calls) == 1
+    assert upstream.breaker.state == 'closed'
+
+
+def test_jittered_backoff_is_capped():
+    upstream = Resilience('test', backoff=0.1, backoff_max=0.5)
+
+    delays = [upstream.delay(attempt) for attempt in range(10) for _ in range(20)]
+    assert all(0 <= delay <= 0.5 for delay in delays)
+    assert len(set(delays)) > 100
+
+
+@pytest.mark.asyncio
+async def test_attempts_have_deadlines():
+    upstream = resilience(attempts=2, attempt_timeout=0.05)
+    request = flaky(1.0, 200)
+
+    started = time.perf_counter()
+    assert await upstream.call(request) == 'ok'
+    assert time.perf_counter() - started < 0.5
+    assert upstream.stats.attempt_timeouts == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_attempts_are_hedged():
+    upstream = resilience(hedge_delay=0.05)
+    request = flaky(1.0, 200)
+
+    started = time.perf_counter()
+    assert await upstream.call(request) == 'ok'
+    assert time.perf_counter() - started < 0.5
+    assert (upstream.stats.hedges, upstream.stats.hedge_wins) == (1, 1)
+
+    # Fast attempts are not duplicated
+    assert await upstream.call(flaky(200)) == 'ok'
+    assert upstream.stats.hedges == 1
+
+
+def test_breaker_opens_and_probes():
+    now = [0.0]
+    breaker = CircuitBreaker(threshold=2, reset_after=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    assert breaker.allow()
+    assert breaker.record_failure()  # Opens
+    assert breaker.state == 'open' and not breaker.allow()
+
+    now[0] = 10
+    assert breaker.allow()  # The probe
+    assert not breaker.allow()
+    assert breaker.record_failure()  # Failed probe: open again
+    assert not breaker.allow()
+
+    now[0] = 20
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_short_circuits():
+    upstream = resilience(attempts=5, breaker_threshold=2)
+    request = flaky(503)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await upstream.call(request)
+    with pytest.raises(CircuitOpenError):
+        await upstream.call(request)
+
+    assert len(request.calls) == 2  # The breaker stopped the retries
+    assert upstream.snapshot()['breaker']['state'] == 'open'
+    assert upstream.stats.short_circuits == 1
+
+
+@pytest.fixture
+def fake_swapi(monkeypatch):
+    with FakeSwapi(rows=30) as fake:
+        monkeypatch.setenv('SWAPI_BASE_URL', fake.base_url)
+        monkeypatch.setattr(swapi, 'backoff', 0.001)
+        monkeypatch.setattr(swapi.breaker, 'threshold', 3)
+        yield fake
+
+
+def test_api_retries_upstream_faults(fake_swapi):
+    fake_swapi.fail_next = 2
+    response = TestClient(app).get('/people/')
+
+    assert response.status_code == 200
+    assert response.json()['count'] == 30
+    assert fake_swapi.errors == 2
+    assert swapi.stats.retries == 2
+
+
+def test_api_falls_back_to_last_good_dataset(fake_swapi, monkeypatch):
+    client = TestClient(app)
+    assert client.get('/planets/').status_code == 200
+
+    # The dataset expires, and upstream goes down
+    monkeypatch.setattr(dataset_cache, 'ttl', 0)
+    monkeypatch.setattr(dataset_cache, 'stale_ttl', 0)
+    fake_swapi.error_rate = 1.0
+
+    for _ in range(3):
+        response = client.get('/planets/')
+        assert response.status_code == 200
+        assert response.json()['count'] == 30
+
+    health = client.get('/health').json()
+    assert health['status'] == 'degraded'
+    assert health['upstream']['breaker']['state'] == 'open'
+    assert health['cache']['fallbacks'] == 3
+    assert fake_swapi.requests == 1 + 3  # Short-circuited once open
+
+    # Nothing to fall back to
+    response = client.get('/films/')
+    assert response.status_code == 503
+    assert 'Retry-After' in response.headers
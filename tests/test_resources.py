@@ -0,0 +1,78 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.resources import RESOURCES
+from api.utils.normalization import normalize_swapi_batch
+from tests.conftest import FIXTURES
+
+
+@pytest.fixture
+def client(swapi_stand_in):
+    with TestClient(app) as client:
+        yield client
+
+
+def fixture_count(resource):
+    items = json.loads((FIXTURES / f'{resource.name}.json').read_text())
+    return len(normalize_swapi_batch(resource.model, items))
+
+
+@pytest.mark.parametrize('resource', RESOURCES.values(), ids=list(RESOURCES))
+def test_every_resource_is_served(client, resource):
+    response = client.get(f'/{resource.name}/', params={'page_size': 100})
+
+    assert response.status_code == 200
+    assert response.json()['count'] == fixture_count(resource)
+
+    for field in resource.sortable_fields:
+        for order in ('asc', 'desc'):
+            params = {'sort_by': field, 'order': order}
+            assert client.get(f'/{resource.name}/', params=params).status_code == 200
+
+    export = client.get(f'/{resource.name}/export', params={'format': 'csv'})
+    assert len(list(csv.reader(io.StringIO(export.text)))) == 1 + fixture_count(resource)
+
+
+def test_each_resource_is_loaded_once(client, swapi_stand_in):
+    for _ in range(3):
+        for name in RESOURCES:
+            client.get(f'/{name}/', params={'sort_by': 'url', 'search': 'a'})
+
+    assert sorted(swapi_stand_in) == sorted(RESOURCES)
+
+
+def test_films_are_searched_by_title(client):
+    results = client.get('/films/', params={'search': 'EMPIRE'}).json()['results']
+    assert [film['title'] for film in results] == ['The Empire Strikes Back']
+
+    results = client.get('/films/', params={'sort_by': 'release_date', 'order': 'desc'}).json()
+    assert results['results'][0]['title'] == 'The Phantom Menace'
+
+
+def test_expand_from_new_collections(client, swapi_stand_in):
+    results = client.get('/people/', params={'expand': 'films,starships'}).json()['results']
+    luke = results[0]
+
+    assert [film['title'] for film in luke['films'] if isinstance(film, dict)] == [
+        'A New Hope',
+        'The Empire Strikes Back',
+        'Return of the Jedi',
+    ]
+    assert luke['starships'][0]['name'] == 'X-wing'
+    assert not any('/' in path for path in swapi_stand_in)
+
+
+def test_invalid_sort_field(client):
+    assert client.get('/starships/', params={'sort_by': 'pilots'}).status_code == 400
+
+
+def test_openapi_lists_every_resource(client):
+    paths = client.get('/openapi.json').json()['paths']
+    for name in RESOURCES:
+        assert f'/{name}/' in paths
+        assert f'/{name}/export' in paths
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+from pydantic import BaseModel
+
+from api.utils.filters import apply_filters_and_sorting
+from api.utils.indexes import SearchIndex
+from api.utils.pagination import get_filtered_paginated_data
+
+
+class DummyPerson(BaseModel):
+    name: str
+    height: int | None
+    grade: int | str | None
+
+
+ALPHABET = 'abcAB -éÉ'
+
+
+def random_grade(rng: random.Random, name: str) -> int | str | None:
+    """Mixed ints and strings: only comparable among names with (or without) an accent."""
+    if rng.random() < 0.1:
+        return None
+    return name.upper() if 'é' in name.lower() else len(name)
+
+
+def random_people(rng: random.Random, count: int) -> list[DummyPerson]:
+    people = []
+    for _ in range(count):
+        name = ''.join(rng.choices(ALPHABET, k=rng.randint(0, 8)))
+        height = rng.choice([None, *range(5)])
+        people.append(DummyPerson(name=name, height=height, grade=random_grade(rng, name)))
+    return people
+
+
+def random_queries(rng: random.Random, people: list[DummyPerson]) -> list[str]:
+    queries = [''.join(rng.choices(ALPHABET, k=rng.randint(1, 5))) for _ in range(50)]
+    for person in rng.sample(people, 20):
+        start = rng.randint(0, len(person.name))
+        queries.append(person.name[start : start + rng.randint(1, 6)])
+    return [query for query in queries if query]
+
+
+@pytest.mark.asyncio
+async def test_search_matches_apply_filters_and_sorting(monkeypatch):
+    rng = random.Random(42)
+    people = random_people(rng, 300)
+
+    async def mock_fetch(*args, **kwargs):
+        return people
+
+    monkeypatch.setattr('api.utils.pagination.fetch_swapi_data', mock_fetch)
+
+    for search in random_queries(rng, people):
+        for sort_by, order in [
+            (None, 'asc'),
+            ('height', 'asc'),
+            ('name', 'desc'),
+            ('grade', 'asc'),
+            ('grade', 'desc'),
+        ]:
+            expected = apply_filters_and_sorting(
+                DummyPerson, people, search=search, sort_by=sort_by, order=order
+            )
+            result = await get_filtered_paginated_data(
+                model_class=DummyPerson,
+                resource='people',
+                page=1,
+                page_size=len(people),
+                search=search,
+                sort_by=sort_by,
+                order=order,
+            )
+
+            assert result['count'] == len(expected), search
+            assert result['results'] == expected, (search, sort_by, order)
+
+
+def test_search_index_short_and_long_queries():
+    index = SearchIndex.build(['Luke Skywalker', 'Leia Organa', 'Anakin Skywalker'])
+
+    assert index.search('L') == {0, 1, 2}
+    assert index.search('sky') == {0, 2}
+    assert index.search('SKYWALKER') == {0, 2}
+    assert index.search('walkers') == set()
+
+
+def test_search_index_accent_folding_is_opt_in():
+    names = ['Padmé Amidala', 'Padme Naberrie']
+
+    assert SearchIndex.build(names).search('padme') == {1}
+    assert SearchIndex.build(names, accents=True).search('padme') == {0, 1}
+    assert SearchIndex.build(names, accents=True).search('PADMÉ') == {0, 1}
@@ -0,0 +1,32 @@
+import pytest
+
+from api.main import app
+
+
+@pytest.mark.parametrize(
+    'url',
+    [
+        '/people/?page_size=100',
+        '/people/?page=2&page_size=100&sort_by=height&order=desc',
+        '/planets/?search=sky&sort_by=population',
+        '/planets/?page=9',
+    ],
+)
+def test_fast_path_matches_response_model(client, monkeypatch, url):
+    expected = client.get(url)
+
+    monkeypatch.setattr('api.routers.resources.FAST_SERIALIZATION', True)
+    fast = client.get(url)
+
+    assert fast.status_code == expected.status_code == 200
+    assert fast.headers['content-type'] == expected.headers['content-type']
+    assert fast.content == expected.content
+
+
+def test_fast_path_keeps_openapi_schema(client, monkeypatch):
+    expected = client.get('/openapi.json').json()
+
+    monkeypatch.setattr('api.routers.resources.FAST_SERIALIZATION', True)
+    app.openapi_schema = None
+
+    assert client.get('/openapi.json').json() == expected
@@ -0,0 +1,115 @@
+import json
+from itertools import product
+from pathlib import Path
+
+import pytest
+
+from api.models import Person
+from api.services.dataset import Dataset
+from api.services.dataset_cache import dataset_cache
+from api.services.shared_dataset import SharedDatasets, open_published, publish
+from api.utils.columnar import PackedStrings
+from api.utils.indexes import get_search_index, get_sort_index, select_page
+from api.utils.normalization import normalize_swapi_batch
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'swapi'
+ITEMS = json.loads((FIXTURES / 'people.json').read_text())
+
+
+def make_load(calls: list[str], items=ITEMS):
+    async def load(model_class, resource, previous):
+        calls.append(resource)
+        return Dataset.from_records(
+            resource, model_class, normalize_swapi_batch(model_class, items)
+        )
+
+    return load
+
+
+def test_published_dataset_is_read_in_place(tmp_path):
+    dataset = Dataset.from_records('people', Person, normalize_swapi_batch(Person, ITEMS))
+    dataset.fetched_at -= 120  # Fetched two minutes ago: followers must see it as old
+    mapped = open_published(Person, publish(dataset, tmp_path))
+
+    assert mapped.version == dataset.version
+    assert isinstance(mapped.store.columns['height'].data, memoryview)
+    assert isinstance(mapped.store.columns['hair_color'].table.values, PackedStrings)
+    assert isinstance(get_search_index(mapped).names, PackedStrings)
+    assert mapped.rows(range(len(mapped))) == dataset.rows(range(len(dataset)))
+
+    for field, order in product(['name', 'height', 'mass', 'edited'], ['asc', 'desc']):
+        published = get_sort_index(mapped, field).order(order)
+        assert isinstance(published, memoryview)
+        assert list(published) == list(get_sort_index(dataset, field).order(order))
+
+    assert mapped.age == pytest.approx(dataset.age, abs=1)
+    for query in ['', 'a', 'sky', 'walker', 'zzz']:
+        assert get_search_index(mapped).search(query) == get_search_index(dataset).search(query)
+
+    order = get_sort_index(mapped, 'name').order('desc')
+    assert select_page(order, get_search_index(mapped).search('a'), 1, 4) == select_page(
+        get_sort_index(dataset, 'name').order('desc'), get_search_index(dataset).search('a'), 1, 4
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_the_leader_loads_from_upstream(tmp_path):
+    leader_calls, follower_calls = [], []
+    leader = SharedDatasets(tmp_path, make_load(leader_calls), poll_interval=0.01)
+    follower = SharedDatasets(tmp_path, make_load(follower_calls), poll_interval=0.01)
+
+    try:
+        published = await leader.load(Person, 'people', None)
+        shared = await follower.load(Person, 'people', None)
+
+        assert leader.is_leader and not follower.is_leader
+        assert (leader_calls, follower_calls) == (['people'], [])
+        assert shared.version == published.version
+        assert await follower.load(Person, 'people', shared) is shared  # Nothing new
+
+        # New versions are swapped in by the followers' sync
+        updated = await leader.load(Person, 'people', published)
+        await follower._sync(Person, 'people')
+        assert dataset_cache.peek('people').version == updated.version
+
+    finally:
+        leader.close()
+        follower.close()
+
+
+@pytest.mark.asyncio
+async def test_follower_takes_over_when_the_leader_exits(tmp_path):
+    leader = SharedDatasets(tmp_path, make_load([]), poll_interval=0.01)
+    calls = []
+    follower = SharedDatasets(tmp_path, make_load(calls), poll_interval=0.01)
+
+    try:
+        published = await leader.load(Person, 'people', None)
+        assert not follower.elect()
+
+        leader.close()
+        dataset = await follower.load(Person, 'people', published)
+
+        assert follower.is_leader
+        assert calls == ['people']
+        assert dataset.version > published.version
+
+    finally:
+        follower.close()
+
+
+@pytest.mark.asyncio
+async def test_follower_falls_back_to_upstream_without_leader_publication(tmp_path):
+    leader = SharedDatasets(tmp_path, make_load([]))
+    leader.elect()  # Leads, but never publishes
+    calls = []
+    follower = SharedDatasets(tmp_path, make_load(calls), poll_interval=0.01, wait_timeout=0.05)
+
+    try:
+        dataset = await follower.load(Person, 'people', None)
+        assert calls == ['people']
+        assert len(dataset) == len(ITEMS)
+
+    finally:
+        leader.close()
+        follower.close()
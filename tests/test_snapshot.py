@@ -0,0 +1,145 @@
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from api.main import app
+from api.models import Person, Planet
+from api.services import swapi_proxy
+from api.services.dataset import Dataset
+from api.services.snapshot import load_snapshot, save_snapshot, snapshot_path
+from api.utils import pagination
+from api.utils.columnar import ColumnStore, PackedStrings
+from api.utils.normalization import normalize_swapi_batch
+
+FIXTURES = Path(__file__).parent / 'fixtures' / 'swapi'
+
+
+class Event(BaseModel):
+    name: str
+    at: datetime  # Naive: stored as objects
+    extra: Any = None
+
+
+def load_fixture(model_class, resource):
+    items = json.loads((FIXTURES / f'{resource}.json').read_text())
+    return Dataset.from_records(resource, model_class, normalize_swapi_batch(model_class, items))
+
+
+def records(store):
+    return [store.record(i) for i in range(len(store))]
+
+
+@pytest.mark.parametrize('resource, model_class', [('people', Person), ('planets', Planet)])
+def test_store_round_trip(resource, model_class):
+    store = load_fixture(model_class, resource).store
+
+    assert records(ColumnStore.from_bytes(model_class, store.to_bytes())) == records(store)
+
+
+def test_store_read_in_place_takes_new_strings():
+    store = load_fixture(Person, 'people').store
+    mapped = ColumnStore.from_bytes(Person, store.to_bytes(), copy=False)
+    record = mapped.record(0) | {'hair_color': 'vert émeraude', 'films': []}
+
+    assert isinstance(mapped.columns['hair_color'].table.values, PackedStrings)
+    assert records(mapped) == records(store)
+    assert records(mapped.with_changes({0: record})) == [record, *records(store)[1:]]
+    assert records(mapped) == records(store)
+
+
+def test_object_columns_round_trip():
+    rows = [
+        {'name': 'a', 'at': datetime(2020, 1, 2, 3, 4, 5), 'extra': {'k': [1, 2]}},
+        {'name': 'b', 'at': datetime(2021, 6, 7), 'extra': None},
+    ]
+    store = ColumnStore.from_records(Event, rows)
+
+    assert records(ColumnStore.from_bytes(Event, store.to_bytes())) == rows
+
+
+def test_snapshot_keeps_rows_and_age(tmp_path):
+    dataset = load_fixture(Person, 'people')
+    dataset.fetched_at -= 100
+
+    save_snapshot(dataset, tmp_path)
+    restored = load_snapshot(Person, 'people', tmp_path)
+
+    assert records(restored.store) == records(dataset.store)
+    assert 99 < restored.age < 110
+    assert restored.version != dataset.version
+
+
+def test_unusable_snapshots_are_ignored(tmp_path):
+    assert load_snapshot(Person, 'people', tmp_path) is None  # Missing
+
+    save_snapshot(load_fixture(Planet, 'planets'), tmp_path)
+    snapshot_path(tmp_path, 'planets').rename(snapshot_path(tmp_path, 'people'))
+    assert load_snapshot(Person, 'people', tmp_path) is None  # Another model
+
+    path = snapshot_path(tmp_path, 'planets')
+    save_snapshot(load_fixture(Planet, 'planets'), tmp_path)
+    path.write_bytes(path.read_bytes()[:200])
+    assert load_snapshot(Planet, 'planets', tmp_path) is None  # Truncated
+
+
+def test_startup_serves_snapshot_and_refreshes_in_background(tmp_path, monkeypatch):
+    dataset = load_fixture(Person, 'people')
+    dataset.fetched_at = time.monotonic() - 10_000  # Stale
+    save_snapshot(dataset, tmp_path)
+    saved = snapshot_path(tmp_path, 'people').stat().st_mtime_ns
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        items = json.loads((FIXTURES / 'people.json').read_text())
+        return httpx.Response(200, json=items[:3])
+
+    monkeypatch.setattr(pagination, 'SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.setattr(
+        swapi_proxy,
+        'create_swapi_client',
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    with TestClient(app) as client:
+        first = client.get('/people/', params={'page_size': 100})
+        assert first.status_code == 200
+        assert first.json()['count'] in (len(dataset), 3)
+
+        for _ in range(100):
+            if snapshot_path(tmp_path, 'people').stat().st_mtime_ns != saved:
+                break
+            time.sleep(0.01)
+
+        assert client.get('/people/', params={'page_size': 100}).json()['count'] == 3
+
+    assert len(requests) == 1
+    assert len(load_snapshot(Person, 'people', tmp_path)) == 3
+
+
+def test_fresh_snapshot_needs_no_upstream_request(tmp_path, monkeypatch):
+    save_snapshot(load_fixture(Person, 'people'), tmp_path)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise AssertionError('SWAPI should not be called')
+
+    monkeypatch.setattr(pagination, 'SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.setattr(
+        swapi_proxy,
+        'create_swapi_client',
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    with TestClient(app) as client:
+        response = client.get('/people/', params={'search': 'sky'})
+
+    assert response.status_code == 200
+    assert response.json()['results'][0]['name'] == 'Luke Skywalker'
@@ -19,3 +19,20 @@ def test_sort_by_mass():
 
     masses = [p.mass for p in sorted_data]
     assert masses == [70, 90, 100]
+
+
+def test_sort_desc_keeps_none_last():
+    class OptionalMass(BaseModel):
+        name: str
+        mass: int | None
+
+    data = [
+        OptionalMass(name='A', mass=None),
+        OptionalMass(name='B', mass=70),
+        OptionalMass(name='C', mass=100),
+    ]
+
+    sorted_data = apply_filters_and_sorting(OptionalMass, data, sort_by='mass', order='desc')
+
+    assert [p.name for p in sorted_data] == ['C', 'B', 'A']
+    assert [p.name for p in data] == ['A', 'B', 'C']  # input is left untouched
@@ -0,0 +1,116 @@
+import math
+from collections import Counter
+
+import msgpack
+import pytest
+from fastapi import HTTPException
+
+from api.models import Person
+from api.services.dataset import Dataset
+from api.utils.normalization import normalize_swapi_batch
+from api.utils.stats import compute_stats, get_facets, histogram, memoize
+from benchmarks.synthetic import generate
+
+PEOPLE = Dataset.from_records(
+    'people', Person, normalize_swapi_batch(Person, generate('people', 500))
+)
+
+
+def fold(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+def test_stats_match_scan():
+    stats = compute_stats(PEOPLE, None, 'height', 'gender', 5)
+    rows = PEOPLE.rows(range(len(PEOPLE)))
+    heights = [row.height for row in rows if row.height is not None]
+
+    assert stats['count'] == len(rows)
+    assert stats['summary']['count'] == len(heights)
+    assert stats['summary']['min'] == min(heights)
+    assert stats['summary']['max'] == max(heights)
+    assert math.isclose(stats['summary']['mean'], sum(heights) / len(heights))
+    assert sum(bucket['count'] for bucket in stats['histogram']) == len(heights)
+
+    genders = Counter(fold(row.gender) for row in rows)
+    assert {group['value']: group['count'] for group in stats['groups']} == genders
+    assert [group['count'] for group in stats['groups']] == sorted(genders.values())[::-1]
+
+
+def test_histogram_buckets():
+    buckets = histogram([0, 1, 2, 5, 10], 2)
+
+    assert [(bucket['low'], bucket['high']) for bucket in buckets] == [(0, 5), (5, 10)]
+    assert [bucket['count'] for bucket in buckets] == [3, 2]  # The last bucket holds 10
+    assert histogram([3, 3], 4)[0]['count'] == 2
+
+
+def test_queries_are_memoized_per_version():
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return object()
+
+    assert memoize(PEOPLE, 'query', compute) is memoize(PEOPLE, 'query', compute)
+    assert len(calls) == 1
+
+
+def test_facets_of_matching_rows():
+    facets = get_facets(PEOPLE, None, 'height>180', 'gender, eye_color')
+    rows = [row for row in PEOPLE.rows(range(len(PEOPLE))) if (row.height or 0) > 180]
+
+    assert list(facets) == ['gender', 'eye_color']
+    counts = {facet['value']: facet['count'] for facet in facets['eye_color']}
+    assert counts == Counter(fold(row.eye_color) for row in rows)
+
+    with pytest.raises(HTTPException):
+        get_facets(PEOPLE, None, None, 'films')
+
+
+def test_stats_endpoint(client):
+    params = {'field': 'population', 'group_by': 'climate', 'filter': 'diameter>5000'}
+    response = client.get('/planets/stats', params=params)
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats['count'] == sum(group['count'] for group in stats['groups'])
+    assert stats['histogram'] is None
+
+    for params, detail in [
+        ({'field': 'climate'}, "Cannot aggregate 'climate'"),
+        ({'group_by': 'residents'}, "Cannot group by 'residents'"),
+        ({'buckets': 3}, 'Histogram buckets need a field'),
+    ]:
+        response = client.get('/planets/stats', params=params)
+        assert response.status_code == 400
+        assert response.json()['detail'] == detail
+
+
+def test_list_with_facets(client):
+    params = {'search': 'a', 'facets': 'gender', 'page_size': 5}
+    response = client.get('/people/', params=params).json()
+    plain = client.get('/people/', params={'search': 'a', 'page_size': 5}).json()
+
+    assert {key: value for key, value in response.items() if key != 'facets'} == plain
+    assert sum(facet['count'] for facet in response['facets']['gender']) == plain['count']
+
+    # Facets count the query of the cursor, not the page
+    after = client.get('/people/', params={'cursor': plain['next_cursor'], 'facets': 'gender'})
+    assert after.json()['facets'] == response['facets']
+
+    expanded = client.get('/people/', params={**params, 'expand': 'homeworld'}).json()
+    assert expanded['facets'] == response['facets']
+    assert isinstance(expanded['results'][0]['homeworld'], dict | str)
+
+
+def test_facets_of_dates(client):
+    params = {'facets': 'created', 'page_size': 5}
+    response = client.get('/people/', params=params)
+    binary = client.get('/people/', params=params, headers={'Accept': 'application/msgpack'})
+
+    assert response.status_code == 200
+    counts = response.json()['facets']['created']
+    assert sum(facet['count'] for facet in counts) == response.json()['count']
+    assert all(isinstance(facet['value'], str | None) for facet in counts)
+    assert msgpack.unpackb(binary.content)['facets'] == response.json()['facets']
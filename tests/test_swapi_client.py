@@ -0,0 +1,52 @@
+import httpx
+from fastapi.testclient import TestClient
+
+from api.main import app
+from api.services import swapi_proxy
+
+LUKE = {
+    'name': 'Luke Skywalker',
+    'height': '172',
+    'mass': '77',
+    'hair_color': 'blond',
+    'skin_color': 'fair',
+    'eye_color': 'blue',
+    'birth_year': '19BBY',
+    'gender': 'male',
+    'homeworld': 'https://swapi.info/api/planets/1',
+    'films': ['https://swapi.info/api/films/1'],
+    'species': [],
+    'vehicles': [],
+    'starships': [],
+    'created': '2014-12-09T13:50:51.644000Z',
+    'edited': '2014-12-20T21:17:56.891000Z',
+    'url': 'https://swapi.info/api/people/1',
+}
+
+
+def test_shared_client_is_reused_and_closed(monkeypatch):
+    requests: list[httpx.Request] = []
+    clients: list[httpx.AsyncClient] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json=[LUKE])
+
+    def create_client() -> httpx.AsyncClient:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(swapi_proxy, 'create_swapi_client', create_client)
+
+    with TestClient(app) as client:
+        assert swapi_proxy._client is clients[0]
+
+        response = client.get('/people/')
+        assert response.status_code == 200
+        assert response.json()['results'][0]['name'] == 'Luke Skywalker'
+
+    assert len(clients) == 1
+    assert len(requests) == 1
+    assert clients[0].is_closed
+    assert swapi_proxy._client is None